@@ -34,6 +34,7 @@ from . import mixing
 from . import open_flow
 from . import packed_bed
 from . import piping
+from . import piping_system
 from . import pump
 from . import safety_valve
 from . import packed_tower
@@ -42,6 +43,7 @@ from . import two_phase_voidage
 from . import drag
 from . import saltation
 from . import separator
+from . import tank_transient
 
 
 
@@ -58,6 +60,7 @@ from .mixing import *
 from .open_flow import *
 from .packed_bed import *
 from .piping import *
+from .piping_system import *
 from .pump import *
 from .safety_valve import *
 from .packed_tower import *
@@ -66,12 +69,13 @@ from .two_phase_voidage import *
 from .drag import *
 from .saltation import *
 from .separator import *
+from .tank_transient import *
 
 
 __all__ = ['atmosphere', 'compressible', 'control_valve', 'core', 'filters', 'fittings',
-'friction', 'geometry', 'mixing', 'open_flow', 'packed_bed', 'piping',
+'friction', 'geometry', 'mixing', 'open_flow', 'packed_bed', 'piping', 'piping_system',
 'pump', 'safety_valve', 'packed_tower', 'two_phase', 'two_phase_voidage', 
-'drag', 'saltation', 'separator', 'flow_meter']
+'drag', 'saltation', 'separator', 'flow_meter', 'tank_transient']
 
 __all__.extend(atmosphere.__all__)
 __all__.extend(compressible.__all__)
@@ -86,6 +90,7 @@ __all__.extend(open_flow.__all__)
 __all__.extend(flow_meter.__all__)
 __all__.extend(packed_bed.__all__)
 __all__.extend(piping.__all__)
+__all__.extend(piping_system.__all__)
 __all__.extend(pump.__all__)
 __all__.extend(safety_valve.__all__)
 __all__.extend(packed_tower.__all__)
@@ -94,6 +99,7 @@ __all__.extend(two_phase_voidage.__all__)
 __all__.extend(drag.__all__)
 __all__.extend(saltation.__all__)
 __all__.extend(separator.__all__)
+__all__.extend(tank_transient.__all__)
 
 
 __version__ = '0.1.68'
@@ -21,13 +21,19 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.'''
 
 from __future__ import division
-from math import log10
+from math import log10, pi
+import numpy as np
 from scipy.constants import R
+from fluids.numerics import _scalar_or_array
 
 __all__ = ['size_control_valve_l', 'size_control_valve_g', 'cavitation_index',
            'FF_critical_pressure_ratio_l', 'is_choked_turbulent_l', 
            'is_choked_turbulent_g', 'Reynolds_valve', 
-           'loss_coefficient_piping', 'Reynolds_factor']
+           'loss_coefficient_piping', 'Reynolds_factor', 'Kv_characteristic',
+           'rate_control_valve_l', 'rate_control_valve_g',
+           'dP_control_valve_l', 'dP_control_valve_g', 'ControlValve',
+           'valve_characteristics', 'xFz_estimate', 'control_valve_regime_l',
+           'valve_regimes_l']
 
 N1 = 0.1 # m^3/hr, kPa
 N2 = 1.6E-3 # mm
@@ -179,9 +185,9 @@ def is_choked_turbulent_l(dP, P1, Psat, FF, FL=None, FLP=None, FP=None):
     ----------
     .. [1] IEC 60534-2-1 / ISA-75.01.01-2007
     '''
-    if FLP and FP:
+    if FLP is not None and FP is not None:
         return dP >= (FLP/FP)**2*(P1-FF*Psat)
-    elif FL:
+    elif FL is not None:
         return dP >= FL**2*(P1-FF*Psat)
     else:
         raise Exception('Either (FLP and FP) or FL is needed')
@@ -228,9 +234,9 @@ def is_choked_turbulent_g(x, Fgamma, xT=None, xTP=None):
     ----------
     .. [1] IEC 60534-2-1 / ISA-75.01.01-2007
     '''
-    if xT:
+    if xT is not None:
         return x >= Fgamma*xT
-    elif xTP:
+    elif xTP is not None:
         return x >= Fgamma*xTP
     else:
         raise Exception('Either xT or xTP is needed')
@@ -658,3 +664,943 @@ def size_control_valve_g(T, MW, mu, gamma, Z, P1, P2, Q, D1, D2, d, FL, Fd, xT):
         C = iterate_piping_laminar(C)
     return C
 
+
+
+N34 = 1.17 # m^3/hr
+
+valve_regimes_l = ['non-cavitating', 'incipient cavitation', 'choked', 
+                   'flashing', 'over capacity']
+
+
+def xFz_estimate(C, FL, Fd):
+    r'''Estimates the incipient cavitation pressure differential ratio `xFz`
+    of a control valve, for use when the manufacturer does not supply it, 
+    according to IEC 60534-8-4.
+
+    .. math::
+        x_{Fz} = \frac{0.90}{\sqrt{1 + 3F_d\sqrt{\frac{C}{N_{34}F_L}}}}
+
+    Parameters
+    ----------
+    C : float or ndarray
+        Metric Kv valve flow coefficient (flow rate of water at a pressure drop  
+        of 1 bar) [m^3/hr]
+    FL : float
+        Liquid pressure recovery factor of a control valve without attached 
+        fittings [-]
+    Fd : float
+        Valve style modifier [-]
+
+    Returns
+    -------
+    xFz : float or ndarray
+        Incipient cavitation pressure differential ratio [-]
+
+    Notes
+    -----
+    This estimate is intended for globe style valves; manufacturer data
+    should be preferred when available.
+
+    Examples
+    --------
+    >>> xFz_estimate(C=100., FL=0.9, Fd=0.46)
+    0.2367746983237004
+
+    References
+    ----------
+    .. [1] IEC 60534-8-4 : Industrial-Process Control Valves - Part 8-4: Noise 
+       Considerations - Prediction of Noise Generated by Hydrodynamic Flow.
+       (2015)
+    '''
+    return 0.90*(1. + 3.*Fd*(C/(N34*FL))**0.5)**-0.5
+
+
+def control_valve_regime_l(P1, P2, Psat, Pc, FL, xFz, FLP=None, FP=None):
+    r'''Classifies the flow regime of a liquid through a control valve by its
+    pressures, as one of non-cavitating, incipient cavitation, choked, or 
+    flashing. Accepts arrays for all pressures, so entire operating 
+    envelopes may be screened at once.
+    The regime is returned as an index into `valve_regimes_l`.
+
+    Flashing occurs when the outlet pressure is at or below the vapor 
+    pressure; otherwise the flow is choked when :obj:`is_choked_turbulent_l` 
+    is True, and cavitation has started when:
+
+    .. math::
+        x_F = \frac{\Delta P}{P_1 - P_{sat}} = \frac{1}{\sigma} \ge x_{Fz}
+
+    Parameters
+    ----------
+    P1 : float or ndarray
+        Inlet pressure of the fluid before valves and reducers [Pa]
+    P2 : float or ndarray
+        Outlet pressure of the fluid after valves and reducers [Pa]
+    Psat : float or ndarray
+        Saturation pressure of the fluid at inlet temperature [Pa]
+    Pc : float
+        Critical pressure of the fluid [Pa]
+    FL : float
+        Liquid pressure recovery factor of a control valve without attached 
+        fittings [-]
+    xFz : float or ndarray
+        Incipient cavitation pressure differential ratio; see 
+        :obj:`xFz_estimate` [-]
+    FLP : float or ndarray, optional
+        Combined liquid pressure recovery factor with piping geometry factor,
+        for a control valve with attached fittings [-]
+    FP : float or ndarray, optional
+        Piping geometry factor [-]
+
+    Returns
+    -------
+    regime : int or ndarray
+        Index of the regime in `valve_regimes_l` [-]
+
+    Examples
+    --------
+    >>> [valve_regimes_l[control_valve_regime_l(680E3, P2, 70.1E3, 22120E3,
+    ... FL=0.9, xFz=0.4)] for P2 in (600E3, 400E3, 150E3, 50E3)]
+    ['non-cavitating', 'incipient cavitation', 'choked', 'flashing']
+
+    References
+    ----------
+    .. [1] IEC 60534-2-1 / ISA-75.01.01-2007
+    .. [2] IEC 60534-8-4 : Industrial-Process Control Valves - Part 8-4: Noise 
+       Considerations - Prediction of Noise Generated by Hydrodynamic Flow.
+       (2015)
+    '''
+    dP = P1 - P2
+    FF = FF_critical_pressure_ratio_l(Psat=Psat, Pc=Pc)
+    choked = is_choked_turbulent_l(dP, P1, Psat, FF, FL=FL, FLP=FLP, FP=FP)
+    cavitating = dP >= xFz*(P1 - Psat)
+    regime = np.select([P2 <= Psat, choked, cavitating], [3, 2, 1], 0)
+    return _scalar_or_array(regime, int)
+
+
+valve_characteristics = ['linear', 'equal percentage', 'quick opening']
+
+
+def Kv_characteristic(opening, Kv_max, characteristic='linear',
+                      rangeability=50.):
+    r'''Calculates the flow coefficient of a control valve at a fractional
+    travel `opening`, from its rated flow coefficient at full travel and its
+    inherent flow characteristic. Accepts arrays of openings.
+
+    Linear:
+
+    .. math::
+        K_v = K_{v,max} l
+
+    Equal percentage:
+
+    .. math::
+        K_v = K_{v,max} R^{l-1}
+
+    where :math:`R` is the rangeability of the valve.
+
+    Quick opening:
+
+    .. math::
+        K_v = K_{v,max} \sqrt{l}
+
+    Parameters
+    ----------
+    opening : float or ndarray
+        Fractional travel (lift) of the valve, 0 to 1 [-]
+    Kv_max : float
+        Metric Kv valve flow coefficient at full travel [m^3/hr]
+    characteristic : str, optional
+        One of 'linear', 'equal percentage', or 'quick opening'
+    rangeability : float, optional
+        Rangeability of an equal percentage valve [-]
+
+    Returns
+    -------
+    Kv : float or ndarray
+        Metric Kv valve flow coefficient at the specified travel [m^3/hr]
+
+    Notes
+    -----
+    The equal percentage characteristic does not reach zero when the valve is
+    closed; its flow coefficient at zero travel is `Kv_max`/`rangeability`.
+
+    Examples
+    --------
+    >>> Kv_characteristic(0.5, 100., 'equal percentage')
+    14.142135623730951
+
+    References
+    ----------
+    .. [1] Emerson Process Management. Control Valve Handbook. 4th ed. 2005.
+    '''
+    if characteristic == 'linear':
+        return Kv_max*opening
+    elif characteristic == 'equal percentage':
+        return Kv_max*rangeability**(opening - 1.)
+    elif characteristic == 'quick opening':
+        return Kv_max*opening**0.5
+    else:
+        raise Exception('Valve characteristic must be one of %s' %(valve_characteristics))
+
+
+def _Reynolds_factor_array(FL, C, d, Rev):
+    '''Array version of `Reynolds_factor`, with full or reduced trim selected
+    for each point by the same C/d^2 criterion used in the sizing functions.
+    Both low-Reynolds number branches are limited to 1 as in the standard.
+    Inputs are in the units of the standard.
+    '''
+    C_d2 = C/d**2
+    n = np.where(C_d2 > 0.016*N18, 1. + N32*C_d2**(2/3.),
+                 N2/np.minimum(C_d2, 0.04)**2)
+    with np.errstate(divide='ignore'):
+        FR_a = 1. + (0.33*FL**0.5)/n**0.25*np.log10(Rev/10000.)
+    FR_b = np.minimum(0.026/FL*(n*Rev)**0.5, 1.)
+    return np.where(Rev < 10., FR_b, np.minimum(FR_a, FR_b))
+
+
+def _laminar_flow(Q_turbulent, nu, D1, FL, Fd, C, d, maxiter=100):
+    '''Solves Q = FR(Rev(Q))*Q_turbulent by successive substitution, for all
+    points at once. Inputs are in the units of the standard.
+    '''
+    Q = Q_turbulent
+    for _ in range(maxiter):
+        Rev = Reynolds_valve(nu=nu, Q=Q, D1=D1, FL=FL, Fd=Fd, C=C)
+        Q_new = Q_turbulent*_Reynolds_factor_array(FL, C, d, Rev)
+        if np.all(np.abs(Q_new - Q) <= 1E-13*np.abs(Q_new)):
+            return Q_new
+        Q = Q_new
+    return Q
+
+
+def _piping_factors_l(C, d, FL, loss, loss_upstream):
+    '''Returns the piping geometry factor FP and the combined liquid pressure 
+    recovery factor FLP of a valve with attached fittings. Inputs are in the 
+    units of the standard.
+    '''
+    FP = (1. + loss/N2*(C/d**2)**2)**-0.5
+    FLP = FL*(1. + FL**2/N2*loss_upstream*(C/d**2)**2)**-0.5
+    return FP, FLP
+
+
+def _rate_l(rho, Psat, Pc, mu, P1, P2, C, D1, d, FL, Fd, loss, loss_upstream):
+    closed, C = _check_rating_inputs(C, P1, P2)
+    nu = mu/rho
+    dP = P1 - P2
+    FF = FF_critical_pressure_ratio_l(Psat=Psat, Pc=Pc)
+    dP_choked = FL**2*(P1 - FF*Psat)
+    # Turbulent, without piping geometry factors; eq 1 and 3
+    Q_0 = N1*C*(np.minimum(dP, dP_choked)*rho0/rho)**0.5
+    if loss_upstream or loss:
+        FP, FLP = _piping_factors_l(C, d, FL, loss, loss_upstream)
+        dP_choked = (FLP/FP)**2*(P1 - FF*Psat)
+        # Turbulent with attached fittings; eq 2 and 4
+        Q = N1*FP*C*(np.minimum(dP, dP_choked)*rho0/rho)**0.5
+    else:
+        Q = Q_0
+    Rev = Reynolds_valve(nu=nu, Q=Q_0, D1=D1, FL=FL, Fd=Fd, C=C)
+    laminar = Rev <= 10000.
+    if np.any(laminar):
+        Q = np.where(laminar, _laminar_flow(Q_0, nu, D1, FL, Fd, C, d), Q)
+    return np.where(closed, 0., Q)
+
+
+def _check_forward_flow(Q):
+    if np.any(np.asarray(Q) < 0):
+        raise ValueError('Reverse flow through the valve is not supported; '
+                         'flow rates must not be negative')
+
+
+def _check_rating_inputs(C, P1=None, P2=None):
+    # Returns whether each valve is closed (C = 0), and a flow coefficient
+    # for the calculations which is 1 for those; their results are replaced
+    if np.any(np.asarray(C) < 0):
+        raise ValueError('Flow coefficients must not be negative')
+    if P1 is not None and np.any(np.asarray(P2) > np.asarray(P1)):
+        raise ValueError('Reverse flow through the valve is not supported; '
+                         'outlet pressures must not exceed inlet pressures')
+    closed = np.asarray(C) == 0
+    return closed, np.where(closed, 1., C)
+
+
+def _dP_l(rho, Psat, Pc, mu, P1, Q, C, D1, d, FL, Fd, loss, loss_upstream):
+    _check_forward_flow(Q)
+    closed, C = _check_rating_inputs(C)
+    nu = mu/rho
+    FF = FF_critical_pressure_ratio_l(Psat=Psat, Pc=Pc)
+    Rev = Reynolds_valve(nu=nu, Q=Q, D1=D1, FL=FL, Fd=Fd, C=C)
+    # Flow the valve would pass if turbulent, without piping geometry factors;
+    # FR is zero at no flow, where the pressure drop is zero
+    laminar = Rev <= 10000.
+    with np.errstate(invalid='ignore', divide='ignore'):
+        FR = np.where(laminar, _Reynolds_factor_array(FL, C, d, Rev), 1.)
+        Q_0 = np.where(Q == 0, 0., Q/FR)
+    FP, FLP = _piping_factors_l(C, d, FL, loss, loss_upstream)
+    FP, FLP = np.where(laminar, 1., FP), np.where(laminar, FL, FLP)
+    dP = rho/rho0*(Q_0/(N1*FP*C))**2
+    dP_choked = (FLP/FP)**2*(P1 - FF*Psat)
+    dP = np.where(dP > dP_choked, np.nan, dP)
+    # Closed valves pass no flow at any pressure drop
+    return np.where(closed & (Q != 0), np.nan, dP)
+
+
+def _rate_g(T, MW, mu, gamma, Z, P1, P2, C, D1, d, FL, Fd, xT, loss, 
+            loss_upstream):
+    closed, C = _check_rating_inputs(C, P1, P2)
+    Vm = Z*R*T/(P1*1000)
+    rho = (Vm)**-1*MW/1000.
+    nu = mu/rho
+    dP = P1 - P2
+    Fgamma = gamma/1.40
+    x = dP/P1
+    # Turbulent, without piping geometry factors; eq 8a and 14a. Y is that of
+    # the pressure drop ratio limited to its choked value, so flow never falls
+    # as the pressure drop rises past choking
+    x_choked = np.minimum(x, Fgamma*xT)
+    Y = 1 - x_choked/(3*Fgamma*xT)
+    Q_0 = N9*P1*Y*C*(x_choked/(MW*T*Z))**0.5
+    if loss_upstream or loss:
+        FP = (1. + loss/N2*(C/d**2)**2)**-0.5
+        xTP = xT/FP**2/(1 + xT*loss_upstream/N5*(C/d**2)**2)
+        # Turbulent with attached fittings; eq 11a and 17a, with xTP in Y
+        x_choked = np.minimum(x, Fgamma*xTP)
+        Y = 1 - x_choked/(3*Fgamma*xTP)
+        Q = N9*FP*P1*Y*C*(x_choked/(MW*T*Z))**0.5
+    else:
+        Q = Q_0
+    Rev = Reynolds_valve(nu=nu, Q=Q_0, D1=D1, FL=FL, Fd=Fd, C=C)
+    laminar = Rev <= 10000.
+    if np.any(laminar):
+        Q = np.where(laminar, _laminar_flow(Q_0, nu, D1, FL, Fd, C, d), Q)
+    return np.where(closed, 0., Q)
+
+
+def _dP_g(T, MW, mu, gamma, Z, P1, Q, C, D1, d, FL, Fd, xT, loss,
+          loss_upstream):
+    _check_forward_flow(Q)
+    closed, C = _check_rating_inputs(C)
+    Vm = Z*R*T/(P1*1000)
+    rho = (Vm)**-1*MW/1000.
+    nu = mu/rho
+    Fgamma = gamma/1.40
+    Rev = Reynolds_valve(nu=nu, Q=Q, D1=D1, FL=FL, Fd=Fd, C=C)
+    laminar = Rev <= 10000.
+    with np.errstate(invalid='ignore', divide='ignore'):
+        FR = np.where(laminar, _Reynolds_factor_array(FL, C, d, Rev), 1.)
+        Q_0 = np.where(Q == 0, 0., Q/FR)
+    FP = np.where(laminar, 1., (1. + loss/N2*(C/d**2)**2)**-0.5)
+    xTP = np.where(laminar, xT, 
+                   xT/FP**2/(1 + xT*loss_upstream/N5*(C/d**2)**2))
+    # Solve Y*x^0.5 = q for x; with s = x^0.5 this is the cubic
+    # s^3 - 3as + 3aq = 0 with a = Fgamma*xTP as in `_rate_g`, whose root
+    # below a^0.5 is taken
+    q = Q_0/(N9*FP*P1*C)*(MW*T*Z)**0.5
+    a = Fgamma*xTP
+    with np.errstate(invalid='ignore'):
+        theta = np.arccos(-1.5*q/a**0.5)
+    x = (2.*a**0.5*np.cos(theta/3. - 2.*pi/3.))**2
+    dP = np.where(Q == 0, 0., np.where(x > Fgamma*xTP, np.nan, x*P1))
+    # Closed valves pass no flow at any pressure drop
+    return np.where(closed & (Q != 0), np.nan, dP)
+
+
+def rate_control_valve_l(rho, Psat, Pc, mu, P1, P2, C, D1, D2, d, FL, Fd):
+    r'''Calculates the flow rate of a liquid through a control valve of
+    known flow coefficient according to IEC 60534; the rating counterpart of
+    :obj:`size_control_valve_l` (see Notes). Uses a large number of inputs in
+    SI units.
+    Process conditions and `C` may be arrays; all points are solved
+    simultaneously.
+
+    Parameters
+    ----------
+    rho : float or ndarray
+        Density of the liquid at the inlet [kg/m^3]
+    Psat : float or ndarray
+        Saturation pressure of the fluid at inlet temperature [Pa]
+    Pc : float
+        Critical pressure of the fluid [Pa]
+    mu : float or ndarray
+        Viscosity of the fluid [Pa*s]
+    P1 : float or ndarray
+        Inlet pressure of the fluid before valves and reducers [Pa]
+    P2 : float or ndarray
+        Outlet pressure of the fluid after valves and reducers [Pa]
+    C : float or ndarray
+        Metric Kv valve flow coefficient (flow rate of water at a pressure drop  
+        of 1 bar) [m^3/hr]
+    D1 : float
+        Diameter of the pipe before the valve [m]
+    D2 : float
+        Diameter of the pipe after the valve [m]
+    d : float
+        Diameter of the valve [m]
+    FL : float
+        Liquid pressure recovery factor of a control valve without attached 
+        fittings []
+    Fd : float
+        Valve style modifier []
+
+    Returns
+    -------
+    Q : float or ndarray
+        Volumetric flow rate of the fluid [m^3/s]
+
+    Notes
+    -----
+    In turbulent flow the result is explicit, as the piping geometry factors
+    depend only on `C` and the diameters. When the valve Reynolds number of
+    the turbulent solution is under 10000, the Reynolds number factor is
+    applied and the flow rate solved by successive substitution. In laminar 
+    flow the sizing function increases `C` in 30% steps until it is 
+    sufficient, so round trips there are not exact.
+
+    A closed valve (`C` of zero) passes no flow. A ValueError is raised if
+    `P2` exceeds `P1` (reverse flow) or `C` is negative, as for negative flow
+    rates in :obj:`dP_control_valve_l`.
+
+    Examples
+    --------
+    Example 1 of [1]_ in reverse:
+
+    >>> rate_control_valve_l(rho=965.4, Psat=70.1E3, Pc=22120E3, mu=3.1472E-4,
+    ... P1=680E3, P2=220E3, C=164.9954763704956, D1=0.15, D2=0.15, d=0.15,
+    ... FL=0.9, Fd=0.46)
+    0.1
+
+    References
+    ----------
+    .. [1] IEC 60534-2-1 / ISA-75.01.01-2007
+    '''
+    P1, P2, Psat, Pc = P1/1000., P2/1000., Psat/1000., Pc/1000.
+    D1, D2, d = D1*1000., D2*1000., d*1000.
+    loss = loss_coefficient_piping(d, D1, D2)
+    loss_upstream = loss_coefficient_piping(d, D1)
+    Q = _rate_l(rho, Psat, Pc, mu, P1, P2, C, D1, d, FL, Fd, loss, 
+                loss_upstream)
+    return _scalar_or_array(Q/3600.)
+
+
+def dP_control_valve_l(rho, Psat, Pc, mu, P1, Q, C, D1, D2, d, FL, Fd):
+    r'''Calculates the pressure drop of a liquid flowing at a specified rate
+    through a control valve of known flow coefficient according to IEC 60534.
+    Uses a large number of inputs in SI units. Process conditions, `Q` and `C`
+    may be arrays.
+
+    Parameters
+    ----------
+    rho : float or ndarray
+        Density of the liquid at the inlet [kg/m^3]
+    Psat : float or ndarray
+        Saturation pressure of the fluid at inlet temperature [Pa]
+    Pc : float
+        Critical pressure of the fluid [Pa]
+    mu : float or ndarray
+        Viscosity of the fluid [Pa*s]
+    P1 : float or ndarray
+        Inlet pressure of the fluid before valves and reducers [Pa]
+    Q : float or ndarray
+        Volumetric flow rate of the fluid [m^3/s]
+    C : float or ndarray
+        Metric Kv valve flow coefficient (flow rate of water at a pressure drop  
+        of 1 bar) [m^3/hr]
+    D1 : float
+        Diameter of the pipe before the valve [m]
+    D2 : float
+        Diameter of the pipe after the valve [m]
+    d : float
+        Diameter of the valve [m]
+    FL : float
+        Liquid pressure recovery factor of a control valve without attached 
+        fittings []
+    Fd : float
+        Valve style modifier []
+
+    Returns
+    -------
+    dP : float or ndarray
+        Pressure drop across the valve and its reducers/expanders [Pa]
+
+    Notes
+    -----
+    The calculation is explicit, as the valve Reynolds number is known from 
+    the flow rate. Flow rates above the choked flow rate of the valve at `P1`
+    cannot be reached at any pressure drop; NaN is returned for them.
+    No flow gives no pressure drop, and no flow rate can pass a closed
+    valve (`C` of zero), for which NaN is returned. Negative (reverse) flow
+    rates and negative `C` raise a ValueError.
+
+    Examples
+    --------
+    >>> dP_control_valve_l(rho=965.4, Psat=70.1E3, Pc=22120E3, mu=3.1472E-4,
+    ... P1=680E3, Q=0.05, C=164.9954763704956, D1=0.15, D2=0.15, d=0.15,
+    ... FL=0.9, Fd=0.46)
+    115000.00000000003
+
+    References
+    ----------
+    .. [1] IEC 60534-2-1 / ISA-75.01.01-2007
+    '''
+    P1, Psat, Pc = P1/1000., Psat/1000., Pc/1000.
+    D1, D2, d = D1*1000., D2*1000., d*1000.
+    loss = loss_coefficient_piping(d, D1, D2)
+    loss_upstream = loss_coefficient_piping(d, D1)
+    dP = _dP_l(rho, Psat, Pc, mu, P1, Q*3600., C, D1, d, FL, Fd, loss, 
+               loss_upstream)
+    return _scalar_or_array(dP*1000.)
+
+
+def rate_control_valve_g(T, MW, mu, gamma, Z, P1, P2, C, D1, D2, d, FL, Fd, 
+                         xT):
+    r'''Calculates the flow rate of a gas through a control valve of known 
+    flow coefficient according to IEC 60534; the rating counterpart of
+    :obj:`size_control_valve_g` (see Notes). Uses a large number of inputs in
+    SI units.
+    Process conditions and `C` may be arrays; all points are solved
+    simultaneously. Note the returned flow is at standard conditions.
+
+    Parameters
+    ----------
+    T : float or ndarray
+        Temperature of the gas at the inlet [K]
+    MW : float or ndarray
+        Molecular weight of the gas [g/mol]
+    mu : float or ndarray
+        Viscosity of the fluid at inlet conditions [Pa*s]
+    gamma : float or ndarray
+        Specific heat capacity ratio [-]
+    Z : float or ndarray
+        Compressibility factor at inlet conditions, [-]
+    P1 : float or ndarray
+        Inlet pressure of the gas before valves and reducers [Pa]
+    P2 : float or ndarray
+        Outlet pressure of the gas after valves and reducers [Pa]
+    C : float or ndarray
+        Metric Kv valve flow coefficient (flow rate of water at a pressure drop  
+        of 1 bar) [m^3/hr]
+    D1 : float
+        Diameter of the pipe before the valve [m]
+    D2 : float
+        Diameter of the pipe after the valve [m]
+    d : float
+        Diameter of the valve [m]
+    FL : float
+        Liquid pressure recovery factor of a control valve without attached
+        fittings [-]
+    Fd : float
+        Valve style modifier [-]
+    xT : float
+        Pressure difference ratio factor of a valve without fittings at choked
+        flow [-]
+
+    Returns
+    -------
+    Q : float or ndarray
+        Volumetric flow rate of the gas at *273.15 K* and 1 atm specifically
+        [m^3/s]
+
+    Notes
+    -----
+    When fittings are attached, the expansion factor `Y` is computed with
+    `xTP`, from the pressure drop ratio limited to its choked value
+    :math:`F_\gamma x_{TP}`, so the flow rate never falls as the pressure
+    drop rises past choking. :obj:`size_control_valve_g` computes `Y` with
+    `xT` instead, and stops iterating on the piping geometry factor at 1%
+    tolerance, so it is not the exact inverse of this function when fittings
+    are attached: below choking the flow rate for a coefficient it returns
+    can differ by a few percent, and the pressure drop by more. Without
+    fittings, round trips in turbulent flow are exact. In laminar flow the
+    sizing function increases `C` in 30% steps until it is sufficient, so
+    round trips there are not exact either.
+
+    A closed valve (`C` of zero) passes no flow. A ValueError is raised if
+    `P2` exceeds `P1` (reverse flow) or `C` is negative, as for negative flow
+    rates in :obj:`dP_control_valve_g`.
+
+    Examples
+    --------
+    Example 3 of [1]_ in reverse:
+
+    >>> rate_control_valve_g(T=433., MW=44.01, mu=1.4665E-4, gamma=1.30,
+    ... Z=0.988, P1=680E3, P2=310E3, C=72.58664545391052, D1=0.08, D2=0.1,
+    ... d=0.05, FL=0.85, Fd=0.42, xT=0.60)
+    1.075122540600178
+
+    References
+    ----------
+    .. [1] IEC 60534-2-1 / ISA-75.01.01-2007
+    '''
+    P1, P2 = P1/1000., P2/1000.
+    D1, D2, d = D1*1000., D2*1000., d*1000.
+    loss = loss_coefficient_piping(d, D1, D2)
+    loss_upstream = loss_coefficient_piping(d, D1)
+    Q = _rate_g(T, MW, mu, gamma, Z, P1, P2, C, D1, d, FL, Fd, xT, loss, 
+                loss_upstream)
+    return _scalar_or_array(Q/3600.)
+
+
+def dP_control_valve_g(T, MW, mu, gamma, Z, P1, Q, C, D1, D2, d, FL, Fd, xT):
+    r'''Calculates the pressure drop of a gas flowing at a specified rate
+    through a control valve of known flow coefficient according to IEC 60534.
+    Uses a large number of inputs in SI units. Process conditions, `Q` and `C`
+    may be arrays.
+
+    Parameters
+    ----------
+    T : float or ndarray
+        Temperature of the gas at the inlet [K]
+    MW : float or ndarray
+        Molecular weight of the gas [g/mol]
+    mu : float or ndarray
+        Viscosity of the fluid at inlet conditions [Pa*s]
+    gamma : float or ndarray
+        Specific heat capacity ratio [-]
+    Z : float or ndarray
+        Compressibility factor at inlet conditions, [-]
+    P1 : float or ndarray
+        Inlet pressure of the gas before valves and reducers [Pa]
+    Q : float or ndarray
+        Volumetric flow rate of the gas at *273.15 K* and 1 atm specifically
+        [m^3/s]
+    C : float or ndarray
+        Metric Kv valve flow coefficient (flow rate of water at a pressure drop  
+        of 1 bar) [m^3/hr]
+    D1 : float
+        Diameter of the pipe before the valve [m]
+    D2 : float
+        Diameter of the pipe after the valve [m]
+    d : float
+        Diameter of the valve [m]
+    FL : float
+        Liquid pressure recovery factor of a control valve without attached
+        fittings [-]
+    Fd : float
+        Valve style modifier [-]
+    xT : float
+        Pressure difference ratio factor of a valve without fittings at choked
+        flow [-]
+
+    Returns
+    -------
+    dP : float or ndarray
+        Pressure drop across the valve and its reducers/expanders [Pa]
+
+    Notes
+    -----
+    The flow equation is a cubic in the square root of the pressure drop
+    ratio, and is solved analytically. Flow rates above the choked flow rate
+    of the valve at `P1` cannot be reached at any pressure drop; NaN is 
+    returned for them.
+    No flow gives no pressure drop, and no flow rate can pass a closed
+    valve (`C` of zero), for which NaN is returned. Negative (reverse) flow
+    rates and negative `C` raise a ValueError.
+
+    Examples
+    --------
+    >>> dP_control_valve_g(T=433., MW=44.01, mu=1.4665E-4, gamma=1.30,
+    ... Z=0.988, P1=680E3, Q=0.5, C=72.58664545391052, D1=0.08, D2=0.1,
+    ... d=0.05, FL=0.85, Fd=0.42, xT=0.60)
+    40625.29058287047
+
+    References
+    ----------
+    .. [1] IEC 60534-2-1 / ISA-75.01.01-2007
+    '''
+    P1 = P1/1000.
+    D1, D2, d = D1*1000., D2*1000., d*1000.
+    loss = loss_coefficient_piping(d, D1, D2)
+    loss_upstream = loss_coefficient_piping(d, D1)
+    dP = _dP_g(T, MW, mu, gamma, Z, P1, Q*3600., C, D1, d, FL, Fd, xT, loss,
+               loss_upstream)
+    return _scalar_or_array(dP*1000.)
+
+
+class ControlValve(object):
+    r'''Class representing an installed control valve of fixed size and trim,
+    for repeated rating calculations at varying travel and process
+    conditions, as in dynamic simulation. The piping loss coefficients of the
+    attached reducers/expanders are computed once on creation. All parameters
+    are also attributes.
+
+    Parameters
+    ----------
+    d : float
+        Diameter of the valve [m]
+    D1 : float
+        Diameter of the pipe before the valve [m]
+    D2 : float
+        Diameter of the pipe after the valve [m]
+    Kv_max : float
+        Metric Kv valve flow coefficient at full travel [m^3/hr]
+    FL : float
+        Liquid pressure recovery factor of a control valve without attached 
+        fittings [-]
+    Fd : float
+        Valve style modifier [-]
+    xT : float, optional
+        Pressure difference ratio factor of a valve without fittings at choked
+        flow; required for gas calculations [-]
+    characteristic : str, optional
+        Inherent flow characteristic of the valve; one of 'linear', 
+        'equal percentage', or 'quick opening'
+    rangeability : float, optional
+        Rangeability of an equal percentage valve [-]
+
+    Attributes
+    ----------
+    loss : float
+        Sum of the loss coefficients of the reducer and expander [-]
+    loss_upstream : float
+        Sum of the loss coefficients upstream of the valve [-]
+
+    Examples
+    --------
+    >>> valve = ControlValve(d=0.15, D1=0.15, D2=0.15, Kv_max=200., FL=0.9,
+    ... Fd=0.46, characteristic='equal percentage')
+    >>> valve.Q_l(rho=965.4, Psat=70.1E3, Pc=22120E3, mu=3.1472E-4, P1=680E3,
+    ... P2=np.array([600E3, 400E3, 220E3]), opening=0.8)
+    array([ 0.02311692,  0.0432478 ,  0.05543244])
+    '''
+    def __repr__(self): # pragma: no cover
+        return ('<ControlValve, d=%f m, D1=%f m, D2=%f m, Kv_max=%f m^3/hr, %s>'
+                %(self.d, self.D1, self.D2, self.Kv_max, self.characteristic))
+
+    def __init__(self, d, D1, D2, Kv_max, FL, Fd, xT=None, 
+                 characteristic='linear', rangeability=50.):
+        if characteristic not in valve_characteristics:
+            raise Exception('Valve characteristic must be one of %s' %(valve_characteristics))
+        self.d = d
+        self.D1 = D1
+        self.D2 = D2
+        self.Kv_max = Kv_max
+        self.FL = FL
+        self.Fd = Fd
+        self.xT = xT
+        self.characteristic = characteristic
+        self.rangeability = rangeability
+
+        # Diameters in mm, according to constants in standard
+        self._d, self._D1 = d*1000., D1*1000.
+        self.loss = loss_coefficient_piping(self._d, self._D1, D2*1000.)
+        self.loss_upstream = loss_coefficient_piping(self._d, self._D1)
+
+    def Kv(self, opening=1.):
+        r'''Method to calculate the flow coefficient of the valve at a 
+        fractional travel `opening`, according to its characteristic.
+
+        Parameters
+        ----------
+        opening : float or ndarray, optional
+            Fractional travel (lift) of the valve, 0 to 1 [-]
+
+        Returns
+        -------
+        Kv : float or ndarray
+            Metric Kv valve flow coefficient at the specified travel [m^3/hr]
+        '''
+        return Kv_characteristic(opening, self.Kv_max, self.characteristic, 
+                                 self.rangeability)
+
+    def Q_l(self, rho, Psat, Pc, mu, P1, P2, opening=1.):
+        r'''Method to calculate the flow rate of a liquid through the valve at
+        a fractional travel `opening`. See :obj:`rate_control_valve_l`.
+
+        Parameters
+        ----------
+        rho : float or ndarray
+            Density of the liquid at the inlet [kg/m^3]
+        Psat : float or ndarray
+            Saturation pressure of the fluid at inlet temperature [Pa]
+        Pc : float
+            Critical pressure of the fluid [Pa]
+        mu : float or ndarray
+            Viscosity of the fluid [Pa*s]
+        P1 : float or ndarray
+            Inlet pressure of the fluid before valves and reducers [Pa]
+        P2 : float or ndarray
+            Outlet pressure of the fluid after valves and reducers [Pa]
+        opening : float or ndarray, optional
+            Fractional travel (lift) of the valve, 0 to 1 [-]
+
+        Returns
+        -------
+        Q : float or ndarray
+            Volumetric flow rate of the fluid [m^3/s]
+        '''
+        Q = _rate_l(rho, Psat/1000., Pc/1000., mu, P1/1000., P2/1000., 
+                    self.Kv(opening), self._D1, self._d, self.FL, self.Fd,
+                    self.loss, self.loss_upstream)
+        return _scalar_or_array(Q/3600.)
+
+    def dP_l(self, rho, Psat, Pc, mu, P1, Q, opening=1.):
+        r'''Method to calculate the pressure drop of a liquid flowing through
+        the valve at a fractional travel `opening`. See 
+        :obj:`dP_control_valve_l`.
+
+        Parameters
+        ----------
+        rho : float or ndarray
+            Density of the liquid at the inlet [kg/m^3]
+        Psat : float or ndarray
+            Saturation pressure of the fluid at inlet temperature [Pa]
+        Pc : float
+            Critical pressure of the fluid [Pa]
+        mu : float or ndarray
+            Viscosity of the fluid [Pa*s]
+        P1 : float or ndarray
+            Inlet pressure of the fluid before valves and reducers [Pa]
+        Q : float or ndarray
+            Volumetric flow rate of the fluid [m^3/s]
+        opening : float or ndarray, optional
+            Fractional travel (lift) of the valve, 0 to 1 [-]
+
+        Returns
+        -------
+        dP : float or ndarray
+            Pressure drop across the valve and its reducers/expanders [Pa]
+        '''
+        dP = _dP_l(rho, Psat/1000., Pc/1000., mu, P1/1000., Q*3600., 
+                   self.Kv(opening), self._D1, self._d, self.FL, self.Fd,
+                   self.loss, self.loss_upstream)
+        return _scalar_or_array(dP*1000.)
+
+    def Q_g(self, T, MW, mu, gamma, Z, P1, P2, opening=1.):
+        r'''Method to calculate the flow rate of a gas through the valve at
+        a fractional travel `opening`. See :obj:`rate_control_valve_g`.
+
+        Parameters
+        ----------
+        T : float or ndarray
+            Temperature of the gas at the inlet [K]
+        MW : float or ndarray
+            Molecular weight of the gas [g/mol]
+        mu : float or ndarray
+            Viscosity of the fluid at inlet conditions [Pa*s]
+        gamma : float or ndarray
+            Specific heat capacity ratio [-]
+        Z : float or ndarray
+            Compressibility factor at inlet conditions, [-]
+        P1 : float or ndarray
+            Inlet pressure of the gas before valves and reducers [Pa]
+        P2 : float or ndarray
+            Outlet pressure of the gas after valves and reducers [Pa]
+        opening : float or ndarray, optional
+            Fractional travel (lift) of the valve, 0 to 1 [-]
+
+        Returns
+        -------
+        Q : float or ndarray
+            Volumetric flow rate of the gas at *273.15 K* and 1 atm 
+            specifically [m^3/s]
+        '''
+        Q = _rate_g(T, MW, mu, gamma, Z, P1/1000., P2/1000., 
+                    self.Kv(opening), self._D1, self._d, self.FL, self.Fd,
+                    self.xT, self.loss, self.loss_upstream)
+        return _scalar_or_array(Q/3600.)
+
+    def dP_g(self, T, MW, mu, gamma, Z, P1, Q, opening=1.):
+        r'''Method to calculate the pressure drop of a gas flowing through 
+        the valve at a fractional travel `opening`. See 
+        :obj:`dP_control_valve_g`.
+
+        Parameters
+        ----------
+        T : float or ndarray
+            Temperature of the gas at the inlet [K]
+        MW : float or ndarray
+            Molecular weight of the gas [g/mol]
+        mu : float or ndarray
+            Viscosity of the fluid at inlet conditions [Pa*s]
+        gamma : float or ndarray
+            Specific heat capacity ratio [-]
+        Z : float or ndarray
+            Compressibility factor at inlet conditions, [-]
+        P1 : float or ndarray
+            Inlet pressure of the gas before valves and reducers [Pa]
+        Q : float or ndarray
+            Volumetric flow rate of the gas at *273.15 K* and 1 atm 
+            specifically [m^3/s]
+        opening : float or ndarray, optional
+            Fractional travel (lift) of the valve, 0 to 1 [-]
+
+        Returns
+        -------
+        dP : float or ndarray
+            Pressure drop across the valve and its reducers/expanders [Pa]
+        '''
+        dP = _dP_g(T, MW, mu, gamma, Z, P1/1000., Q*3600., self.Kv(opening),
+                   self._D1, self._d, self.FL, self.Fd, self.xT, self.loss,
+                   self.loss_upstream)
+        return _scalar_or_array(dP*1000.)
+
+    def envelope_l(self, rho, Psat, Pc, mu, P1, P2=None, Q=None, opening=1.,
+                   xFz=None):
+        r'''Method to screen the valve over an operating envelope of liquid
+        inlet conditions, travels, and either outlet pressures or flow rates.
+        The missing one of `P2` and `Q` is calculated at each point with 
+        :obj:`rate_control_valve_l` or :obj:`dP_control_valve_l`, and the 
+        point classified with :obj:`control_valve_regime_l`. Points whose 
+        specified flow rate exceeds the choked capacity of the valve are 
+        'over capacity'. Arrays of any compatible shapes may be used, for 
+        example those from `np.meshgrid`.
+
+        Parameters
+        ----------
+        rho : float or ndarray
+            Density of the liquid at the inlet [kg/m^3]
+        Psat : float or ndarray
+            Saturation pressure of the fluid at inlet temperature [Pa]
+        Pc : float
+            Critical pressure of the fluid [Pa]
+        mu : float or ndarray
+            Viscosity of the fluid [Pa*s]
+        P1 : float or ndarray
+            Inlet pressure of the fluid before valves and reducers [Pa]
+        P2 : float or ndarray, optional
+            Outlet pressure of the fluid after valves and reducers [Pa]
+        Q : float or ndarray, optional
+            Volumetric flow rate of the fluid [m^3/s]
+        opening : float or ndarray, optional
+            Fractional travel (lift) of the valve, 0 to 1 [-]
+        xFz : float or ndarray, optional
+            Incipient cavitation pressure differential ratio; estimated with 
+            :obj:`xFz_estimate` if not provided [-]
+
+        Returns
+        -------
+        Q : float or ndarray
+            Volumetric flow rate of the fluid [m^3/s]
+        dP : float or ndarray
+            Pressure drop across the valve and its reducers/expanders; NaN 
+            when over capacity [Pa]
+        regime : int or ndarray
+            Index of the regime in `valve_regimes_l` [-]
+
+        Examples
+        --------
+        >>> valve = ControlValve(d=0.1, D1=0.1, D2=0.1, Kv_max=200., FL=0.9,
+        ... Fd=0.46)
+        >>> Q, dP, regime = valve.envelope_l(rho=965.4, Psat=70.1E3, 
+        ... Pc=22120E3, mu=3.1472E-4, P1=680E3, 
+        ... P2=np.array([600E3, 400E3, 150E3, 50E3]))
+        >>> [valve_regimes_l[i] for i in regime]
+        ['non-cavitating', 'incipient cavitation', 'choked', 'flashing']
+        '''
+        if P2 is not None:
+            Q = self.Q_l(rho, Psat, Pc, mu, P1, P2, opening)
+            dP = P1 - P2
+        elif Q is not None:
+            dP = self.dP_l(rho, Psat, Pc, mu, P1, Q, opening)
+        else:
+            raise Exception('Either P2 or Q is needed')
+        C = self.Kv(opening)
+        if xFz is None:
+            xFz = xFz_estimate(C, self.FL, self.Fd)
+        FP = FLP = None
+        if self.loss or self.loss_upstream:
+            FP, FLP = _piping_factors_l(C, self._d, self.FL, self.loss, 
+                                        self.loss_upstream)
+        with np.errstate(invalid='ignore'):
+            regime = control_valve_regime_l(P1, P1 - dP, Psat, Pc, self.FL,
+                                            xFz, FLP=FLP, FP=FP)
+        regime = np.where(np.isnan(dP), 4, regime)
+        return Q, dP, _scalar_or_array(regime, int)
@@ -21,19 +21,46 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.'''
 
 from __future__ import division
-from math import exp, log, log10, tanh
+from bisect import bisect_right
+import math
 import numpy as np
 from scipy.constants import g
 from scipy.optimize import newton
 from scipy.integrate import odeint, cumtrapz
 from fluids.core import Reynolds
 
-__all__ = ['drag_sphere', 'v_terminal', 'integrate_drag_sphere', 'Stokes',
+__all__ = ['drag_sphere', 'v_terminal', 'integrate_drag_sphere',
+'integrate_drag_spheres', 'Stokes',
 'Barati', 'Barati_high', 'Rouse', 'Engelund_Hansen',
 'Clift_Gauvin', 'Morsi_Alexander', 'Graf', 'Flemmer_Banks', 'Khan_Richardson',
 'Swamee_Ojha', 'Yen', 'Haider_Levenspiel', 'Cheng', 'Terfous',
 'Mikhailov_Freire', 'Clift', 'Ceylan', 'Almedeij', 'Morrison', 'Song_Xu']
 
+
+def _is_scalar(x):
+    # The isinstance check keeps the common float case as fast as before
+    return isinstance(x, (float, int)) or np.ndim(x) == 0
+
+
+def _lib(x):
+    # `math` for scalars so scalar results are unchanged; numpy for arrays
+    return math if _is_scalar(x) else np
+
+
+def _piecewise(Re, bounds, funcs):
+    # Evaluates funcs[i](Re, lib) in the region bounds[i-1] <= Re < bounds[i];
+    # arrays are split into one masked evaluation per region
+    if _is_scalar(Re):
+        return funcs[bisect_right(bounds, Re)](Re, math)
+    Re = np.asarray(Re, dtype=float)
+    regions = np.searchsorted(bounds, Re, side='right')
+    Cd = np.empty(Re.shape)
+    for i, func in enumerate(funcs):
+        mask = regions == i
+        if np.any(mask):
+            Cd[mask] = func(Re[mask], np)
+    return Cd
+
 def Stokes(Re):
     r'''Calculates drag coefficient of a smooth sphere using Stoke's law.
 
@@ -42,13 +69,13 @@ def Stokes(Re):
 
     Parameters
     ----------
-    Re : float
+    Re : float or ndarray
         Particle Reynolds number of the sphere using the surrounding fluid
         density and viscosity, [-]
 
     Returns
     -------
-    Cd : float
+    Cd : float or ndarray
         Drag coefficient [-]
 
     Notes
@@ -78,13 +105,13 @@ def Barati(Re):
 
     Parameters
     ----------
-    Re : float
+    Re : float or ndarray
         Particle Reynolds number of the sphere using the surrounding fluid
         density and viscosity, [-]
 
     Returns
     -------
-    Cd : float
+    Cd : float or ndarray
         Drag coefficient [-]
 
     Notes
@@ -106,6 +133,7 @@ def Barati(Re):
        Evolutionary Approach." Powder Technology 257 (May 2014): 11-19.
        doi:10.1016/j.powtec.2014.02.045.
     '''
+    tanh = _lib(Re).tanh
     Cd = (5.4856E9*tanh(4.3774E-9/Re) + 0.0709*tanh(700.6574/Re)
     + 0.3894*tanh(74.1539/Re) - 0.1198*tanh(7429.0843/Re)
     + 1.7174*tanh(9.9851/(Re+2.3384)) + 0.4744)
@@ -126,13 +154,13 @@ def Barati_high(Re):
 
     Parameters
     ----------
-    Re : float
+    Re : float or ndarray
         Particle Reynolds number of the sphere using the surrounding fluid
         density and viscosity, [-]
 
     Returns
     -------
-    Cd : float
+    Cd : float or ndarray
         Drag coefficient [-]
 
     Notes
@@ -156,6 +184,8 @@ def Barati_high(Re):
        Evolutionary Approach." Powder Technology 257 (May 2014): 11-19.
        doi:10.1016/j.powtec.2014.02.045.
     '''
+    lib = _lib(Re)
+    exp, log, tanh = lib.exp, lib.log, lib.tanh
     Cd = (8E-6*((Re/6530.)**2 + tanh(Re) - 8*log(Re)/log(10.))
     - 0.4119*exp(-2.08E43/(Re+Re**2)**4)
     - 2.1344*exp(-((log(Re**2 + 10.7563)/log(10))**2 + 9.9867)/Re)
@@ -173,13 +203,13 @@ def Rouse(Re):
 
     Parameters
     ----------
-    Re : float
+    Re : float or ndarray
         Particle Reynolds number of the sphere using the surrounding fluid
         density and viscosity, [-]
 
     Returns
     -------
-    Cd : float
+    Cd : float or ndarray
         Drag coefficient [-]
 
     Notes
@@ -213,13 +243,13 @@ def Engelund_Hansen(Re):
 
     Parameters
     ----------
-    Re : float
+    Re : float or ndarray
         Particle Reynolds number of the sphere using the surrounding fluid
         density and viscosity, [-]
 
     Returns
     -------
-    Cd : float
+    Cd : float or ndarray
         Drag coefficient [-]
 
     Notes
@@ -255,13 +285,13 @@ def Clift_Gauvin(Re):
 
     Parameters
     ----------
-    Re : float
+    Re : float or ndarray
         Particle Reynolds number of the sphere using the surrounding fluid
         density and viscosity, [-]
 
     Returns
     -------
-    Cd : float
+    Cd : float or ndarray
         Drag coefficient [-]
 
     Notes
@@ -303,13 +333,13 @@ def Morsi_Alexander(Re):
 
     Parameters
     ----------
-    Re : float
+    Re : float or ndarray
         Particle Reynolds number of the sphere using the surrounding fluid
         density and viscosity, [-]
 
     Returns
     -------
-    Cd : float
+    Cd : float or ndarray
         Drag coefficient [-]
 
     Notes
@@ -333,22 +363,19 @@ def Morsi_Alexander(Re):
        Evolutionary Approach." Powder Technology 257 (May 2014): 11-19.
        doi:10.1016/j.powtec.2014.02.045.
     '''
-    if Re < 0.1:
-        return 24./Re
-    elif Re < 1:
-        return 22.73/Re + 0.0903/Re**2 + 3.69
-    elif Re < 10:
-        return 29.1667/Re - 3.8889/Re**2 + 1.222
-    elif Re < 100:
-        return 46.5/Re - 116.67/Re**2 + 0.6167
-    elif Re < 1000:
-        return 98.33/Re - 2778./Re**2 + 0.3644
-    elif Re < 5000:
-        return 148.62/Re - 4.75E4/Re**2 + 0.357
-    elif Re < 10000:
-        return -490.546/Re + 57.87E4/Re**2 + 0.46
-    else:
-        return -1662.5/Re + 5.4167E6/Re**2 + 0.5191
+    return _piecewise(Re, _Morsi_Alexander_bounds, _Morsi_Alexander_funcs)
+
+
+_Morsi_Alexander_bounds = (0.1, 1., 10., 100., 1000., 5000., 10000.)
+_Morsi_Alexander_funcs = (
+    lambda Re, lib: 24./Re,
+    lambda Re, lib: 22.73/Re + 0.0903/Re**2 + 3.69,
+    lambda Re, lib: 29.1667/Re - 3.8889/Re**2 + 1.222,
+    lambda Re, lib: 46.5/Re - 116.67/Re**2 + 0.6167,
+    lambda Re, lib: 98.33/Re - 2778./Re**2 + 0.3644,
+    lambda Re, lib: 148.62/Re - 4.75E4/Re**2 + 0.357,
+    lambda Re, lib: -490.546/Re + 57.87E4/Re**2 + 0.46,
+    lambda Re, lib: -1662.5/Re + 5.4167E6/Re**2 + 0.5191)
 
 
 def Graf(Re):
@@ -360,13 +387,13 @@ def Graf(Re):
 
     Parameters
     ----------
-    Re : float
+    Re : float or ndarray
         Particle Reynolds number of the sphere using the surrounding fluid
         density and viscosity, [-]
 
     Returns
     -------
-    Cd : float
+    Cd : float or ndarray
         Drag coefficient [-]
 
     Notes
@@ -402,13 +429,13 @@ def Flemmer_Banks(Re):
 
     Parameters
     ----------
-    Re : float
+    Re : float or ndarray
         Particle Reynolds number of the sphere using the surrounding fluid
         density and viscosity, [-]
 
     Returns
     -------
-    Cd : float
+    Cd : float or ndarray
         Drag coefficient [-]
 
     Notes
@@ -431,7 +458,7 @@ def Flemmer_Banks(Re):
        Evolutionary Approach." Powder Technology 257 (May 2014): 11-19.
        doi:10.1016/j.powtec.2014.02.045.
     '''
-    E = 0.383*Re**0.356 - 0.207*Re**0.396 - 0.143/(1 + (log10(Re))**2)
+    E = 0.383*Re**0.356 - 0.207*Re**0.396 - 0.143/(1 + (_lib(Re).log10(Re))**2)
     return 24./Re*10**E
 
 
@@ -444,13 +471,13 @@ def Khan_Richardson(Re):
 
     Parameters
     ----------
-    Re : float
+    Re : float or ndarray
         Particle Reynolds number of the sphere using the surrounding fluid
         density and viscosity, [-]
 
     Returns
     -------
-    Cd : float
+    Cd : float or ndarray
         Drag coefficient [-]
 
     Notes
@@ -487,13 +514,13 @@ def Swamee_Ojha(Re):
 
     Parameters
     ----------
-    Re : float
+    Re : float or ndarray
         Particle Reynolds number of the sphere using the surrounding fluid
         density and viscosity, [-]
 
     Returns
     -------
-    Cd : float
+    Cd : float or ndarray
         Drag coefficient [-]
 
     Notes
@@ -529,13 +556,13 @@ def Yen(Re):
 
     Parameters
     ----------
-    Re : float
+    Re : float or ndarray
         Particle Reynolds number of the sphere using the surrounding fluid
         density and viscosity, [-]
 
     Returns
     -------
-    Cd : float
+    Cd : float or ndarray
         Drag coefficient [-]
 
     Notes
@@ -570,13 +597,13 @@ def Haider_Levenspiel(Re):
 
     Parameters
     ----------
-    Re : float
+    Re : float or ndarray
         Particle Reynolds number of the sphere using the surrounding fluid
         density and viscosity, [-]
 
     Returns
     -------
-    Cd : float
+    Cd : float or ndarray
         Drag coefficient [-]
 
     Notes
@@ -612,13 +639,13 @@ def Cheng(Re):
 
     Parameters
     ----------
-    Re : float
+    Re : float or ndarray
         Particle Reynolds number of the sphere using the surrounding fluid
         density and viscosity, [-]
 
     Returns
     -------
-    Cd : float
+    Cd : float or ndarray
         Drag coefficient [-]
 
     Notes
@@ -641,7 +668,7 @@ def Cheng(Re):
        Evolutionary Approach." Powder Technology 257 (May 2014): 11-19.
        doi:10.1016/j.powtec.2014.02.045.
     '''
-    return 24./Re*(1. + 0.27*Re)**0.43 + 0.47*(1. - exp(-0.04*Re**0.38))
+    return 24./Re*(1. + 0.27*Re)**0.43 + 0.47*(1. - _lib(Re).exp(-0.04*Re**0.38))
 
 
 def Terfous(Re):
@@ -654,13 +681,13 @@ def Terfous(Re):
 
     Parameters
     ----------
-    Re : float
+    Re : float or ndarray
         Particle Reynolds number of the sphere using the surrounding fluid
         density and viscosity, [-]
 
     Returns
     -------
-    Cd : float
+    Cd : float or ndarray
         Drag coefficient [-]
 
     Notes
@@ -696,13 +723,13 @@ def Mikhailov_Freire(Re):
 
     Parameters
     ----------
-    Re : float
+    Re : float or ndarray
         Particle Reynolds number of the sphere using the surrounding fluid
         density and viscosity, [-]
 
     Returns
     -------
-    Cd : float
+    Cd : float or ndarray
         Drag coefficient [-]
 
     Notes
@@ -748,13 +775,13 @@ def Clift(Re):
 
     Parameters
     ----------
-    Re : float
+    Re : float or ndarray
         Particle Reynolds number of the sphere using the surrounding fluid
         density and viscosity, [-]
 
     Returns
     -------
-    Cd : float
+    Cd : float or ndarray
         Drag coefficient [-]
 
     Notes
@@ -776,24 +803,20 @@ def Clift(Re):
        Evolutionary Approach." Powder Technology 257 (May 2014): 11-19.
        doi:10.1016/j.powtec.2014.02.045.
     '''
-    if Re < 0.01:
-        return 24./Re + 3/16.
-    elif Re < 20:
-        return 24./Re*(1 + 0.1315*Re**(0.82 - 0.05*log10(Re)))
-    elif Re < 260:
-        return 24./Re*(1 + 0.1935*Re**(0.6305))
-    elif Re < 1500:
-        return 10**(1.6435 - 1.1242*log10(Re) + 0.1558*(log10(Re))**2)
-    elif Re < 12000:
-        return 10**(-2.4571 + 2.5558*log10(Re) - 0.9295*(log10(Re))**2 + 0.1049*log10(Re)**3)
-    elif Re < 44000:
-        return 10**(-1.9181 + 0.6370*log10(Re) - 0.0636*(log10(Re))**2)
-    elif Re < 338000:
-        return 10**(-4.3390 + 1.5809*log10(Re) - 0.1546*(log10(Re))**2)
-    elif Re < 400000:
-        return 29.78 - 5.3*log10(Re)
-    else:
-        return 0.19*log10(Re) - 0.49
+    return _piecewise(Re, _Clift_bounds, _Clift_funcs)
+
+
+_Clift_bounds = (0.01, 20., 260., 1500., 12000., 44000., 338000., 400000.)
+_Clift_funcs = (
+    lambda Re, lib: 24./Re + 3/16.,
+    lambda Re, lib: 24./Re*(1 + 0.1315*Re**(0.82 - 0.05*lib.log10(Re))),
+    lambda Re, lib: 24./Re*(1 + 0.1935*Re**(0.6305)),
+    lambda Re, lib: 10**(1.6435 - 1.1242*lib.log10(Re) + 0.1558*(lib.log10(Re))**2),
+    lambda Re, lib: 10**(-2.4571 + 2.5558*lib.log10(Re) - 0.9295*(lib.log10(Re))**2 + 0.1049*lib.log10(Re)**3),
+    lambda Re, lib: 10**(-1.9181 + 0.6370*lib.log10(Re) - 0.0636*(lib.log10(Re))**2),
+    lambda Re, lib: 10**(-4.3390 + 1.5809*lib.log10(Re) - 0.1546*(lib.log10(Re))**2),
+    lambda Re, lib: 29.78 - 5.3*lib.log10(Re),
+    lambda Re, lib: 0.19*lib.log10(Re) - 0.49)
 
 
 def Ceylan(Re):
@@ -808,13 +831,13 @@ def Ceylan(Re):
 
     Parameters
     ----------
-    Re : float
+    Re : float or ndarray
         Particle Reynolds number of the sphere using the surrounding fluid
         density and viscosity, [-]
 
     Returns
     -------
-    Cd : float
+    Cd : float or ndarray
         Drag coefficient [-]
 
     Notes
@@ -839,6 +862,7 @@ def Ceylan(Re):
        Evolutionary Approach." Powder Technology 257 (May 2014): 11-19.
        doi:10.1016/j.powtec.2014.02.045.
     '''
+    exp = _lib(Re).exp
     Cd = (1 - 0.5*exp(0.182) + 10.11*Re**(-2/3.)*exp(0.952*Re**-0.25)
     - 0.03859*Re**(-4/3.)*exp(1.30*Re**-0.5) + 0.037E-4*Re*exp(-0.125E-4*Re)
     - 0.116E-10*Re**2*exp(-0.444E-5*Re))
@@ -862,13 +886,13 @@ def Almedeij(Re):
 
     Parameters
     ----------
-    Re : float
+    Re : float or ndarray
         Particle Reynolds number of the sphere using the surrounding fluid
         density and viscosity, [-]
 
     Returns
     -------
-    Cd : float
+    Cd : float or ndarray
         Drag coefficient [-]
 
     Notes
@@ -910,13 +934,13 @@ def Morrison(Re):
 
     Parameters
     ----------
-    Re : float
+    Re : float or ndarray
         Particle Reynolds number of the sphere using the surrounding fluid
         density and viscosity, [-]
 
     Returns
     -------
-    Cd : float
+    Cd : float or ndarray
         Drag coefficient [-]
 
     Notes
@@ -953,7 +977,7 @@ def Song_Xu(Re, sphericity=1., S=1.):
         
     Parameters
     ----------
-    Re : float
+    Re : float or ndarray
         Particle Reynolds number of the sphere using the surrounding fluid
         density and viscosity, [-]
     sphericity : float, optional
@@ -964,7 +988,7 @@ def Song_Xu(Re, sphericity=1., S=1.):
 
     Returns
     -------
-    Cd : float
+    Cd : float or ndarray
         Drag coefficient of particle [-]
 
     Notes
@@ -1013,6 +1037,24 @@ drag_sphere_correlations = {
 }
 
 
+def _drag_sphere_array(Re):
+    # Masked form of the automatic selection in `drag_sphere`; each
+    # correlation is only evaluated on its own regime
+    Re = np.asarray(Re, dtype=float)
+    Cd = np.full(Re.shape, np.nan)
+    stokes = Re < 0.01
+    blend = (Re >= 0.01) & (Re <= 0.1)
+    low = (Re > 0.1) & (Re <= 212963.26847812787)
+    high = (Re > 212963.26847812787) & (Re <= 1E6)
+    Cd[stokes] = Stokes(Re[stokes])
+    Re_blend = Re[blend]
+    ratio = (Re_blend - 0.01)/(0.1 - 0.01)
+    Cd[blend] = ratio*Barati(Re_blend) + (1-ratio)*Stokes(Re_blend)
+    Cd[low] = Barati(Re[low])
+    Cd[high] = Barati_high(Re[high])
+    return Cd
+
+
 def drag_sphere(Re, Method=None, AvailableMethods=False):
     r'''This function handles calculation of drag coefficient on spheres.
     Twenty methods are available, all requiring only the Reynolds number of the
@@ -1031,23 +1073,32 @@ def drag_sphere(Re, Method=None, AvailableMethods=False):
         * If ~212963 < Re <= 1E6, use the 'Barati_high' solution.
         * For Re > 1E6, raises an exception; no valid results have been found.
 
+    `Re` may also be an array, as for many particles at once; each correlation
+    is then evaluated only on the elements in its own regime, with the same
+    blending as above. Elements with Re > 1E6 are NaN instead of raising.
+    All of the correlations accept arrays as well.
+
     Examples
     --------
     >>> drag_sphere(200)
     0.7682237950389874
+    >>> drag_sphere(np.array([0.001, 0.05, 200., 5E5]))
+    array([  2.40000000e+04,   4.81237692e+02,   7.68223795e-01,
+             9.24369943e-02])
 
     Parameters
     ----------
-    Re : float
+    Re : float or ndarray
         Particle Reynolds number of the sphere using the surrounding fluid
         density and viscosity, [-]
 
     Returns
     -------
-    Cd : float
+    Cd : float or ndarray
         Drag coefficient [-]
     methods : list, only returned if AvailableMethods == True
-        List of methods which can be used to calculate `Cd` with the given `Re`
+        List of methods which can be used to calculate `Cd` with the given `Re`;
+        for an array, the methods valid at every element
 
     Other Parameters
     ----------------
@@ -1061,12 +1112,15 @@ def drag_sphere(Re, Method=None, AvailableMethods=False):
     def list_methods():
         methods = []
         for key, (func, Re_min, Re_max) in drag_sphere_correlations.items():
-            if (Re_min is None or Re > Re_min) and (Re_max is None or Re < Re_max):
+            if ((Re_min is None or np.all(Re > Re_min))
+                    and (Re_max is None or np.all(Re < Re_max))):
                 methods.append(key)
         return methods
     if AvailableMethods:
         return list_methods()
     if not Method:
+        if not _is_scalar(Re):
+            return _drag_sphere_array(Re)
         if Re > 0.1:
             # Smooth transition point between the two models
             if Re <= 212963.26847812787:
@@ -1089,38 +1143,138 @@ def drag_sphere(Re, Method=None, AvailableMethods=False):
         raise Exception('Failure in in function')
 
 
-def v_terminal(D, rhop, rho, mu, Method=None):
+_v_terminal_curves = {}
+
+
+def _Cd_Re2_curve(Method):
+    # ln(Cd*Re^2) and ln(Re) along a method's drag curve, made non-decreasing
+    # so it can be inverted with np.interp; kept per method once built
+    try:
+        return _v_terminal_curves[Method]
+    except KeyError:
+        pass
+    Re = np.logspace(-6, 6, 481)
+    with np.errstate(all='ignore'):
+        ln_X = np.log(drag_sphere(Re, Method=Method)*Re*Re)
+    good = np.isfinite(ln_X)
+    curve = (np.maximum.accumulate(ln_X[good]), np.log(Re[good]))
+    _v_terminal_curves[Method] = curve
+    return curve
+
+
+def _v_terminal_array(D, rhop, rho, mu, Method=None, cache=True):
+    D, rhop, rho, mu = np.broadcast_arrays(*[np.asarray(i, dtype=float)
+                                             for i in (D, rhop, rho, mu)])
+    v_lam = g*D*D*(rhop-rho)/(18*mu)
+    Re_lam = rho*v_lam*D/mu
+    v_t = v_lam.copy()
+    solve = ~(Re_lam < 0.01)
+
+    # At terminal velocity Cd*Re^2 = 4/3*Ar, with Ar the Archimedes number
+    Ar = g*D[solve]**3*rho[solve]*(rhop[solve] - rho[solve])/mu[solve]**2
+    ln_X = np.log(4/3.*Ar)
+    if cache:
+        ln_Re = np.interp(ln_X, *_Cd_Re2_curve(Method))
+    else:
+        d_star = Ar**(1/3.)
+        ln_Re = np.log(d_star/(18./d_star**2 + 0.591/d_star**0.5))
+
+    def err(ln_Re, ln_X):
+        Re = np.exp(ln_Re)
+        return np.log(drag_sphere(Re, Method=Method)) + 2.*ln_Re - ln_X
+
+    # Newton's method in ln(Re), iterating only on unconverged elements
+    active = np.arange(ln_Re.size)
+    converged = np.zeros(ln_Re.size, dtype=bool)
+    with np.errstate(all='ignore'):
+        for _ in range(100):
+            x, y = ln_Re[active], ln_X[active]
+            f = err(x, y)
+            df = (err(x + 1E-6, y) - f)/1E-6
+            step = np.clip(f/df, -2., 2.)
+            ln_Re[active] = x - step
+            done = np.abs(step) < 1E-13
+            converged[active[done]] = True
+            active = active[~done & np.isfinite(step)]
+            if not active.size:
+                break
+
+        # Newton's method can fail where Cd*Re^2 is not monotonic, as in the
+        # drag crisis of some methods; those elements are bisected between
+        # the points of the tabulated curve which bracket their lowest root
+        failed = np.flatnonzero(~converged)
+        if failed.size:
+            curve_X, curve_ln_Re = _Cd_Re2_curve(Method)
+            k = np.searchsorted(curve_X, ln_X[failed])
+            bracketed = (k > 0) & (k < curve_X.size)
+            failed, k = failed[bracketed], k[bracketed]
+            lo, hi, y = curve_ln_Re[k - 1], curve_ln_Re[k], ln_X[failed]
+            for _ in range(50):
+                mid = 0.5*(lo + hi)
+                below = err(mid, y) < 0.
+                lo, hi = np.where(below, mid, lo), np.where(below, hi, mid)
+            ln_Re[failed] = 0.5*(lo + hi)
+            converged[failed] = True
+
+        # Steps can also vanish at a jump in the drag curve, as at Re = 4E5
+        # for Clift, across which Cd*Re^2 = 4/3*Ar has no solution; only
+        # points which satisfy it are kept
+        converged &= np.abs(err(ln_Re, ln_X)) <= 1E-9
+    Re = np.where(converged, np.exp(ln_Re), np.nan)
+    v_t[solve] = Re*mu[solve]/(rho[solve]*D[solve])
+    return v_t
+
+
+def v_terminal(D, rhop, rho, mu, Method=None, cache=True):
     r'''Calculates terminal velocity of a falling sphere using any drag
     coefficient method supported by `drag_sphere`. The laminar solution for
     Re < 0.01 is first tried; if the resulting terminal velocity does not
-    put it in the laminar regime, a numerical solution is used.
+    put it in the laminar regime, a numerical solution is used. Any of the
+    inputs may be arrays, as for all the bins of a particle size distribution
+    in several fluids; they are solved together.
 
     .. math::
         v_t = \sqrt{\frac{4 g d_p (\rho_p-\rho_f)}{3 C_D \rho_f }}
 
     Parameters
     ----------
-    D : float
+    D : float or ndarray
         Diameter of the sphere, [m]
-    rhop : float
+    rhop : float or ndarray
         Particle density, [kg/m^3]
-    rho : float
+    rho : float or ndarray
         Density of the surrounding fluid, [kg/m^3]
-    mu : float
+    mu : float or ndarray
         Viscosity of the surrounding fluid [Pa*s]
     Method : string, optional
         A string of the function name to use, as in the dictionary
         drag_sphere_correlations
+    cache : bool, optional
+        For arrays, whether to start the solver from a table of the drag
+        curve of `Method`, which is built once and kept for later calls; if
+        False, the explicit relation of [3]_ is used as the starting point.
+        Points where the solver fails to converge are bisected on the table
+        either way
 
     Returns
     -------
-    v_t : float
+    v_t : float or ndarray
         Terminal velocity of falling sphere [m/s]
 
     Notes
     -----
-    As there are no correlations implemented for Re > 1E6, an error will be
-    raised if the numerical solver seeks a solution above that limit.
+    As the default method has no correlations implemented for Re > 1E6, an
+    error will be raised if the numerical solver seeks a solution above that
+    limit; for arrays, such elements are NaN instead. Methods which are
+    specified are used beyond their ranges, as in `drag_sphere`. Elements of
+    arrays for which no solution exists, as across the jump in the drag
+    coefficient of 'Clift' at Re = 4E5, are also NaN.
+
+    For arrays, the terminal Reynolds number depends only on the Archimedes
+    number :math:`Ar = g d_p^3\rho_f(\rho_p-\rho_f)/\mu_f^2`, through
+    :math:`C_D Re^2 = 4Ar/3`. That equation is solved with Newton's method in
+    :math:`\ln Re` for all elements at once, iterating only on those which
+    have not yet converged.
 
     The laminar solution is given in [1]_ and is:
 
@@ -1140,6 +1294,11 @@ def v_terminal(D, rhop, rho, mu, Method=None):
     
     The answer reported there is 0.46 ft/sec.
 
+    Several particle sizes at once:
+
+    >>> v_terminal(D=np.array([20E-6, 70E-6, 1E-3]), rhop=2600., rho=1000., mu=1E-3)
+    array([ 0.00034868,  0.0041425 ,  0.15597449])
+
     References
     ----------
     .. [1] Green, Don, and Robert Perry. Perry's Chemical Engineers' Handbook,
@@ -1147,6 +1306,9 @@ def v_terminal(D, rhop, rho, mu, Method=None):
     .. [2] Rushton, Albert, Anthony S. Ward, and Richard G. Holdich.
        Solid-Liquid Filtration and Separation Technology. 1st edition. Weinheim ;
        New York: Wiley-VCH, 1996.
+    .. [3] Haider, A., and O. Levenspiel. "Drag Coefficient and Terminal
+       Velocity of Spherical and Nonspherical Particles." Powder Technology
+       58, no. 1 (May 1989): 63-70. doi:10.1016/0032-5910(89)80008-7.
     '''
     '''The following would be the ideal implementation. The actual function is
     optimized for speed, not readability
@@ -1156,6 +1318,8 @@ def v_terminal(D, rhop, rho, mu, Method=None):
         V2 = (4/3.*g*D*(rhop-rho)/rho/Cd)**0.5
         return (V-V2)
     return fsolve(err, 1.)'''
+    if not (_is_scalar(D) and _is_scalar(rhop) and _is_scalar(rho) and _is_scalar(mu)):
+        return _v_terminal_array(D, rhop, rho, mu, Method=Method, cache=cache)
     v_lam = g*D*D*(rhop-rho)/(18*mu)
     Re_lam = Reynolds(V=v_lam, D=D, rho=rho, mu=mu)
     if Re_lam < 0.01:
@@ -1213,7 +1377,9 @@ def integrate_drag_sphere(D, rhop, rho, mu, t, V=0, Method=None,
 
     Notes
     -----
-    This can be relatively slow as drag correlations can be complex.
+    This can be relatively slow as drag correlations can be complex. For many
+    particles, or motion in more than one dimension, see
+    `integrate_drag_spheres`.
 
     Examples
     --------
@@ -1226,6 +1392,7 @@ def integrate_drag_sphere(D, rhop, rho, mu, t, V=0, Method=None,
     c2 = -0.75*rho/(D*rhop)
 
     def dv_dt(V, t):
+        V = float(V[0])
         return c1 + c2*drag_sphere(Re_ish*V, Method=Method)*V*V
 
     # Number of intervals for the solution to be solved for; the integrator
@@ -1244,3 +1411,160 @@ def integrate_drag_sphere(D, rhop, rho, mu, t, V=0, Method=None,
         return V_end, x
     else:
         return V_end
+
+
+def integrate_drag_spheres(D, rhop, rho, mu, t, x0, V0=None, u=None,
+                           Method=None, dt=None, implicit=True,
+                           g_vector=None):
+    r'''Integrates the trajectories of many particles at once, all moving
+    under gravity and drag in a fluid which may itself be moving. The
+    particles are advanced together and their positions and velocities are
+    yielded at each of the times `t`, so only one time's state is kept in
+    memory. The acceleration of each particle is:
+
+    .. math::
+        \frac{d\vec v}{dt} = \frac{\vec g(\rho_p-\rho_f)}{\rho_p}
+        - \frac{3C_D \rho_f |\vec v - \vec u|(\vec v - \vec u)}{4D \rho_p}
+
+    Parameters
+    ----------
+    D : float or ndarray
+        Diameters of the spheres, [m]
+    rhop : float or ndarray
+        Particle densities, [kg/m^3]
+    rho : float or ndarray
+        Density of the surrounding fluid at each particle, [kg/m^3]
+    mu : float or ndarray
+        Viscosity of the surrounding fluid at each particle [Pa*s]
+    t : list[float]
+        Increasing times at which to yield the particle states, starting with
+        the time of the initial state, [s]
+    x0 : ndarray
+        Initial positions of the particles, of shape (n, dim) for `dim` of 1,
+        2 or 3, or of shape (n,) for motion along a vertical line only; the
+        last coordinate is vertical, positive upward, [m]
+    V0 : ndarray, optional
+        Initial velocities of the particles, of the same shape as `x0`;
+        zero if not given, [m/s]
+    u : callable, optional
+        Velocity field of the fluid, called as `u(t, x)` with the current
+        positions and returning an array which broadcasts to their shape;
+        if not given, the fluid is still, [m/s]
+    Method : string, optional
+        A string of the function name to use, as in the dictionary
+        drag_sphere_correlations
+    dt : float, optional
+        Largest internal time step; each interval of `t` is divided into
+        equal steps no larger than this. By default, one step is taken per
+        interval, [s]
+    implicit : bool, optional
+        If True, each step uses the exact solution for drag linearized about
+        the step's midpoint, which is stable for any step even for particles
+        which relax to the flow far faster than the step; if False, the
+        classic explicit fourth order Runge-Kutta method is used
+    g_vector : ndarray, optional
+        Acceleration of gravity; by default `g` downward along the last
+        coordinate, [m/s^2]
+
+    Yields
+    ------
+    t : float
+        Time of the particle states, [s]
+    x : ndarray
+        Positions of the particles, of the shape of `x0`, [m]
+    v : ndarray
+        Velocities of the particles, of the shape of `x0`, [m/s]
+
+    Notes
+    -----
+    The drag coefficient is evaluated from the particle Reynolds number of the
+    slip velocity :math:`|\vec v - \vec u|` with `drag_sphere`, for all of the
+    particles in one call. Writing the drag as
+    :math:`\beta(\vec v - \vec u)` with
+    :math:`\beta = 3\mu C_D Re/(4 D^2 \rho_p)`, the implicit step
+    evaluates :math:`\beta` and :math:`\vec u` at a predicted midpoint and
+    then integrates the linear equation exactly over the step. It is second
+    order accurate, and exact for Stokes drag in a uniform flow.
+
+    The explicit method needs a step well below the relaxation time
+    :math:`1/\beta` of the smallest particle to be stable.
+
+    Examples
+    --------
+    Two particles thrown horizontally in still air:
+
+    >>> for t, x, v in integrate_drag_spheres(D=np.array([1E-4, 1E-3]),
+    ...         rhop=2200., rho=1.2, mu=1.78E-5, t=[0, 0.25, 0.5],
+    ...         x0=np.zeros((2, 2)), V0=[[10., 0.], [10., 0.]], dt=1E-4):
+    ...     pass
+    >>> x
+    array([[ 0.27663205, -0.21710759],
+           [ 3.32500975, -0.95405919]])
+    '''
+    x = np.array(x0, dtype=float)
+    shape = x.shape
+    n = shape[0]
+    x = x.reshape(n, -1)
+    dim = x.shape[1]
+    if V0 is None:
+        v = np.zeros_like(x)
+    else:
+        v = np.array(np.broadcast_to(V0, shape), dtype=float).reshape(n, dim)
+    if g_vector is None:
+        g_vector = np.zeros(dim)
+        g_vector[-1] = -g
+    D, rhop, rho, mu = [np.broadcast_to(np.asarray(i, dtype=float), (n,))[:, None]
+                        for i in (D, rhop, rho, mu)]
+    a_g = g_vector*(rhop - rho)/rhop
+    Re_factor = rho*D/mu
+    beta_factor = 0.75*mu/(D*D*rhop)
+
+    def fluid(t, x):
+        if u is None:
+            return 0.
+        return np.broadcast_to(u(t, x.reshape(shape)), shape).reshape(n, dim)
+
+    def beta(w):
+        # Cd*Re is finite as the slip goes to zero, unlike Cd*|w|
+        Re = np.maximum(Re_factor*np.sqrt((w*w).sum(axis=1, keepdims=True)), 1E-10)
+        return beta_factor*drag_sphere(Re, Method=Method)*Re
+
+    def step_implicit(t, x, v, h):
+        u0 = fluid(t, x)
+        b0 = beta(v - u0)
+        v_eq = u0 + a_g/b0
+        decay = np.exp(-b0*0.5*h)
+        x_mid = x + v_eq*0.5*h + (v - v_eq)*(1. - decay)/b0
+        v_mid = v_eq + (v - v_eq)*decay
+
+        u_mid = fluid(t + 0.5*h, x_mid)
+        b = beta(v_mid - u_mid)
+        v_eq = u_mid + a_g/b
+        decay = np.exp(-b*h)
+        return (x + v_eq*h + (v - v_eq)*(1. - decay)/b,
+                v_eq + (v - v_eq)*decay)
+
+    def accel(t, x, v):
+        w = v - fluid(t, x)
+        return a_g - beta(w)*w
+
+    def step_explicit(t, x, v, h):
+        k1x, k1v = v, accel(t, x, v)
+        k2x = v + 0.5*h*k1v
+        k2v = accel(t + 0.5*h, x + 0.5*h*k1x, k2x)
+        k3x = v + 0.5*h*k2v
+        k3v = accel(t + 0.5*h, x + 0.5*h*k2x, k3x)
+        k4x = v + h*k3v
+        k4v = accel(t + h, x + h*k3x, k4x)
+        return (x + h/6.*(k1x + 2.*k2x + 2.*k3x + k4x),
+                v + h/6.*(k1v + 2.*k2v + 2.*k3v + k4v))
+
+    step = step_implicit if implicit else step_explicit
+    ts = [float(i) for i in t]
+    yield ts[0], x.reshape(shape), v.reshape(shape)
+    for t_start, t_end in zip(ts[:-1], ts[1:]):
+        steps = 1 if dt is None else max(int(np.ceil((t_end - t_start)/dt - 1E-9)), 1)
+        h = (t_end - t_start)/steps
+        for i in range(steps):
+            x, v = step(t_start + i*h, x, v, h)
+        yield t_end, x.reshape(shape), v.reshape(shape)
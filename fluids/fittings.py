@@ -21,27 +21,41 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.'''
 
 from __future__ import division
-from math import cos, sin, tan, atan, pi, radians
+import csv
+from itertools import islice
+from math import cos, pi
 import numpy as np
 from scipy.constants import inch
-from fluids.friction import friction_factor
+from fluids.friction import friction_factor, _friction_factor_array
+from fluids.numerics import _scalar_or_array
 
 __all__ = ['contraction_sharp', 'contraction_round',
 'contraction_conical', 'contraction_beveled',  'diffuser_sharp',
 'diffuser_conical', 'diffuser_conical_staged', 'diffuser_curved',
-'diffuser_pipe_reducer',
+'diffuser_pipe_reducer', 'K_contraction', 'K_diffuser',
+'contraction_methods', 'diffuser_methods',
 'entrance_sharp', 'entrance_distance', 'entrance_angled',
 'entrance_rounded', 'entrance_beveled', 'entrance_beveled_orifice', 
-'exit_normal', 'bend_rounded',
-'bend_miter', 'helix', 'spiral','Darby3K', 'Hooper2K', 'Kv_to_Cv', 'Cv_to_Kv',
-'Kv_to_K', 'K_to_Kv', 'Cv_to_K', 'K_to_Cv', 'change_K_basis', 'Darby', 
+'exit_normal', 'bend_rounded', 'bend_rounded_methods',
+'bend_miter', 'helix', 'spiral','Darby3K', 'Hooper2K', 'Darby3K_ID', 
+'Hooper2K_ID', 'Darby3K_by_ID', 'Hooper2K_by_ID', 'Darby_names', 
+'Hooper_names', 'Darby_values', 'Hooper_values', 'Kv_to_Cv', 'Cv_to_Kv',
+'Kv_to_K', 'K_to_Kv', 'Cv_to_K', 'K_to_Cv', 'change_K_basis', 
+'valve_data_to_K', 'iter_valve_data_to_K', 'Darby', 
 'Hooper', 'K_gate_valve_Crane', 'K_angle_valve_Crane', 'K_globe_valve_Crane',
 'K_swing_check_valve_Crane', 'K_lift_check_valve_Crane',
 'K_tilting_disk_check_valve_Crane', 'K_globe_stop_check_valve_Crane',
 'K_angle_stop_check_valve_Crane', 'K_ball_valve_Crane',
 'K_diaphragm_valve_Crane', 'K_foot_valve_Crane', 'K_butterfly_valve_Crane',
-'K_plug_valve_Crane', 'K_branch_converging_Crane', 'K_run_converging_Crane',
-'K_branch_diverging_Crane', 'K_run_diverging_Crane', 'v_lift_valve_Crane']
+'K_plug_valve_Crane', 'K_valve_Crane', 'K_valve_Crane_kinds',
+'K_branch_converging_Crane', 'K_run_converging_Crane',
+'K_branch_diverging_Crane', 'K_run_diverging_Crane', 'K_tee_Crane',
+'v_lift_valve_Crane']
+
+try:
+    string_types = (basestring,)
+except NameError:
+    string_types = (str,)
 
 
 def change_K_basis(K1, D1, D2):
@@ -54,16 +68,16 @@ def change_K_basis(K1, D1, D2):
 
     Parameters
     ----------
-    K1 : float
+    K1 : float or ndarray
         Loss coefficient with respect to diameter `D`, [-]
-    D1 : float
+    D1 : float or ndarray
         Diameter of pipe for which `K1` has been calculated, [m]
-    D2 : float
+    D2 : float or ndarray
         Diameter of pipe for which `K2` will be calculated, [m]
 
     Returns
     -------
-    K2 : float
+    K2 : float or ndarray
         Loss coefficient with respect to the second diameter, [-]
 
     Notes
@@ -405,9 +419,15 @@ def exit_normal():
 
 ### Bends
 
-def bend_rounded(Di, angle, fd, rc=None, bend_diameters=5):
+bend_rounded_methods = ['Rennels', 'Ito']
+
+
+def bend_rounded(Di, angle, fd=None, rc=None, bend_diameters=5, Re=None,
+                 roughness=0, method='Rennels'):
     r'''Returns loss coefficient for any rounded bend in a pipe
-    as shown in [1]_.
+    as shown in [1]_ (the default method, 'Rennels'), or according to the
+    Reynolds number dependent correlation of [2]_ ('Ito'). All inputs may be
+    arrays, which broadcast together.
 
     .. math::
         K = f\alpha\frac{r}{d} + (0.10 + 2.4f)\sin(\alpha/2)
@@ -424,12 +444,20 @@ def bend_rounded(Di, angle, fd, rc=None, bend_diameters=5):
         Inside diameter of pipe, [m]
     angle : float
         Angle of bend, [degrees]
-    fd : float
-        Darcy friction factor [-]
+    fd : float, optional
+        Darcy friction factor; calculated from `Re` and `roughness` with
+        :obj:`fluids.friction.friction_factor` if not provided [-]
     rc : float, optional
         Radius of curvature of the entrance, optional [m]
     bend_diameters : float, optional (used if rc not provided)
         Number of diameters of pipe making up the bend radius [-]
+    Re : float, optional
+        Reynolds number of the pipe; required if `fd` is not provided or the
+        method is 'Ito', [-]
+    roughness : float, optional
+        Roughness of the bend, used if `fd` is not provided, [m]
+    method : str, optional
+        One of 'Rennels' or 'Ito', [-]
 
     Returns
     -------
@@ -442,31 +470,77 @@ def bend_rounded(Di, angle, fd, rc=None, bend_diameters=5):
     this as a multiplier of nominal diameter, which is different than actual
     diameter. Those require that rc be specified.
 
-    First term represents surface friction loss; the second, secondary flows;
-    and the third, flow separation.
+    For the 'Rennels' method, the first term represents surface friction 
+    loss; the second, secondary flows; and the third, flow separation.
     Encompasses the entire range of elbow and pipe bend configurations.
-    
     This was developed for bend angles between 0 and 180 degrees; and r/D
     ratios above 0.5.
     
     Note the loss coefficient includes the surface friction of the pipe as if
     it was straight.
+    
+    The 'Ito' method is for smooth bends; with :math:`De_2 = Re(D/r)^2`, and
+    the angle in degrees:
+
+    .. math::
+        K = 0.00431\alpha\theta Re^{-0.17}\left(\frac{r}{D}\right)^{0.84}
+        \text{ for } De_2 > 364
+
+        K = 0.0175\alpha f_c \theta\frac{r}{D}\text{ for } De_2 \le 364
+
+        f_c = \left[0.029 + 0.304\left(\frac{De_2}{4}\right)^{-0.25}\right]
+        \left(\frac{D}{2r}\right)^{0.5}
+
+    The factor :math:`\alpha` is that fit in [2]_ for 45, 90 or 180 degree
+    bends, whichever is closest to `angle`; 
+    :math:`\alpha = 0.95 + 4.42(r/D)^{-1.96}` for 90 degree bends. It 
+    includes the friction of the pipe making up the bend.
    
     Examples
     --------
     >>> bend_rounded(Di=4.020, rc=4.0*5, angle=30, fd=0.0163)
     0.10680196344492195
+    
+    Friction factor calculated from the Reynolds number, and the Ito method:
+
+    >>> bend_rounded(Di=.1, angle=90., Re=1E5, roughness=4.5E-5)
+    0.27110310546924105
+    >>> bend_rounded(Di=.1, angle=90., Re=1E5, method='Ito')
+    0.24110659853156202
 
     References
     ----------
     .. [1] Rennels, Donald C., and Hobart M. Hudson. Pipe Flow: A Practical
        and Comprehensive Guide. 1st edition. Hoboken, N.J: Wiley, 2012.
+    .. [2] Ito, H. "Pressure Losses in Smooth Pipe Bends." Journal of Basic
+       Engineering 82, no. 1 (March 1, 1960): 131-40. doi:10.1115/1.3662501.
     '''
-    angle = angle/(180/pi)
-    if not rc:
+    if rc is None:
         rc = Di*bend_diameters
-    return (fd*angle*rc/Di + (0.10 + 2.4*fd)*sin(angle/2.)
-    + 6.6*fd*(sin(angle/2.)**0.5 + sin(angle/2.))/(rc/Di)**(4.*angle/pi))
+    if method == 'Rennels':
+        if fd is None:
+            if Re is None:
+                raise Exception('Either a friction factor or Reynolds number is required')
+            fd = _friction_factor_array(Re, roughness/Di)
+        angle = angle/(180/pi)
+        sin_half = np.sin(angle/2.)
+        K = (fd*angle*rc/Di + (0.10 + 2.4*fd)*sin_half
+             + 6.6*fd*(sin_half**0.5 + sin_half)/(rc/Di)**(4.*angle/pi))
+    elif method == 'Ito':
+        if Re is None:
+            raise Exception('The Ito method requires the Reynolds number')
+        ratio = rc/Di
+        De2 = Re/(ratio*ratio)
+        alpha = np.where(angle < 67.5, 1. + 5.13*ratio**-1.47,
+                         np.where(angle < 135., 
+                                  np.where(ratio > 9.85, 1., 0.95 + 4.42*ratio**-1.96),
+                                  1. + 5.06*ratio**-4.52))
+        fc = (0.029 + 0.304*(0.25*De2)**-0.25)*(0.5/ratio)**0.5
+        K = np.where(De2 > 364., 0.00431*alpha*angle*Re**-0.17*ratio**0.84,
+                     0.0175*alpha*fc*angle*ratio)
+    else:
+        raise Exception('Method not recognized; must be one of %s' %(bend_rounded_methods))
+    return _scalar_or_array(K)
 
 
 def bend_miter(angle):
@@ -482,12 +556,12 @@ def bend_miter(angle):
 
     Parameters
     ----------
-    angle : float
+    angle : float or ndarray
         Angle of bend, [degrees]
 
     Returns
     -------
-    K : float
+    K : float or ndarray
         Loss coefficient [-]
 
     Notes
@@ -504,8 +578,9 @@ def bend_miter(angle):
     .. [1] Rennels, Donald C., and Hobart M. Hudson. Pipe Flow: A Practical
        and Comprehensive Guide. 1st edition. Hoboken, N.J: Wiley, 2012.
     '''
-    angle = angle/(180/pi)
-    return 0.42*sin(angle*0.5) + 2.56*sin(angle*0.5)**3
+    sin_half = np.sin(angle/(180/pi)*0.5)
+    K = 0.42*sin_half + 2.56*sin_half**3
+    return _scalar_or_array(K)
 
 
 def helix(Di, rs, pitch, N, fd):
@@ -641,7 +716,7 @@ def contraction_sharp(Di1, Di2):
     '''
     beta = Di2/Di1
     lbd = 1 + 0.622*(1-0.215*beta**2 - 0.785*beta**5)
-    return 0.0696*(1-beta**5)*lbd**2 + (lbd-1)**2
+    return _scalar_or_array(0.0696*(1-beta**5)*lbd**2 + (lbd-1)**2)
 
 
 def contraction_round(Di1, Di2, rc):
@@ -692,7 +767,7 @@ def contraction_round(Di1, Di2, rc):
     '''
     beta = Di2/Di1
     lbd = 1 + 0.622*(1 - 0.30*(rc/Di2)**0.5 - 0.70*rc/Di2)**4*(1-0.215*beta**2 - 0.785*beta**5)
-    return 0.0696*(1-0.569*rc/Di2)*(1-(rc/Di2)**0.5*beta)*(1-beta**5)*lbd**2 + (lbd-1)**2
+    return _scalar_or_array(0.0696*(1-0.569*rc/Di2)*(1-(rc/Di2)**0.5*beta)*(1-beta**5)*lbd**2 + (lbd-1)**2)
 
 
 def contraction_conical(Di1, Di2, fd, l=None, angle=None):
@@ -743,16 +818,17 @@ def contraction_conical(Di1, Di2, fd, l=None, angle=None):
        and Comprehensive Guide. 1st edition. Hoboken, N.J: Wiley, 2012.
     '''
     beta = Di2/Di1
-    if angle:
+    if angle is not None:
         angle = angle/(180/pi)
-        l = (Di1 - Di2)/(2*tan(angle/2))
-    elif l:
-        angle = 2*atan((Di1-Di2)/2/l)
+        l = (Di1 - Di2)/(2*np.tan(angle/2))
+    elif l is not None:
+        angle = 2*np.arctan((Di1-Di2)/2/l)
     else:
         raise Exception('Either l or angle is required')
 
     lbd = 1 + 0.622*(angle/pi)**0.8*(1-0.215*beta**2 - 0.785*beta**5)
-    return fd*(1-beta**4)/(8*sin(angle/2)) + 0.0696*sin(angle/2)*(1-beta**5)*lbd**2 + (lbd-1)**2
+    sin_half = np.sin(angle/2)
+    return _scalar_or_array(fd*(1-beta**4)/(8*sin_half) + 0.0696*sin_half*(1-beta**5)*lbd**2 + (lbd-1)**2)
 
 
 def contraction_beveled(Di1, Di2, l=None, angle=None):
@@ -804,9 +880,9 @@ def contraction_beveled(Di1, Di2, l=None, angle=None):
     '''
     angle = angle/(180/pi)
     beta = Di2/Di1
-    CB = l/Di2*2*beta*tan(angle/2)/(1-beta)
+    CB = l/Di2*2*beta*np.tan(angle/2)/(1-beta)
     lbd  = 1 + 0.622*(1 + CB*((angle/pi)**0.8-1))*(1-0.215*beta**2-0.785*beta**5)
-    return 0.0696*(1 + CB*(sin(angle/2)-1))*(1-beta**5)*lbd**2 + (lbd-1)**2
+    return _scalar_or_array(0.0696*(1 + CB*(np.sin(angle/2)-1))*(1-beta**5)*lbd**2 + (lbd-1)**2)
 
 ### Expansions (diffusers)
 
@@ -844,7 +920,7 @@ def diffuser_sharp(Di1, Di2):
        and Comprehensive Guide. 1st edition. Hoboken, N.J: Wiley, 2012.
     '''
     beta = Di1/Di2
-    return (1. - beta*beta)**2
+    return _scalar_or_array((1. - beta*beta)**2)
 
 
 def diffuser_conical(Di1, Di2, l=None, angle=None, fd=None):
@@ -911,38 +987,50 @@ def diffuser_conical(Di1, Di2, l=None, angle=None, fd=None):
     Examples
     --------
     >>> diffuser_conical(Di1=1/3., Di2=1, angle=50, fd=0.03)
-    0.8081340270019336
+    0.8081340270019335
 
     References
     ----------
     .. [1] Rennels, Donald C., and Hobart M. Hudson. Pipe Flow: A Practical
        and Comprehensive Guide. 1st edition. Hoboken, N.J: Wiley, 2012.
     '''
+    Di1, Di2 = np.asarray(Di1, dtype=float), np.asarray(Di2, dtype=float)
     beta = Di1/Di2
 
     if angle is not None:
+        angle = np.asarray(angle, dtype=float)
         angle_rad = angle/(180/pi)
-        l = (Di2 - Di1)/(2*tan(angle_rad/2))
+        l = (Di2 - Di1)/(2*np.tan(angle_rad/2))
     elif l is not None:
-        angle_rad = 2*atan((Di2-Di1)/2/l)
+        angle_rad = 2*np.arctan((Di2-Di1)/2/l)
         angle = angle_rad*(180/pi)
     else:
         raise Exception('Either `l` or `angle` must be specified')
 
-    if 0 < angle <= 20:
-        K = 8.30*tan(angle_rad/2)**1.75*(1-beta**2)**2 + fd*(1-beta**4)/8./sin(angle_rad/2)
-    elif 20 < angle <= 60 and 0 <= beta < 0.5:
-        K = (1.366*sin(2*pi*(angle-15)/180.)**0.5-0.170
-        - 3.28*(0.0625-beta**4)*((angle-20)/40.)**0.5)*(1-beta**2)**2 + fd*(1-beta**4)/8./sin(angle_rad/2)
-    elif 20 < angle <= 60 and beta >= 0.5:
-        K = (1.366*sin(2*pi*(angle-15)/180.)**0.5-0.170)*(1-beta**2)**2 + fd*(1-beta**4)/8./sin(angle_rad/2)
-    elif 60 < angle <= 180 and 0 <= beta < 0.5:
-        K = (1.205 - 3.28*(0.0625-beta**4) - 12.8*beta**6*((angle-60)/120.)**0.5)*(1-beta**2)**2
-    elif 60 < angle <= 180 and beta >= 0.5:
-        K = (1.205 - 0.20*((angle-60)/120.)**0.5)*(1-beta**2)**2
+    gradual = (0 < angle) & (angle <= 20)
+    small_beta = (0 <= beta) & (beta < 0.5)
+    large_beta = beta >= 0.5
+    medium = (20 < angle) & (angle <= 60)
+    abrupt = (60 < angle) & (angle <= 180)
+    if fd is None:
+        if np.any(angle <= 60):
+            raise Exception('Friction factor is required for angles of 60 degrees or less')
+        friction = 0.
     else:
+        friction = fd*(1-beta**4)/8./np.sin(angle_rad/2)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        K_medium = (1.366*np.sin(2*pi*(angle-15)/180.)**0.5-0.170)*(1-beta**2)**2 + friction
+        K = np.select([gradual, medium & small_beta, medium & large_beta, 
+                       abrupt & small_beta, abrupt & large_beta],
+                      [8.30*np.tan(angle_rad/2)**1.75*(1-beta**2)**2 + friction,
+                       K_medium - 3.28*(0.0625-beta**4)*((angle-20)/40.)**0.5*(1-beta**2)**2,
+                       K_medium,
+                       (1.205 - 3.28*(0.0625-beta**4) - 12.8*beta**6*((angle-60)/120.)**0.5)*(1-beta**2)**2,
+                       (1.205 - 0.20*((angle-60)/120.)**0.5)*(1-beta**2)**2], 
+                      default=np.nan)
+    if np.ndim(K) == 0 and np.isnan(K):
         raise Exception('Conical diffuser inputs incorrect')
-    return K
+    return _scalar_or_array(K)
 
 
 def diffuser_conical_staged(Di1, Di2, DEs, ls, fd=None):
@@ -988,8 +1076,7 @@ def diffuser_conical_staged(Di1, Di2, DEs, ls, fd=None):
        and Comprehensive Guide. 1st edition. Hoboken, N.J: Wiley, 2012.
     '''
     K = 0
-    DEs.insert(0, Di1)
-    DEs.append(Di2)
+    DEs = [Di1] + list(DEs) + [Di2]
     for i in range(len(ls)):
         K += diffuser_conical(Di1=float(DEs[i]), Di2=float(DEs[i+1]), l=float(ls[i]), fd=fd)
     return K
@@ -1041,7 +1128,7 @@ def diffuser_curved(Di1, Di2, l):
     '''
     beta = Di1/Di2
     phi = 1.01 - 0.624*l/Di1 + 0.30*(l/Di1)**2 - 0.074*(l/Di1)**3 + 0.0070*(l/Di1)**4
-    return phi*(1.43 - 1.3*beta**2)*(1 - beta**2)**2
+    return _scalar_or_array(phi*(1.43 - 1.3*beta**2)*(1 - beta**2)**2)
 
 
 def diffuser_pipe_reducer(Di1, Di2, l, fd1, fd2=None):
@@ -1093,9 +1180,176 @@ def diffuser_pipe_reducer(Di1, Di2, l, fd1, fd2=None):
     if fd2 is None:
         fd2 = fd1
     beta = Di1/Di2
-    angle = -2*atan((Di1-Di2)/1.20/l)
-    K = fd1*0.20*l/Di1 + fd1*(1-beta)/8./sin(angle/2) + fd2*0.20*l/Di2*beta**4
-    return K
+    angle = -2*np.arctan((Di1-Di2)/1.20/l)
+    K = fd1*0.20*l/Di1 + fd1*(1-beta)/8./np.sin(angle/2) + fd2*0.20*l/Di2*beta**4
+    return _scalar_or_array(K)
+
+contraction_methods = ['Rennels sharp', 'Rennels round', 'Rennels conical',
+                       'Rennels beveled']
+_contraction_funcs = {
+    'Rennels sharp': lambda Di1, Di2, fd, rc, l, angle: contraction_sharp(Di1, Di2),
+    'Rennels round': lambda Di1, Di2, fd, rc, l, angle: contraction_round(Di1, Di2, rc),
+    'Rennels conical': lambda Di1, Di2, fd, rc, l, angle: contraction_conical(Di1, Di2, fd, l=l, angle=angle),
+    'Rennels beveled': lambda Di1, Di2, fd, rc, l, angle: contraction_beveled(Di1, Di2, l=l, angle=angle)}
+
+
+def K_contraction(Di1, Di2, fd=None, rc=None, l=None, angle=None, Method=None,
+                  AvailableMethods=False):
+    r'''Returns the loss coefficient of a contraction from a larger pipe to a
+    smaller one, using any of the contraction models in this module. The
+    geometric inputs given determine which models can be used; if `Method` is
+    not specified, the rounded model is used when `rc` is given, the beveled
+    model when both `l` and `angle` are given, the conical model when `fd` and
+    one of `l` or `angle` are given, and the sharp model otherwise.
+
+    All inputs may be arrays which broadcast together; the selected model is
+    evaluated once over all of them.
+
+    Parameters
+    ----------
+    Di1 : float or ndarray
+        Inside diameter of original pipe (larger), [m]
+    Di2 : float or ndarray
+        Inside diameter of following pipe (smaller), [m]
+    fd : float or ndarray, optional
+        Darcy friction factor, used by the conical model [-]
+    rc : float or ndarray, optional
+        Radius of curvature of the contraction, [m]
+    l : float or ndarray, optional
+        Length of the contraction along the pipe axis, [m]
+    angle : float or ndarray, optional
+        Angle of the contraction, [degrees]
+
+    Returns
+    -------
+    K : float or ndarray
+        Loss coefficient in terms of the following pipe [-]
+    methods : list, only returned if AvailableMethods == True
+        List of methods which can be used with the inputs given
+
+    Other Parameters
+    ----------------
+    Method : string, optional
+        One of 'Rennels sharp', 'Rennels round', 'Rennels conical', or
+        'Rennels beveled'
+    AvailableMethods : bool, optional
+        If True, function will consider which methods can be used with the
+        inputs given
+
+    See Also
+    --------
+    contraction_sharp
+    contraction_round
+    contraction_conical
+    contraction_beveled
+
+    Examples
+    --------
+    >>> K_contraction(Di1=1, Di2=0.4, rc=0.04)
+    0.1783332490866574
+    >>> K_contraction(Di1=1, Di2=0.4)
+    0.5301269161591805
+    '''
+    def list_methods():
+        methods = []
+        if rc is not None:
+            methods.append('Rennels round')
+        if l is not None and angle is not None:
+            methods.append('Rennels beveled')
+        if fd is not None and (l is not None or angle is not None):
+            methods.append('Rennels conical')
+        methods.append('Rennels sharp')
+        return methods
+    if AvailableMethods:
+        return list_methods()
+    elif not Method:
+        Method = list_methods()[0]
+    if Method not in _contraction_funcs:
+        raise Exception('Method not recognized; options are %s' %contraction_methods)
+    return _contraction_funcs[Method](Di1, Di2, fd, rc, l, angle)
+
+
+diffuser_methods = ['Rennels sharp', 'Rennels conical', 'Rennels curved',
+                    'Rennels pipe reducer']
+_diffuser_funcs = {
+    'Rennels sharp': lambda Di1, Di2, fd, l, angle: diffuser_sharp(Di1, Di2),
+    'Rennels conical': lambda Di1, Di2, fd, l, angle: diffuser_conical(Di1, Di2, l=l, angle=angle, fd=fd),
+    'Rennels curved': lambda Di1, Di2, fd, l, angle: diffuser_curved(Di1, Di2, l),
+    'Rennels pipe reducer': lambda Di1, Di2, fd, l, angle: diffuser_pipe_reducer(Di1, Di2, l, fd)}
+
+
+def K_diffuser(Di1, Di2, fd=None, l=None, angle=None, Method=None,
+               AvailableMethods=False):
+    r'''Returns the loss coefficient of an expansion from a smaller pipe to a
+    larger one, using any of the diffuser models in this module. If `Method`
+    is not specified, the conical model is used when `l` or `angle` is given,
+    and the sharp model otherwise.
+
+    All inputs may be arrays which broadcast together; the selected model is
+    evaluated once over all of them. With arrays, points outside the range of
+    the conical model are returned as NaN instead of raising an exception.
+
+    Parameters
+    ----------
+    Di1 : float or ndarray
+        Inside diameter of original pipe (smaller), [m]
+    Di2 : float or ndarray
+        Inside diameter of following pipe (larger), [m]
+    fd : float or ndarray, optional
+        Darcy friction factor; required by the conical model for angles of 60
+        degrees or less and by the pipe reducer model [-]
+    l : float or ndarray, optional
+        Length of the diffuser along the pipe axis, [m]
+    angle : float or ndarray, optional
+        Angle of the diffuser, [degrees]
+
+    Returns
+    -------
+    K : float or ndarray
+        Loss coefficient in terms of the original pipe [-]
+    methods : list, only returned if AvailableMethods == True
+        List of methods which can be used with the inputs given
+
+    Other Parameters
+    ----------------
+    Method : string, optional
+        One of 'Rennels sharp', 'Rennels conical', 'Rennels curved', or
+        'Rennels pipe reducer'
+    AvailableMethods : bool, optional
+        If True, function will consider which methods can be used with the
+        inputs given
+
+    See Also
+    --------
+    diffuser_sharp
+    diffuser_conical
+    diffuser_curved
+    diffuser_pipe_reducer
+
+    Examples
+    --------
+    >>> K_diffuser(Di1=1/3., Di2=1, angle=50, fd=0.03)
+    0.8081340270019335
+    >>> K_diffuser(Di1=.5, Di2=1)
+    0.5625
+    '''
+    def list_methods():
+        methods = []
+        if l is not None or angle is not None:
+            methods.append('Rennels conical')
+        if l is not None:
+            methods.append('Rennels curved')
+            if fd is not None:
+                methods.append('Rennels pipe reducer')
+        methods.append('Rennels sharp')
+        return methods
+    if AvailableMethods:
+        return list_methods()
+    elif not Method:
+        Method = list_methods()[0]
+    if Method not in _diffuser_funcs:
+        raise Exception('Method not recognized; options are %s' %diffuser_methods)
+    return _diffuser_funcs[Method](Di1, Di2, fd, l, angle)
 
 ### TODO: Tees
 
@@ -1136,6 +1390,12 @@ Darby['Valve, Diaphragm, dam type'] = {'K1': 1000, 'Ki': 0.69, 'Kd': 4.9}
 Darby['Valve, Swing check'] = {'K1': 1500, 'Ki': 0.46, 'Kd': 4}
 Darby['Valve, Lift check'] = {'K1': 2000, 'Ki': 2.85, 'Kd': 3.8}
 
+# Array-backed form of the table; a fitting's ID is its index in `Darby_names`
+Darby_names = sorted(Darby.keys())
+Darby_IDs = {name: i for i, name in enumerate(Darby_names)}
+Darby_values = np.array([[Darby[name]['K1'], Darby[name]['Ki'], Darby[name]['Kd']]
+                         for name in Darby_names])
+
 
 def Darby3K(NPS=None, Re=None, name=None, K1=None, Ki=None, Kd=None):
     r'''Returns loss coefficient for any various fittings, depending
@@ -1240,6 +1500,12 @@ Hooper['Valve, Check, Lift'] = {'K1': 2000, 'Kinfty': 10}
 Hooper['Valve, Check, Swing'] = {'K1': 1500, 'Kinfty': 1.5}
 Hooper['Valve, Check, Tilting-disc'] = {'K1': 1000, 'Kinfty': 0.5}
 
+# Array-backed form of the table; a fitting's ID is its index in `Hooper_names`
+Hooper_names = sorted(Hooper.keys())
+Hooper_IDs = {name: i for i, name in enumerate(Hooper_names)}
+Hooper_values = np.array([[Hooper[name]['K1'], Hooper[name]['Kinfty']]
+                          for name in Hooper_names])
+
 
 def Hooper2K(Di, Re, name=None, K1=None, Kinfty=None):
     r'''Returns loss coefficient for any various fittings, depending
@@ -1307,6 +1573,144 @@ def Hooper2K(Di, Re, name=None, K1=None, Kinfty=None):
     return K1/Re + Kinfty*(1. + 1./Di)
 
 
+def _fitting_ID(name, IDs):
+    try:
+        if isinstance(name, string_types):
+            return IDs[name]
+        return np.array([IDs[i] for i in name], dtype=int)
+    except KeyError:
+        raise Exception('Name of fitting not in list')
+
+
+def _fitting_coefficients(values, ID):
+    # Negative IDs would otherwise silently index from the end of the table
+    ID = np.asarray(ID)
+    if ID.dtype.kind not in 'iu':
+        raise ValueError('Fitting IDs must be integers')
+    if np.any((ID < 0) | (ID >= len(values))):
+        raise ValueError('Fitting IDs must be between 0 and %d' %(len(values) - 1))
+    return values[ID]
+
+
+def Darby3K_ID(name):
+    r'''Returns the integer ID of a fitting in the Darby 3K table
+    :obj:`Darby`, or an array of IDs for a list of fittings. The IDs are
+    indexes into :obj:`Darby_names` and the rows of :obj:`Darby_values`, and
+    are used by :obj:`Darby3K_by_ID` to evaluate many fittings at once.
+    Resolve the names of a line list's fittings once, and reuse the IDs.
+
+    Parameters
+    ----------
+    name : str or list[str]
+        Name or names of the fittings, as in :obj:`Darby`, [-]
+
+    Returns
+    -------
+    ID : int or ndarray
+        ID or IDs of the fittings, [-]
+
+    Examples
+    --------
+    >>> Darby3K_ID('Valve, Angle valve, 45°, full line size, β = 1')
+    23
+    >>> Darby3K_ID(['Valve, Swing check', 'Valve, Lift check'])
+    array([33, 29])
+    '''
+    return _fitting_ID(name, Darby_IDs)
+
+
+def Hooper2K_ID(name):
+    r'''Returns the integer ID of a fitting in the Hooper 2K table
+    :obj:`Hooper`, or an array of IDs for a list of fittings. The IDs are
+    indexes into :obj:`Hooper_names` and the rows of :obj:`Hooper_values`, 
+    and are used by :obj:`Hooper2K_by_ID` to evaluate many fittings at once.
+
+    Parameters
+    ----------
+    name : str or list[str]
+        Name or names of the fittings, as in :obj:`Hooper`, [-]
+
+    Returns
+    -------
+    ID : int or ndarray
+        ID or IDs of the fittings, [-]
+
+    Examples
+    --------
+    >>> Hooper2K_ID('Valve, Globe, Standard')
+    30
+    '''
+    return _fitting_ID(name, Hooper_IDs)
+
+
+def Darby3K_by_ID(NPS, Re, ID):
+    r'''Returns loss coefficients of fittings in the Darby 3K table by
+    their integer IDs (see :obj:`Darby3K_ID`), as in :obj:`Darby3K`. All
+    inputs broadcast together, so many fittings can be evaluated at many 
+    Reynolds numbers in one call.
+
+    .. math::
+        K = \frac{K_1}{Re} + K_i\left(1 + \frac{K_d}{NPS^{0.3}}\right)
+
+    Parameters
+    ----------
+    NPS : float or ndarray
+        Nominal pipe size of the fittings, [inch]
+    Re : float or ndarray
+        Reynolds number of the flow in the fittings, [-]
+    ID : int or ndarray
+        IDs of the fittings; negative IDs are rejected, [-]
+
+    Returns
+    -------
+    K : float or ndarray
+        Loss coefficients of the fittings, [-]
+
+    Examples
+    --------
+    >>> IDs = Darby3K_ID(['Valve, Swing check', 'Valve, Lift check'])
+    >>> Darby3K_by_ID(NPS=2., Re=np.array([[1E4], [1E5]]), ID=IDs)
+    array([[  2.10454441,  11.84669345],
+           [  1.96954441,  11.66669345]])
+    '''
+    coeffs = _fitting_coefficients(Darby_values, ID)
+    K = coeffs[..., 0]/Re + coeffs[..., 1]*(1. + coeffs[..., 2]/NPS**0.3)
+    return _scalar_or_array(K)
+
+
+def Hooper2K_by_ID(Di, Re, ID):
+    r'''Returns loss coefficients of fittings in the Hooper 2K table by
+    their integer IDs (see :obj:`Hooper2K_ID`), as in :obj:`Hooper2K`. All
+    inputs broadcast together, so many fittings can be evaluated at many
+    Reynolds numbers in one call.
+
+    .. math::
+        K = \frac{K_1}{Re} + K_\infty\left(1 + \frac{1}{D_i}\right)
+
+    Parameters
+    ----------
+    Di : float or ndarray
+        Actual inside diameter of the pipe, [inch]
+    Re : float or ndarray
+        Reynolds number of the flow in the fittings, [-]
+    ID : int or ndarray
+        IDs of the fittings; negative IDs are rejected, [-]
+
+    Returns
+    -------
+    K : float or ndarray
+        Loss coefficients of the fittings, [-]
+
+    Examples
+    --------
+    >>> Hooper2K_by_ID(Di=2., Re=np.array([1E4, 1E5]), ID=Hooper2K_ID('Valve, Globe, Standard'))
+    array([ 6.15 ,  6.015])
+    '''
+    coeffs = _fitting_coefficients(Hooper_values, ID)
+    K = coeffs[..., 0]/Re + coeffs[..., 1]*(1. + 1./Di)
+    return _scalar_or_array(K)
+
+
 ### Valves
 
 
@@ -1319,13 +1723,13 @@ def Kv_to_Cv(Kv):
 
     Parameters
     ----------
-    Kv : float
+    Kv : float or ndarray
         Metric Kv valve flow coefficient (flow rate of water at a pressure drop  
         of 1 bar) [m^3/hr]
 
     Returns
     -------
-    Cv : float
+    Cv : float or ndarray
         Imperial Cv valve flow coefficient (flow rate of water at a pressure   
         drop of 1 psi) [gallons/minute]
 
@@ -1361,13 +1765,13 @@ def Cv_to_Kv(Cv):
 
     Parameters
     ----------
-    Cv : float
+    Cv : float or ndarray
         Imperial Cv valve flow coefficient (flow rate of water at a pressure   
         drop of 1 psi) [gallons/minute]
 
     Returns
     -------
-    Kv : float
+    Kv : float or ndarray
         Metric Kv valve flow coefficient (flow rate of water at a pressure drop  
         of 1 bar) [m^3/hr]
 
@@ -1404,15 +1808,15 @@ def Kv_to_K(Kv, D):
         
     Parameters
     ----------
-    Kv : float
+    Kv : float or ndarray
         Metric Kv valve flow coefficient (flow rate of water at a pressure drop  
         of 1 bar) [m^3/hr]
-    D : float
+    D : float or ndarray
         Inside diameter of the valve [m]
 
     Returns
     -------
-    K : float
+    K : float or ndarray
         Loss coefficient, [-]
 
     Notes
@@ -1443,7 +1847,7 @@ def Kv_to_K(Kv, D):
     ----------
     .. [1] ISA-75.01.01-2007 (60534-2-1 Mod) Draft
     '''
-    return 1.6E9*D**4*Kv**-2
+    return 1.6E9*D**4*Kv**-2.
 
 
 def K_to_Kv(K, D):
@@ -1454,14 +1858,14 @@ def K_to_Kv(K, D):
 
     Parameters
     ----------
-    K : float
+    K : float or ndarray
         Loss coefficient, [-]
-    D : float
+    D : float or ndarray
         Inside diameter of the valve [m]
 
     Returns
     -------
-    Kv : float
+    Kv : float or ndarray
         Metric Kv valve flow coefficient (flow rate of water at a pressure drop  
         of 1 bar) [m^3/hr]
 
@@ -1504,14 +1908,14 @@ def K_to_Cv(K, D):
         
     Parameters
     ----------
-    K : float
+    K : float or ndarray
         Loss coefficient, [-]
-    D : float
+    D : float or ndarray
         Inside diameter of the valve [m]
 
     Returns
     -------
-    Cv : float
+    Cv : float or ndarray
         Imperial Cv valve flow coefficient (flow rate of water at a pressure   
         drop of 1 psi) [gallons/minute]
 
@@ -1545,15 +1949,15 @@ def Cv_to_K(Cv, D):
         
     Parameters
     ----------
-    Cv : float
+    Cv : float or ndarray
         Imperial Cv valve flow coefficient (flow rate of water at a pressure   
         drop of 1 psi) [gallons/minute]
-    D : float
+    D : float or ndarray
         Inside diameter of the valve [m]
 
     Returns
     -------
-    K : float
+    K : float or ndarray
         Loss coefficient, [-]
 
     Notes
@@ -1570,7 +1974,140 @@ def Cv_to_K(Cv, D):
     ----------
     .. [1] ISA-75.01.01-2007 (60534-2-1 Mod) Draft
     '''
-    return 1.6E9*D**4*(Cv/1.1560992283536566)**-2
+    return 1.6E9*D**4*(Cv/1.1560992283536566)**-2.
+
+
+
+def _valve_data_to_K(D, K, Kv, Cv, D_basis):
+    with np.errstate(divide='ignore'):
+        K_out = K
+        K_out = np.where(np.isnan(K_out), Kv_to_K(Kv, D), K_out)
+        K_out = np.where(np.isnan(K_out), Cv_to_K(Cv, D), K_out)
+    if D_basis is not None:
+        K_out = change_K_basis(K_out, D, D_basis)
+    return K_out
+
+
+def valve_data_to_K(data, D_basis=None):
+    r'''Converts a table of valve data, with each valve's flow capacity given 
+    as any of a loss coefficient `K`, a metric `Kv`, or an imperial `Cv`,
+    to loss coefficients, optionally all on the basis of one diameter. All
+    rows are converted at once with :obj:`Kv_to_K`, :obj:`Cv_to_K` and
+    :obj:`change_K_basis`.
+
+    Parameters
+    ----------
+    data : numpy structured array or dict[str, ndarray]
+        Valve data, with a column 'D' of the inside diameter of each valve 
+        [m] and any of the columns 'K' [-], 'Kv' [m^3/hr] and 'Cv' 
+        [gallons/minute]; missing values are NaN, [-]
+    D_basis : float or ndarray, optional
+        Diameter to express all loss coefficients on; if not provided, each
+        loss coefficient is on the basis of its valve's diameter, [m]
+
+    Returns
+    -------
+    K : ndarray
+        Loss coefficients, [-]
+
+    Notes
+    -----
+    If more than one of `K`, `Kv` and `Cv` is given for a row, `K` is used 
+    first, then `Kv`, then `Cv`. Rows with none of them have a loss
+    coefficient of NaN. For large files, see :obj:`iter_valve_data_to_K`.
+
+    Examples
+    --------
+    >>> data = {'D': np.array([.015, .015, .1]), 'K': np.array([np.nan, 1.5, np.nan]),
+    ... 'Kv': np.array([2.312, np.nan, np.nan]), 'Cv': np.array([np.nan, np.nan, 300.])}
+    >>> valve_data_to_K(data)
+    array([ 15.1533746 ,   1.5       ,   2.37611631])
+    >>> valve_data_to_K(data, D_basis=.1)
+    array([  2.99325918e+04,   2.96296296e+03,   2.37611631e+00])
+    '''
+    names = data.dtype.names if hasattr(data, 'dtype') else data.keys()
+    D = np.asarray(data['D'], dtype=float)
+    nan = np.full(D.shape, np.nan)
+    K, Kv, Cv = [np.asarray(data[name], dtype=float) if name in names else nan
+                 for name in ('K', 'Kv', 'Cv')]
+    return _valve_data_to_K(D, K, Kv, Cv, D_basis)
+
+
+def iter_valve_data_to_K(f, D_basis=None, chunksize=100000, delimiter=','):
+    r'''Reads a CSV file of valve data and converts it to loss coefficients
+    as in :obj:`valve_data_to_K`, `chunksize` rows at a time, so files 
+    larger than memory can be processed. The file needs a header row naming
+    its columns; the 'D' column and any of the 'K', 'Kv' and 'Cv' columns are
+    used, and other columns are ignored. Empty values, and values past the
+    end of rows shorter than the header, are missing.
+
+    Parameters
+    ----------
+    f : str or file
+        Path to the CSV file, or an open file, [-]
+    D_basis : float, optional
+        Diameter to express all loss coefficients on; if not provided, each
+        loss coefficient is on the basis of its valve's diameter, [m]
+    chunksize : int, optional
+        Number of rows to convert at a time, [-]
+    delimiter : str, optional
+        Delimiter of the values in the file, [-]
+
+    Yields
+    ------
+    K : ndarray
+        Loss coefficients of the next `chunksize` rows of the file, [-]
+
+    Examples
+    --------
+    >>> from io import StringIO
+    >>> f = StringIO(u'tag,D,Kv,Cv\nV-1,0.015,2.312,\nV-2,0.1,,300\n')
+    >>> for K in iter_valve_data_to_K(f):
+    ...     print(K)
+    [ 15.1533746    2.37611631]
+    '''
+    if isinstance(f, string_types):
+        with open(f) as handle:
+            for K in iter_valve_data_to_K(handle, D_basis, chunksize, delimiter):
+                yield K
+        return
+    # Blank lines, including ones of only delimiters, are skipped
+    reader = (row for row in csv.reader(f, delimiter=delimiter)
+              if any(cell.strip() for cell in row))
+    header = next(reader, None)
+    if header is None:
+        raise Exception('Valve data requires a header row; the file is empty')
+    header = [name.strip() for name in header]
+    columns = {name: header.index(name) for name in ('D', 'K', 'Kv', 'Cv') 
+               if name in header}
+    if 'D' not in columns:
+        raise Exception('Valve data requires a D column')
+    while True:
+        rows = list(islice(reader, chunksize))
+        if not rows:
+            break
+        data = {}
+        for name, i in columns.items():
+            # Rows shorter than the header are missing their last values
+            values = np.array([row[i].strip() if i < len(row) else '' 
+                               for row in rows])
+            data[name] = np.where(values == '', 'nan', values).astype(float)
+        yield valve_data_to_K(data, D_basis)
+
+
+def _K_reduced_seat_Crane(K1, beta):
+    # Valves with a reduced seat, on the basis of the pipe diameter
+    K = (K1 + beta*(0.5*(1 - beta**2) + (1 - beta**2)**2))/beta**4
+    return _scalar_or_array(np.where(beta == 1, K1, K))
+
+
+def _K_reducer_Crane(K1, beta, angle):
+    # Valves with a reducer and expansion of angle `angle` (radians) around 
+    # the bore; gradual for angles up to 45 degrees, abrupt above
+    sin_half = np.sin(angle/2)
+    K_gradual = (K1 + sin_half*(0.8*(1-beta**2) + 2.6*(1-beta**2)**2))/beta**4
+    K_abrupt = (K1 + 0.5*sin_half**0.5 * (1 - beta**2) + (1-beta**2)**2)/beta**4
+    return np.where(angle <= pi/4, K_gradual, K_abrupt)
 
 
 def K_gate_valve_Crane(D1, D2, angle, fd):
@@ -1596,20 +2133,20 @@ def K_gate_valve_Crane(D1, D2, angle, fd):
         
     Parameters
     ----------
-    D1 : float
+    D1 : float or ndarray
         Diameter of the valve seat bore (must be smaller or equal to `D2`), [m]
-    D2 : float
+    D2 : float or ndarray
         Diameter of the pipe attached to the valve, [m]
-    angle : float
+    angle : float or ndarray
         Angle formed by the reducer in the valve, [degrees]
-    fd : float
+    fd : float or ndarray
         Darcy friction factor calculated for the actual pipe flow in clean 
         steel (roughness = 0.0018 inch) in the fully developed turbulent 
         region [-]
 
     Returns
     -------
-    K : float
+    K : float or ndarray
         Loss coefficient with respect to the pipe inside diameter [-]
 
     Notes
@@ -1638,17 +2175,12 @@ def K_gate_valve_Crane(D1, D2, angle, fd):
        Equivalent Length and Resistance Coefficient." Katmar Software. Accessed
        July 28, 2017. http://www.katmarsoftware.com/articles/pipe-fitting-pressure-drop.htm.
     '''
-    angle = radians(angle)
+    angle = np.radians(angle)
     beta = D1/D2
     K1 = 8*fd # This does not refer to upstream loss per se
-    if beta == 1 or angle == 0:
-        return K1 # upstream and down
-    else:
-        if angle <= pi/4:
-            K = (K1 + sin(angle/2)*(0.8*(1-beta**2) + 2.6*(1-beta**2)**2))/beta**4
-        else:
-            K = (K1 + 0.5*(sin(angle/2))**0.5 * (1 - beta**2) + (1-beta**2)**2)/beta**4
-    return K
+    K = _K_reducer_Crane(K1, beta, angle)
+    K = np.where((beta == 1) | (angle == 0), K1, K) # upstream and down
+    return _scalar_or_array(K)
 
 
 def K_globe_valve_Crane(D1, D2, fd):
@@ -1667,18 +2199,18 @@ def K_globe_valve_Crane(D1, D2, fd):
         
     Parameters
     ----------
-    D1 : float
+    D1 : float or ndarray
         Diameter of the valve seat bore (must be smaller or equal to `D2`), [m]
-    D2 : float
+    D2 : float or ndarray
         Diameter of the pipe attached to the valve, [m]
-    fd : float
+    fd : float or ndarray
         Darcy friction factor calculated for the actual pipe flow in clean 
         steel (roughness = 0.0018 inch) in the fully developed turbulent 
         region [-]
 
     Returns
     -------
-    K : float
+    K : float or ndarray
         Loss coefficient with respect to the pipe inside diameter [-]
 
     Notes
@@ -1698,10 +2230,8 @@ def K_globe_valve_Crane(D1, D2, fd):
     '''
     beta = D1/D2
     K1 = 340*fd 
-    if beta == 1:
-        return K1 # upstream and down
-    else:
-        return (K1 + beta*(0.5*(1-beta)**2 + (1-beta**2)**2))/beta**4
+    K = (K1 + beta*(0.5*(1-beta)**2 + (1-beta**2)**2))/beta**4
+    return _scalar_or_array(np.where(beta == 1, K1, K)) # upstream and down
 
 
 def K_angle_valve_Crane(D1, D2, fd, style=0):
@@ -1722,11 +2252,11 @@ def K_angle_valve_Crane(D1, D2, fd, style=0):
     
     Parameters
     ----------
-    D1 : float
+    D1 : float or ndarray
         Diameter of the valve seat bore (must be smaller or equal to `D2`), [m]
-    D2 : float
+    D2 : float or ndarray
         Diameter of the pipe attached to the valve, [m]
-    fd : float
+    fd : float or ndarray
         Darcy friction factor calculated for the actual pipe flow in clean 
         steel (roughness = 0.0018 inch) in the fully developed turbulent 
         region [-]
@@ -1736,7 +2266,7 @@ def K_angle_valve_Crane(D1, D2, fd, style=0):
         
     Returns
     -------
-    K : float
+    K : float or ndarray
         Loss coefficient with respect to the pipe inside diameter [-]
 
     Notes
@@ -1761,10 +2291,8 @@ def K_angle_valve_Crane(D1, D2, fd, style=0):
         K1 = 55*fd
     else:
         K1 = 150*fd
-    if beta == 1:
-        return K1 # upstream and down
-    else:
-        return (K1 + beta*(0.5*(1-beta)**2 + (1-beta**2)**2))/beta**4
+    K = (K1 + beta*(0.5*(1-beta)**2 + (1-beta**2)**2))/beta**4
+    return _scalar_or_array(np.where(beta == 1, K1, K)) # upstream and down
 
 
 def K_swing_check_valve_Crane(fd, angled=True):
@@ -1777,7 +2305,7 @@ def K_swing_check_valve_Crane(fd, angled=True):
     
     Parameters
     ----------
-    fd : float
+    fd : float or ndarray
         Darcy friction factor calculated for the actual pipe flow in clean 
         steel (roughness = 0.0018 inch) in the fully developed turbulent 
         region [-]
@@ -1787,7 +2315,7 @@ def K_swing_check_valve_Crane(fd, angled=True):
         
     Returns
     -------
-    K : float
+    K : float or ndarray
         Loss coefficient with respect to the pipe inside diameter [-]
 
     Notes
@@ -1828,11 +2356,11 @@ def K_lift_check_valve_Crane(D1, D2, fd, angled=True):
     
     Parameters
     ----------
-    D1 : float
+    D1 : float or ndarray
         Diameter of the valve seat bore (must be smaller or equal to `D2`), [m]
-    D2 : float
+    D2 : float or ndarray
         Diameter of the pipe attached to the valve, [m]
-    fd : float
+    fd : float or ndarray
         Darcy friction factor calculated for the actual pipe flow in clean 
         steel (roughness = 0.0018 inch) in the fully developed turbulent 
         region [-]
@@ -1842,7 +2370,7 @@ def K_lift_check_valve_Crane(D1, D2, fd, angled=True):
         
     Returns
     -------
-    K : float
+    K : float or ndarray
         Loss coefficient with respect to the pipe inside diameter [-]
 
     Notes
@@ -1861,18 +2389,8 @@ def K_lift_check_valve_Crane(D1, D2, fd, angled=True):
        2009.
     '''
     beta = D1/D2
-    if angled:
-        K1 = 55*fd
-        if beta == 1:
-            return K1
-        else:
-            return (K1 + beta*(0.5*(1 - beta**2) + (1 - beta**2)**2))/beta**4
-    else:
-        K1 = 600.*fd
-        if beta == 1:
-            return K1
-        else:
-            return (K1 + beta*(0.5*(1 - beta**2) + (1 - beta**2)**2))/beta**4
+    K1 = 55*fd if angled else 600.*fd
+    return _K_reduced_seat_Crane(K1, beta)
             
         
 def K_tilting_disk_check_valve_Crane(D, angle, fd):
@@ -1901,20 +2419,20 @@ def K_tilting_disk_check_valve_Crane(D, angle, fd):
             
     Parameters
     ----------
-    D : float
+    D : float or ndarray
         Diameter of the pipe section the valve in mounted in; the
         same as the line size [m]
-    angle : float
+    angle : float or ndarray
         Angle of the tilting disk to the flow direction; nominally 5 or 15
         degrees [degrees]
-    fd : float
+    fd : float or ndarray
         Darcy friction factor calculated for the actual pipe flow in clean 
         steel (roughness = 0.0018 inch) in the fully developed turbulent 
         region [-]
         
     Returns
     -------
-    K : float
+    K : float or ndarray
         Loss coefficient with respect to the pipe inside diameter [-]
 
     Notes
@@ -1932,28 +2450,12 @@ def K_tilting_disk_check_valve_Crane(D, angle, fd):
     .. [1] Crane Co. Flow of Fluids Through Valves, Fittings, and Pipe. Crane,
        2009.
     '''
-    if angle < 10:
-        # 5 degree case
-        if D <= 0.2286:
-            # 2-8 inches, split at 9 inch
-            return 40*fd
-        elif D <= 0.381:
-            # 10-14 inches, split at 15 inch
-            return 30*fd
-        else:
-            # 16-18 inches
-            return 20*fd
-    else:
-        # 15 degree case
-        if D < 0.2286:
-            # 2-8 inches
-            return 120*fd
-        elif D < 0.381:
-            # 10-14 inches
-            return 90*fd
-        else:
-            # 16-18 inches
-            return 60*fd
+    # 5 degree case; 2-8 inches, split at 9 inch; 10-14 inches, split at 15 
+    # inch; and 16-18 inches
+    N_5 = np.where(D <= 0.2286, 40, np.where(D <= 0.381, 30, 20))
+    # 15 degree case
+    N_15 = np.where(D < 0.2286, 120, np.where(D < 0.381, 90, 60))
+    return _scalar_or_array(np.where(angle < 10, N_5, N_15)*fd)
 
 
 def K_globe_stop_check_valve_Crane(D1, D2, fd, style=0):
@@ -1977,11 +2479,11 @@ def K_globe_stop_check_valve_Crane(D1, D2, fd, style=0):
     
     Parameters
     ----------
-    D1 : float
+    D1 : float or ndarray
         Diameter of the valve seat bore (must be smaller or equal to `D2`), [m]
-    D2 : float
+    D2 : float or ndarray
         Diameter of the pipe attached to the valve, [m]
-    fd : float
+    fd : float or ndarray
         Darcy friction factor calculated for the actual pipe flow in clean 
         steel (roughness = 0.0018 inch) in the fully developed turbulent 
         region [-]
@@ -1991,7 +2493,7 @@ def K_globe_stop_check_valve_Crane(D1, D2, fd, style=0):
         
     Returns
     -------
-    K : float
+    K : float or ndarray
         Loss coefficient with respect to the pipe inside diameter [-]
 
     Notes
@@ -2015,10 +2517,7 @@ def K_globe_stop_check_valve_Crane(D1, D2, fd, style=0):
     except KeyError:
         raise KeyError('Accepted valve styles are 0, 1, and 2 only')
     beta = D1/D2
-    if beta == 1:
-        return K
-    else:
-        return (K + beta*(0.5*(1 - beta**2) + (1 - beta**2)**2))/beta**4
+    return _K_reduced_seat_Crane(K, beta)
 
 
 def K_angle_stop_check_valve_Crane(D1, D2, fd, style=0):
@@ -2042,11 +2541,11 @@ def K_angle_stop_check_valve_Crane(D1, D2, fd, style=0):
     
     Parameters
     ----------
-    D1 : float
+    D1 : float or ndarray
         Diameter of the valve seat bore (must be smaller or equal to `D2`), [m]
-    D2 : float
+    D2 : float or ndarray
         Diameter of the pipe attached to the valve, [m]
-    fd : float
+    fd : float or ndarray
         Darcy friction factor calculated for the actual pipe flow in clean 
         steel (roughness = 0.0018 inch) in the fully developed turbulent 
         region [-]
@@ -2056,7 +2555,7 @@ def K_angle_stop_check_valve_Crane(D1, D2, fd, style=0):
         
     Returns
     -------
-    K : float
+    K : float or ndarray
         Loss coefficient with respect to the pipe inside diameter [-]
 
     Notes
@@ -2081,10 +2580,7 @@ def K_angle_stop_check_valve_Crane(D1, D2, fd, style=0):
         raise KeyError('Accepted valve styles are 0, 1, and 2 only')
 
     beta = D1/D2
-    if beta == 1:
-        return K
-    else:
-        return (K + beta*(0.5*(1 - beta**2) + (1 - beta**2)**2))/beta**4
+    return _K_reduced_seat_Crane(K, beta)
 
 
 def K_ball_valve_Crane(D1, D2, angle, fd):
@@ -2109,21 +2605,21 @@ def K_ball_valve_Crane(D1, D2, angle, fd):
         
     Parameters
     ----------
-    D1 : float
+    D1 : float or ndarray
         Diameter of the valve seat bore (must be equal to or smaller than 
         `D2`), [m]
-    D2 : float
+    D2 : float or ndarray
         Diameter of the pipe attached to the valve, [m]
-    angle : float
+    angle : float or ndarray
         Angle formed by the reducer in the valve, [degrees]
-    fd : float
+    fd : float or ndarray
         Darcy friction factor calculated for the actual pipe flow in clean 
         steel (roughness = 0.0018 inch) in the fully developed turbulent 
         region [-]
 
     Returns
     -------
-    K : float
+    K : float or ndarray
         Loss coefficient with respect to the pipe inside diameter [-]
 
     Notes
@@ -2143,14 +2639,9 @@ def K_ball_valve_Crane(D1, D2, angle, fd):
     '''
     beta = D1/D2
     K1 = 3*fd
-    angle = radians(angle)
-    if beta == 1:
-        return K1
-    else:
-        if angle <= pi/4:
-            return (K1 + sin(angle/2)*(0.8*(1-beta**2) + 2.6*(1-beta**2)**2))/beta**4
-        else:
-            return (K1 + 0.5*(sin(angle/2))**0.5 * (1 - beta**2) + (1-beta**2)**2)/beta**4
+    angle = np.radians(angle)
+    K = _K_reducer_Crane(K1, beta, angle)
+    return _scalar_or_array(np.where(beta == 1, K1, K))
 
 
 def K_diaphragm_valve_Crane(fd, style=0):
@@ -2164,7 +2655,7 @@ def K_diaphragm_valve_Crane(fd, style=0):
     
     Parameters
     ----------
-    fd : float
+    fd : float or ndarray
         Darcy friction factor calculated for the actual pipe flow in clean 
         steel (roughness = 0.0018 inch) in the fully developed turbulent 
         region [-]
@@ -2173,7 +2664,7 @@ def K_diaphragm_valve_Crane(fd, style=0):
         
     Returns
     -------
-    K : float
+    K : float or ndarray
         Loss coefficient with respect to the pipe inside diameter [-]
 
     Notes
@@ -2211,7 +2702,7 @@ def K_foot_valve_Crane(fd, style=0):
     
     Parameters
     ----------
-    fd : float
+    fd : float or ndarray
         Darcy friction factor calculated for the actual pipe flow in clean 
         steel (roughness = 0.0018 inch) in the fully developed turbulent 
         region [-]
@@ -2220,7 +2711,7 @@ def K_foot_valve_Crane(fd, style=0):
         
     Returns
     -------
-    K : float
+    K : float or ndarray
         Loss coefficient with respect to the pipe inside diameter [-]
 
     Notes
@@ -2270,10 +2761,10 @@ def K_butterfly_valve_Crane(D, fd, style=0):
             
     Parameters
     ----------
-    D : float
+    D : float or ndarray
         Diameter of the pipe section the valve in mounted in; the
         same as the line size [m]
-    fd : float
+    fd : float or ndarray
         Darcy friction factor calculated for the actual pipe flow in clean 
         steel (roughness = 0.0018 inch) in the fully developed turbulent 
         region [-]
@@ -2282,7 +2773,7 @@ def K_butterfly_valve_Crane(D, fd, style=0):
 
     Returns
     -------
-    K : float
+    K : float or ndarray
         Loss coefficient with respect to the pipe inside diameter [-]
 
     Notes
@@ -2305,15 +2796,10 @@ def K_butterfly_valve_Crane(D, fd, style=0):
         c1, c2, c3 = coeffs[style]
     except KeyError:
         raise KeyError('Accepted valve styles are 0 (centric), 1 (double offset), or 2 (triple offset) only.')
-    if D <= 0.2286:
-        # 2-8 inches, split at 9 inch
-        return c1*fd
-    elif D <= 0.381:
-        # 10-14 inches, split at 15 inch
-        return c2*fd
-    else:
-        # 16-18 inches
-        return c3*fd
+    # 2-8 inches, split at 9 inch; 10-14 inches, split at 15 inch; and 16-18
+    # inches
+    N = np.where(D <= 0.2286, c1, np.where(D <= 0.381, c2, c3))
+    return _scalar_or_array(N*fd)
     
     
 def K_plug_valve_Crane(D1, D2, angle, fd, style=0):
@@ -2337,14 +2823,14 @@ def K_plug_valve_Crane(D1, D2, angle, fd, style=0):
         
     Parameters
     ----------
-    D1 : float
+    D1 : float or ndarray
         Diameter of the valve plug bore (must be equal to or smaller than 
         `D2`), [m]
-    D2 : float
+    D2 : float or ndarray
         Diameter of the pipe attached to the valve, [m]
-    angle : float
+    angle : float or ndarray
         Angle formed by the reducer in the valve, [degrees]
-    fd : float
+    fd : float or ndarray
         Darcy friction factor calculated for the actual pipe flow in clean 
         steel (roughness = 0.0018 inch) in the fully developed turbulent 
         region [-]
@@ -2354,7 +2840,7 @@ def K_plug_valve_Crane(D1, D2, angle, fd, style=0):
 
     Returns
     -------
-    K : float
+    K : float or ndarray
         Loss coefficient with respect to the pipe inside diameter [-]
 
     Notes
@@ -2378,11 +2864,139 @@ def K_plug_valve_Crane(D1, D2, angle, fd, style=0):
         K = coeffs[style]*fd
     except KeyError:
         raise KeyError('Accepted valve styles are 0 (straight-through), 1 (3-way, flow straight-through), or 2 (3-way, flow 90°)')
-    angle = radians(angle)
-    if beta == 1:
-        return K
-    else:
-        return (K + 0.5*(sin(angle/2))**0.5 * (1 - beta**2) + (1-beta**2)**2)/beta**4
+    angle = np.radians(angle)
+    K2 = (K + 0.5*np.sin(angle/2)**0.5 * (1 - beta**2) + (1-beta**2)**2)/beta**4
+    return _scalar_or_array(np.where(beta == 1, K, K2))
+
+
+K_valve_Crane_kinds = ['gate', 'globe', 'angle', 'swing check angled',
+                       'swing check straight', 'lift check angled',
+                       'lift check straight', 'tilting disk check',
+                       'globe stop check', 'angle stop check', 'ball',
+                       'diaphragm', 'foot', 'butterfly', 'plug']
+
+_K_valve_Crane_funcs = {
+    'gate': lambda D1, D2, fd, angle, style: K_gate_valve_Crane(D1, D2, angle, fd),
+    'globe': lambda D1, D2, fd, angle, style: K_globe_valve_Crane(D1, D2, fd),
+    'angle': lambda D1, D2, fd, angle, style: K_angle_valve_Crane(D1, D2, fd, style),
+    'swing check angled': lambda D1, D2, fd, angle, style: K_swing_check_valve_Crane(fd, True),
+    'swing check straight': lambda D1, D2, fd, angle, style: K_swing_check_valve_Crane(fd, False),
+    'lift check angled': lambda D1, D2, fd, angle, style: K_lift_check_valve_Crane(D1, D2, fd, True),
+    'lift check straight': lambda D1, D2, fd, angle, style: K_lift_check_valve_Crane(D1, D2, fd, False),
+    'tilting disk check': lambda D1, D2, fd, angle, style: K_tilting_disk_check_valve_Crane(D2, angle, fd),
+    'globe stop check': lambda D1, D2, fd, angle, style: K_globe_stop_check_valve_Crane(D1, D2, fd, style),
+    'angle stop check': lambda D1, D2, fd, angle, style: K_angle_stop_check_valve_Crane(D1, D2, fd, style),
+    'ball': lambda D1, D2, fd, angle, style: K_ball_valve_Crane(D1, D2, angle, fd),
+    'diaphragm': lambda D1, D2, fd, angle, style: K_diaphragm_valve_Crane(fd, style),
+    'foot': lambda D1, D2, fd, angle, style: K_foot_valve_Crane(fd, style),
+    'butterfly': lambda D1, D2, fd, angle, style: K_butterfly_valve_Crane(D2, fd, style),
+    'plug': lambda D1, D2, fd, angle, style: K_plug_valve_Crane(D1, D2, angle, fd, style),
+}
+
+
+def K_valve_Crane(kind, fd, D1=None, D2=None, angle=0., style=0):
+    r'''Returns the loss coefficients of a list of valves of different kinds,
+    according to the Crane methods of :obj:`K_gate_valve_Crane` and the 
+    other valve functions. Valves are grouped by kind and style, and each
+    group is evaluated with one array call of its function.
+
+    +------------------------+-------------------------------------------+
+    | kind                   | Function                                  |
+    +========================+===========================================+
+    | 'gate'                 | :obj:`K_gate_valve_Crane`                 |
+    +------------------------+-------------------------------------------+
+    | 'globe'                | :obj:`K_globe_valve_Crane`                |
+    +------------------------+-------------------------------------------+
+    | 'angle'                | :obj:`K_angle_valve_Crane`                |
+    +------------------------+-------------------------------------------+
+    | 'swing check angled'   | :obj:`K_swing_check_valve_Crane`          |
+    +------------------------+-------------------------------------------+
+    | 'swing check straight' | :obj:`K_swing_check_valve_Crane`          |
+    +------------------------+-------------------------------------------+
+    | 'lift check angled'    | :obj:`K_lift_check_valve_Crane`           |
+    +------------------------+-------------------------------------------+
+    | 'lift check straight'  | :obj:`K_lift_check_valve_Crane`           |
+    +------------------------+-------------------------------------------+
+    | 'tilting disk check'   | :obj:`K_tilting_disk_check_valve_Crane`   |
+    +------------------------+-------------------------------------------+
+    | 'globe stop check'     | :obj:`K_globe_stop_check_valve_Crane`     |
+    +------------------------+-------------------------------------------+
+    | 'angle stop check'     | :obj:`K_angle_stop_check_valve_Crane`     |
+    +------------------------+-------------------------------------------+
+    | 'ball'                 | :obj:`K_ball_valve_Crane`                 |
+    +------------------------+-------------------------------------------+
+    | 'diaphragm'            | :obj:`K_diaphragm_valve_Crane`            |
+    +------------------------+-------------------------------------------+
+    | 'foot'                 | :obj:`K_foot_valve_Crane`                 |
+    +------------------------+-------------------------------------------+
+    | 'butterfly'            | :obj:`K_butterfly_valve_Crane`            |
+    +------------------------+-------------------------------------------+
+    | 'plug'                 | :obj:`K_plug_valve_Crane`                 |
+    +------------------------+-------------------------------------------+
+
+    Parameters
+    ----------
+    kind : str or list[str]
+        Kind of each valve, one of those in :obj:`K_valve_Crane_kinds`, [-]
+    fd : float or ndarray
+        Darcy friction factor calculated for the actual pipe flow in clean 
+        steel (roughness = 0.0018 inch) in the fully developed turbulent 
+        region [-]
+    D1 : float or ndarray, optional
+        Diameter of the valve seat or bore; the same as `D2` if not 
+        provided, [m]
+    D2 : float or ndarray, optional
+        Diameter of the pipe attached to the valve; the line size, used
+        as `D` by the tilting disk check and butterfly valves; the same as
+        `D1` if not provided, [m]
+    angle : float or ndarray, optional
+        Angle formed by the reducer in the valve for gate, ball and plug
+        valves, or the angle of the disk of a tilting disk check valve,
+        [degrees]
+    style : int or ndarray, optional
+        Style of the valve, for the functions which accept one, [-]
+
+    Returns
+    -------
+    K : float or ndarray
+        Loss coefficient with respect to the pipe inside diameter [-]
+
+    Notes
+    -----
+    Either `D1` or `D2` is required for the kinds of valves which use a
+    diameter. Inputs broadcast to the number of valves in `kind`.
+
+    Examples
+    --------
+    >>> K_valve_Crane(['gate', 'globe', 'swing check angled', 'butterfly'],
+    ... fd=0.015, D1=np.array([.1, .01, .1, .2]), 
+    ... D2=np.array([.146, .02, .1, .2]), angle=np.array([13.115, 0, 0, 0]))
+    array([  1.14583037,  87.1       ,   1.5       ,   0.675     ])
+    '''
+    scalar = isinstance(kind, string_types)
+    kinds = np.atleast_1d(np.asarray(kind))
+    N = kinds.shape[0]
+    if D1 is None:
+        D1 = D2
+    elif D2 is None:
+        D2 = D1
+    fd, D1, D2, angle, style = [np.broadcast_to(np.asarray(i, dtype=float), (N,)) 
+                                if i is not None else np.full(N, np.nan)
+                                for i in (fd, D1, D2, angle, style)]
+    K = np.empty(N)
+    unique_kinds, inverse = np.unique(kinds, return_inverse=True)
+    for i, k in enumerate(unique_kinds):
+        try:
+            func = _K_valve_Crane_funcs[k]
+        except KeyError:
+            raise Exception('Valve kind %s not recognized; must be one of %s' %(k, K_valve_Crane_kinds))
+        in_kind = inverse == i
+        for s in np.unique(style[in_kind]):
+            idx = np.nonzero(in_kind & (style == s))[0]
+            K[idx] = func(D1[idx], D2[idx], fd[idx], angle[idx], int(s))
+    if scalar:
+        return float(K[0])
+    return K
 
 
 branch_converging_Crane_Fs = np.array([1.74, 1.41, 1, 0])
@@ -2406,23 +3020,23 @@ def K_branch_converging_Crane(D_run, D_branch, Q_run, Q_branch, angle=90):
 
     Parameters
     ----------
-    D_run : float
+    D_run : float or ndarray
         Diameter of the straight-through inlet portion of the tee or wye [m]
-    D_branch : float
+    D_branch : float or ndarray
         Diameter of the pipe attached at an angle to the straight-through, [m]
-    Q_run : float
+    Q_run : float or ndarray
         Volumetric flow rate in the straight-through inlet of the tee or wye,
         [m^3/s]
-    Q_branch : float
+    Q_branch : float or ndarray
         Volumetric flow rate in the pipe attached at an angle to the straight-
         through, [m^3/s]
-    angle : float, optional
+    angle : float or ndarray, optional
         Angle the branch makes with the straight-through (tee=90, wye<90)
         [degrees]
 
     Returns
     -------
-    K : float
+    K : float or ndarray
         Loss coefficient of branch with respect to the velocity and inside 
         diameter of the combined flow outlet [-]
 
@@ -2473,19 +3087,8 @@ def K_branch_converging_Crane(D_run, D_branch, Q_run, Q_branch, angle=90):
        2009.
     '''
     beta = (D_branch/D_run)
-    beta2 = beta*beta
-    Q_comb = Q_run + Q_branch
-    Q_ratio = Q_branch/Q_comb
-    if beta2 <= 0.35:
-        C = 1.
-    elif Q_ratio <= 0.4:
-        C = 0.9*(1 - Q_ratio)
-    else:
-        C = 0.55
-    D, E = 1., 2.
-    F = np.interp(angle, branch_converging_Crane_angles, branch_converging_Crane_Fs)
-    K = C*(1. + D*(Q_ratio/beta2)**2 - E*(1. - Q_ratio)**2 - F/beta2*Q_ratio**2)
-    return K
+    Q_ratio = Q_branch/(Q_run + Q_branch)
+    return K_tee_Crane(Q_ratio, beta*beta, angle, branch=True, converging=True)
 
 
 run_converging_Crane_Fs = np.array([1.74, 1.41, 1])
@@ -2508,24 +3111,24 @@ def K_run_converging_Crane(D_run, D_branch, Q_run, Q_branch, angle=90):
 
     Parameters
     ----------
-    D_run : float
+    D_run : float or ndarray
         Diameter of the straight-through inlet portion of the tee or wye
         [m]
-    D_branch : float
+    D_branch : float or ndarray
         Diameter of the pipe attached at an angle to the straight-through, [m]
-    Q_run : float
+    Q_run : float or ndarray
         Volumetric flow rate in the straight-through inlet of the tee or wye,
         [m^3/s]
-    Q_branch : float
+    Q_branch : float or ndarray
         Volumetric flow rate in the pipe attached at an angle to the straight-
         through, [m^3/s]
-    angle : float, optional
+    angle : float or ndarray, optional
         Angle the branch makes with the straight-through (tee=90, wye<90)
         [degrees]
 
     Returns
     -------
-    K : float
+    K : float or ndarray
         Loss coefficient of run with respect to the velocity and inside 
         diameter of the combined flow outlet [-]
 
@@ -2567,18 +3170,8 @@ def K_run_converging_Crane(D_run, D_branch, Q_run, Q_branch, angle=90):
        2009.
     '''
     beta = (D_branch/D_run)
-    beta2 = beta*beta
-    Q_comb = Q_run + Q_branch
-    Q_ratio = Q_branch/Q_comb
-    if angle < 75.:
-        C = 1
-    else:
-        return 1.55*(Q_ratio) - Q_ratio*Q_ratio
-
-    D, E = 0, 1
-    F = np.interp(angle, run_converging_Crane_angles, run_converging_Crane_Fs)
-    K = C*(1. + D*(Q_ratio/beta2)**2 - E*(1. - Q_ratio)**2 - F/beta2*Q_ratio**2)
-    return K
+    Q_ratio = Q_branch/(Q_run + Q_branch)
+    return K_tee_Crane(Q_ratio, beta*beta, angle, branch=False, converging=True)
 
 
 def K_branch_diverging_Crane(D_run, D_branch, Q_run, Q_branch, angle=90):
@@ -2596,23 +3189,23 @@ def K_branch_diverging_Crane(D_run, D_branch, Q_run, Q_branch, angle=90):
 
     Parameters
     ----------
-    D_run : float
+    D_run : float or ndarray
         Diameter of the straight-through inlet portion of the tee or wye [m]
-    D_branch : float
+    D_branch : float or ndarray
         Diameter of the pipe attached at an angle to the straight-through, [m]
-    Q_run : float
+    Q_run : float or ndarray
         Volumetric flow rate in the straight-through outlet of the tee or wye,
         [m^3/s]
-    Q_branch : float
+    Q_branch : float or ndarray
         Volumetric flow rate in the pipe attached at an angle to the straight-
         through, [m^3/s]
-    angle : float, optional
+    angle : float or ndarray, optional
         Angle the branch makes with the straight-through (tee=90, wye<90)
         [degrees]
 
     Returns
     -------
-    K : float
+    K : float or ndarray
         Loss coefficient of branch with respect to the velocity and inside 
         diameter of the combined flow inlet [-]
 
@@ -2661,33 +3254,8 @@ def K_branch_diverging_Crane(D_run, D_branch, Q_run, Q_branch, angle=90):
        2009.
     '''
     beta = (D_branch/D_run)
-    beta2 = beta*beta
-    Q_comb = Q_run + Q_branch
-    Q_ratio = Q_branch/Q_comb
-
-    if angle < 60 or beta <= 2/3.:
-        H, J = 1., 2.
-    else:
-        H, J = 0.3, 0
-    if angle < 75:
-        if beta2 <= 0.35:
-            if Q_ratio <= 0.4:
-                G = 1.1 - 0.7*Q_ratio
-            else:
-                G = 0.85
-        else:
-            if Q_ratio <= 0.6:
-                G = 1.0 - 0.6*Q_ratio
-            else:
-                G = 0.6
-    else:
-        if beta2 <= 2/3.:
-            G = 1
-        else:
-            G = 1 + 0.3*Q_ratio*Q_ratio
-    angle_rad = radians(angle)
-    K_branch = G*(1 + H*(Q_ratio/beta2)**2 - J*(Q_ratio/beta2)*cos(angle_rad))
-    return K_branch
+    Q_ratio = Q_branch/(Q_run + Q_branch)
+    return K_tee_Crane(Q_ratio, beta*beta, angle, branch=True, converging=False)
 
 
 def K_run_diverging_Crane(D_run, D_branch, Q_run, Q_branch, angle=90):
@@ -2703,23 +3271,23 @@ def K_run_diverging_Crane(D_run, D_branch, Q_run, Q_branch, angle=90):
 
     Parameters
     ----------
-    D_run : float
+    D_run : float or ndarray
         Diameter of the straight-through inlet portion of the tee or wye [m]
-    D_branch : float
+    D_branch : float or ndarray
         Diameter of the pipe attached at an angle to the straight-through, [m]
-    Q_run : float
+    Q_run : float or ndarray
         Volumetric flow rate in the straight-through outlet of the tee or wye,
         [m^3/s]
-    Q_branch : float
+    Q_branch : float or ndarray
         Volumetric flow rate in the pipe attached at an angle to the straight-
         through, [m^3/s]
-    angle : float, optional
+    angle : float or ndarray, optional
         Angle the branch makes with the straight-through (tee=90, wye<90)
         [degrees]
 
     Returns
     -------
-    K : float
+    K : float or ndarray
         Loss coefficient of run with respect to the velocity and inside 
         diameter of the combined flow inlet [-]
 
@@ -2752,16 +3320,115 @@ def K_run_diverging_Crane(D_run, D_branch, Q_run, Q_branch, angle=90):
        2009.
     '''
     beta = (D_branch/D_run)
-    beta2 = beta*beta
-    Q_comb = Q_run + Q_branch
-    Q_ratio = Q_branch/Q_comb
-    if beta2 <= 0.4:
-        M = 0.4
-    elif Q_ratio <= 0.5:
-        M = 2.*(2.*Q_ratio - 1.)
+    Q_ratio = Q_branch/(Q_run + Q_branch)
+    return K_tee_Crane(Q_ratio, beta*beta, angle, branch=False, converging=False)
+
+
+def K_tee_Crane(Q_ratio, area_ratio, angle=90., branch=True, converging=True,
+                derivative=False):
+    r'''Returns the loss coefficient of either the branch or the run of a
+    converging or diverging tee or wye according to the Crane method [1]_, 
+    from the ratio of branch to combined flow and the ratio of branch to run
+    areas. This is the calculation of :obj:`K_branch_converging_Crane`, 
+    :obj:`K_run_converging_Crane`, :obj:`K_branch_diverging_Crane` and 
+    :obj:`K_run_diverging_Crane`, for arrays of tees at once; the derivative 
+    of the loss coefficient with respect to the flow ratio can also be 
+    returned, for use in the Jacobian of a network solver.
+    
+    .. math::
+        \frac{Q_{branch}}{Q_{comb}} = \frac{Q_{branch}}{Q_{run} + Q_{branch}}
+        
+        \beta_{branch}^2 = \left(\frac{D_{branch}}{D_{run}}\right)^2
+    
+    Parameters
+    ----------
+    Q_ratio : float or ndarray
+        Ratio of the flow rate in the branch to the combined flow rate, [-]
+    area_ratio : float or ndarray
+        Ratio of the area of the branch to the area of the run,
+        :math:`\beta_{branch}^2`, [-]
+    angle : float or ndarray, optional
+        Angle the branch makes with the straight-through (tee=90, wye<90)
+        [degrees]
+    branch : bool, optional
+        Whether to calculate the loss coefficient of the branch (True) or of 
+        the run (False), [-]
+    converging : bool, optional
+        Whether the tee is converging (True) or diverging (False), [-]
+    derivative : bool, optional
+        Whether to also return the derivative of the loss coefficient with
+        respect to `Q_ratio`, [-]
+
+    Returns
+    -------
+    K : float or ndarray
+        Loss coefficient with respect to the velocity and inside diameter of 
+        the combined flow, [-]
+    dK_dQ_ratio : float or ndarray, only returned if `derivative` is True
+        Derivative of the loss coefficient with respect to `Q_ratio`, [-]
+        
+    Notes
+    -----
+    The Crane method is piecewise in the flow ratio; the derivative is that
+    of the piece the flow ratio is in, and is discontinuous where the
+    coefficients of the method change.
+
+    Examples
+    --------
+    Example 7-35 of [1]_, the branch and run of a converging tee:
+    
+    >>> Q_ratio = 0.00633/(0.018917 + 0.00633)
+    >>> K_tee_Crane(Q_ratio, 1., branch=True, converging=True)
+    -0.04044108513625682
+    >>> K_tee_Crane(np.array([0.2, Q_ratio]), 1., branch=False, derivative=True)
+    (array([ 0.27      ,  0.32575848]), array([ 1.15      ,  1.04855428]))
+    
+    References
+    ----------
+    .. [1] Crane Co. Flow of Fluids Through Valves, Fittings, and Pipe. Crane,
+       2009.
+    '''
+    q, b = Q_ratio, area_ratio
+    if converging and branch:
+        C = np.where(b <= 0.35, 1., np.where(q <= 0.4, 0.9*(1 - q), 0.55))
+        dC = np.where((b > 0.35) & (q <= 0.4), -0.9, 0.)
+        D, E = 1., 2.
+        F = np.interp(angle, branch_converging_Crane_angles, branch_converging_Crane_Fs)
+        inner = 1. + D*(q/b)**2 - E*(1. - q)**2 - F/b*q**2
+        dinner = 2.*D*q/(b*b) + 2.*E*(1. - q) - 2.*F/b*q
+        K = C*inner
+        dK = dC*inner + C*dinner
+    elif converging:
+        E = 1.
+        F = np.interp(angle, run_converging_Crane_angles, run_converging_Crane_Fs)
+        K = np.where(angle < 75., 1. - E*(1. - q)**2 - F/b*q**2,
+                     1.55*q - q*q)
+        dK = np.where(angle < 75., 2.*E*(1. - q) - 2.*F/b*q, 1.55 - 2.*q)
+    elif branch:
+        H_J_full = (angle < 60) | (b <= 4/9.)
+        H = np.where(H_J_full, 1., 0.3)
+        J = np.where(H_J_full, 2., 0.)
+        G = np.where(angle < 75, 
+                     np.where(b <= 0.35, np.where(q <= 0.4, 1.1 - 0.7*q, 0.85),
+                              np.where(q <= 0.6, 1.0 - 0.6*q, 0.6)),
+                     np.where(b <= 2/3., 1., 1. + 0.3*q*q))
+        dG = np.where(angle < 75,
+                      np.where(b <= 0.35, np.where(q <= 0.4, -0.7, 0.),
+                               np.where(q <= 0.6, -0.6, 0.)),
+                      np.where(b <= 2/3., 0., 0.6*q))
+        cos_angle = np.cos(np.radians(angle))
+        inner = 1 + H*(q/b)**2 - J*(q/b)*cos_angle
+        dinner = 2.*H*q/(b*b) - J/b*cos_angle
+        K = G*inner
+        dK = dG*inner + G*dinner
     else:
-        M = 0.3*(2.*Q_ratio - 1.)
-    return M*Q_ratio*Q_ratio
+        M = np.where(b <= 0.4, 0.4, np.where(q <= 0.5, 2.*(2.*q - 1.), 0.3*(2.*q - 1.)))
+        dM = np.where(b <= 0.4, 0., np.where(q <= 0.5, 4., 0.6))
+        K = M*q*q
+        dK = dM*q*q + 2.*M*q
+    if derivative:
+        return _scalar_or_array(K), _scalar_or_array(dK)
+    return _scalar_or_array(K)
 
 
 def v_lift_valve_Crane(rho, D1=None, D2=None, style='swing check angled'):
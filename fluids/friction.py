@@ -22,6 +22,7 @@ SOFTWARE.'''
 
 from __future__ import division
 from math import log, log10, exp, cos, sin, tan, pi
+import numpy as np
 from scipy.special import lambertw
 from scipy.constants import inch
 from fluids.core import Dean
@@ -293,6 +294,32 @@ def Clamond(Re, eD):
     return 1.325474527619599502640416597148504422899/(F*F) # ((0.5*log(10))**2).evalf(40)
 
 
+def _Clamond_array(Re, eD):
+    # Same algorithm as `Clamond`, written with numpy operations for arrays
+    X1 = eD*Re*0.1239681863354175460160858261654858382699
+    X2 = np.log(Re) - 0.7793974884556819406441139701653776731705
+    F = X2 - 0.2
+    X1F = X1 + F
+    X1F1 = 1. + X1F
+    E = (np.log(X1F) - 0.2)/(X1F1)
+    F = F - (X1F1 + 0.5*E)*E*(X1F)/ (X1F1 + E*(1. + E/3.))
+    X1F = X1 + F
+    X1F1 = 1. + X1F
+    E = (np.log(X1F) + F - X2)/(X1F1)
+    F = F - (X1F1 + 0.5*E)*E*(X1F)/ (X1F1 + E*(1. + E/3.))
+    return 1.325474527619599502640416597148504422899/(F*F)
+
+
+def _friction_factor_array(Re, eD=0):
+    # Array version of `friction_factor` with its default method; the laminar 
+    # solution below the transition Reynolds number, Clamond above.
+    Re = np.asarray(Re, dtype=float)
+    Re_turbulent = np.maximum(Re, LAMINAR_TRANSITION_PIPE)
+    with np.errstate(divide='ignore'):
+        return np.where(Re < LAMINAR_TRANSITION_PIPE, 64./Re, 
+                        _Clamond_array(Re_turbulent, eD))
+
+
 def Moody(Re, eD):
     r'''Calculates Darcy friction factor using the method in Moody (1947)
     as shown in [1]_ and originally in [2]_.
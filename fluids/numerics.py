@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+'''Chemical Engineering Design Library (ChEDL). Utilities for process modeling.
+Copyright (C) 2017 Caleb Bell <Caleb.Andrew.Bell@gmail.com>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.'''
+
+from __future__ import division
+from bisect import bisect_right
+import numpy as np
+
+__all__ = ['Table1D', 'Table2D']
+
+
+def _scalar_or_array(x, cast=float):
+    # Results of array-capable functions are returned as Python scalars
+    # (floats, or `cast`) when all of their inputs were scalars
+    if np.ndim(x) == 0:
+        return cast(x)
+    return x
+
+
+class Table1D(object):
+    r'''Piecewise linear interpolant of a table of `y` values at increasing
+    breakpoints `x`. The interpolation arrays are built on the first call, so
+    creating many tables at import time costs almost nothing. Scalars are
+    evaluated with a binary search in pure Python; arrays with
+    `np.searchsorted`, all at once.
+
+    Parameters
+    ----------
+    x : list[float]
+        Breakpoints of the table, in increasing order [-]
+    y : list[float]
+        Values of the table at each breakpoint [-]
+    clamp : bool, optional
+        If False, a ValueError is raised for points outside the table as
+        with `scipy.interpolate.interp1d`; if True, points outside are clamped
+        to the nearest end of the table and take its value. There is no
+        linear extrapolation.
+
+    Examples
+    --------
+    >>> table = Table1D([1., 2., 4.], [10., 20., 30.])
+    >>> table(3.)
+    25.0
+    >>> table(np.array([1., 1.5, 4.]))
+    array([ 10.,  15.,  30.])
+    '''
+    built = False
+
+    def __init__(self, x, y, clamp=False):
+        self.x_data = x
+        self.y_data = y
+        self.clamp = clamp
+
+    def build(self):
+        '''Precomputes the breakpoints and slopes of each interval.'''
+        self.x = np.array(self.x_data, dtype=float)
+        self.y = np.array(self.y_data, dtype=float)
+        self.slopes = np.diff(self.y)/np.diff(self.x)
+        self.x_list = self.x.tolist()
+        self.y_list = self.y.tolist()
+        self.slopes_list = self.slopes.tolist()
+        self.x_min, self.x_max = self.x_list[0], self.x_list[-1]
+        self.N = len(self.x_list)
+        self.built = True
+
+    def __call__(self, x):
+        if not self.built:
+            self.build()
+        if np.ndim(x) == 0:
+            x = float(x)
+            if x < self.x_min or x > self.x_max:
+                if not self.clamp:
+                    raise ValueError('Value %g is outside the table range %g to %g'
+                                     %(x, self.x_min, self.x_max))
+                x = min(max(x, self.x_min), self.x_max)
+            i = min(max(bisect_right(self.x_list, x) - 1, 0), self.N - 2)
+            return self.y_list[i] + self.slopes_list[i]*(x - self.x_list[i])
+
+        x = np.asarray(x, dtype=float)
+        if not self.clamp:
+            if np.any(x < self.x_min) or np.any(x > self.x_max):
+                raise ValueError('Values are outside the table range %g to %g'
+                                 %(self.x_min, self.x_max))
+        else:
+            x = np.clip(x, self.x_min, self.x_max)
+        i = np.clip(np.searchsorted(self.x, x, side='right') - 1, 0, self.N - 2)
+        return self.y[i] + self.slopes[i]*(x - self.x[i])
+
+
+class Table2D(object):
+    r'''Bilinear interpolant of a table of values on a rectangular grid.
+    Follows the argument conventions of `scipy.interpolate.interp2d`:
+    `z[i][j]` is the value at (`x[j]`, `y[i]`). Points outside the grid are
+    clamped to its nearest edge and take the value there, like the default of
+    `interp2d`; there is no linear extrapolation. The interpolation arrays
+    are built on the first call; `x` and `y` may be scalars or arrays which
+    broadcast together.
+
+    Parameters
+    ----------
+    x : list[float]
+        Breakpoints of the table in the first dimension, in increasing order
+        [-]
+    y : list[float]
+        Breakpoints of the table in the second dimension, in increasing order
+        [-]
+    z : list[list[float]]
+        Values of the table; one list of values for each `y` [-]
+
+    Examples
+    --------
+    >>> table = Table2D([0., 1.], [0., 10.], [[0., 1.], [10., 11.]])
+    >>> table(0.5, 5.)
+    5.5
+    '''
+    built = False
+
+    def __init__(self, x, y, z):
+        self.x_data = x
+        self.y_data = y
+        self.z_data = z
+
+    def build(self):
+        '''Precomputes the breakpoints and table arrays.'''
+        self.x = np.array(self.x_data, dtype=float)
+        self.y = np.array(self.y_data, dtype=float)
+        self.z = np.array(self.z_data, dtype=float)
+        self.built = True
+
+    def __call__(self, x, y):
+        if not self.built:
+            self.build()
+        xs, ys, z = self.x, self.y, self.z
+        x = np.clip(x, xs[0], xs[-1])
+        y = np.clip(y, ys[0], ys[-1])
+        i = np.clip(np.searchsorted(xs, x, side='right') - 1, 0, len(xs) - 2)
+        j = np.clip(np.searchsorted(ys, y, side='right') - 1, 0, len(ys) - 2)
+        tx = (x - xs[i])/(xs[i+1] - xs[i])
+        ty = (y - ys[j])/(ys[j+1] - ys[j])
+        ans = ((1. - ty)*((1. - tx)*z[j, i] + tx*z[j, i+1])
+               + ty*((1. - tx)*z[j+1, i] + tx*z[j+1, i+1]))
+        return _scalar_or_array(ans)
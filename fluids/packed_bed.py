@@ -22,12 +22,15 @@ SOFTWARE.'''
 
 from __future__ import division
 from math import exp, pi
+import numpy as np
+from fluids.geometry import sphericity as _sphericity
 
 __all__ = ['dP_packed_bed', 'Ergun', 'Kuo_Nydegger', 'Jones_Krier', 'Carman', 'Hicks',
            'Brauer', 'KTA', 'Erdim_Akgiray_Demir', 'Fahien_Schriver', 'Idelchik',
            'Harrison_Brunner_Hecker', 'Montillet_Akkari_Comiti', 'Guo_Sun',
             'voidage_Benyahia_Oneil',
-           'voidage_Benyahia_Oneil_spherical', 'voidage_Benyahia_Oneil_cylindrical']
+           'voidage_Benyahia_Oneil_spherical', 'voidage_Benyahia_Oneil_cylindrical',
+           'packed_bed_particles', 'dP_packed_bed_particles']
 
 
 
@@ -1132,3 +1135,132 @@ def voidage_Benyahia_Oneil_cylindrical(Dpe, Dt, sphericity):
        doi:10.1080/02726350590922242.
     '''
     return 0.373 + 1.703/(Dt/Dpe + 0.611)**2
+
+
+### Beds of particles of a distribution of sizes and shapes
+
+def packed_bed_particles(A, V, counts=None):
+    r'''Calculates the sphericities and equivalent diameters of the particles
+    of a particle size distribution, and the mean diameter and sphericity
+    representing the bed they make up. The bed's diameter is the Sauter mean
+    (surface-volume) diameter of the particles, which the pressure drop
+    correlations use as the product of a volume-equivalent diameter and
+    sphericity.
+
+    .. math::
+        \Psi_i = \frac{\pi^{1/3}(6V_i)^{2/3}}{A_i}
+
+        d_{pe,i} = \left(\frac{6V_i}{\pi}\right)^{1/3}
+
+        d_{sv} = \frac{6\sum_i n_i V_i}{\sum_i n_i A_i}
+
+        \Psi = \frac{\sum_i n_i \Psi_i A_i}{\sum_i n_i A_i}
+
+    Parameters
+    ----------
+    A : ndarray
+        Surface areas of the particles, [m^2]
+    V : ndarray
+        Volumes of the particles, [m^3]
+    counts : ndarray, optional
+        Number of particles of each area and volume; all 1 if not provided,
+        [-]
+
+    Returns
+    -------
+    sphericities : ndarray
+        Sphericity of each particle, [-]
+    Dpe : ndarray
+        Equivalent spherical particle diameter of each particle (diameter of a
+        sphere with the same volume), [m]
+    Dsv : float
+        Sauter mean diameter of the particles, [m]
+    sphericity : float
+        Surface-weighted mean sphericity of the particles; the bed's
+        volume-equivalent diameter is `Dsv`/`sphericity`, [-]
+
+    Notes
+    -----
+    The surface areas and volumes of shaped particles can be calculated for a
+    whole distribution at once with the functions in `fluids.geometry`, such
+    as `A_multiple_hole_cylinder` and `V_multiple_hole_cylinder`.
+
+    Examples
+    --------
+    Spheres of 1 mm and cubes of 2 mm:
+
+    >>> packed_bed_particles(A=[pi*1E-6, 24E-6], V=[pi/6*1E-9, 8E-9])
+    (array([ 1.        ,  0.80599598]), array([ 0.001    ,  0.0024814]), 0.001884251720461427, 0.8284516088930938)
+    '''
+    A, V = np.asarray(A, dtype=float), np.asarray(V, dtype=float)
+    counts = np.ones_like(A) if counts is None else np.asarray(counts, dtype=float)
+    sphericities = _sphericity(A, V)
+    Dpe = (6.*V/pi)**(1/3.)
+    A_total = float(np.sum(counts*A))
+    Dsv = 6.*float(np.sum(counts*V))/A_total
+    return sphericities, Dpe, Dsv, float(np.sum(counts*sphericities*A))/A_total
+
+
+def dP_packed_bed_particles(A, V, vs, rho, mu, voidage=None, L=1, Dt=None,
+                            counts=None, Method=None):
+    r'''Calculates the pressure drop across a bed packed with a distribution
+    of particles of different sizes and shapes, from their surface areas and
+    volumes. The bed is represented by the Sauter mean diameter of the
+    particles, calculated with `packed_bed_particles`, and its pressure drop
+    with `dP_packed_bed`. If the voidage of the bed is not known, it is
+    estimated with `voidage_Benyahia_Oneil` from the bed's mean
+    volume-equivalent diameter and sphericity.
+
+    Parameters
+    ----------
+    A : ndarray
+        Surface areas of the particles, [m^2]
+    V : ndarray
+        Volumes of the particles, [m^3]
+    vs : float
+        Superficial velocity of the fluid (volumetric flow rate/cross-sectional
+        area) [m/s]
+    rho : float
+        Density of the fluid [kg/m^3]
+    mu : float
+        Viscosity of the fluid, [Pa*s]
+    voidage : float, optional
+        Void fraction of bed packing; required if `Dt` is not provided [-]
+    L : float, optional
+        Length the fluid flows in the packed bed [m]
+    Dt : float, optional
+        Diameter of the tube, [m]
+    counts : ndarray, optional
+        Number of particles of each area and volume; all 1 if not provided,
+        [-]
+
+    Returns
+    -------
+    dP : float
+        Pressure drop across the bed [Pa]
+
+    Other Parameters
+    ----------------
+    Method : string, optional
+        A string of the function name to use, as in the dictionary
+        packed_beds_correlations
+
+    Examples
+    --------
+    Hollow cylinders with one hole of 1 mm, of lengths from 3 to 5 mm:
+
+    >>> from fluids.geometry import A_multiple_hole_cylinder, V_multiple_hole_cylinder
+    >>> Ls = np.linspace(3E-3, 5E-3, 1000)
+    >>> A = A_multiple_hole_cylinder(3E-3, Ls, [(1E-3, 1)])
+    >>> V = V_multiple_hole_cylinder(3E-3, Ls, [(1E-3, 1)])
+    >>> dP_packed_bed_particles(A, V, vs=1E-2, rho=1E3, mu=1E-3, Dt=0.05)
+    1202.7717330614942
+    '''
+    sphericities, Dpe, Dsv, sphericity_bed = packed_bed_particles(A, V, counts)
+    if voidage is None:
+        if Dt is None:
+            raise Exception('Either the voidage or the tube diameter is required')
+        voidage = voidage_Benyahia_Oneil(Dpe=Dsv/sphericity_bed, Dt=Dt,
+                                         sphericity=sphericity_bed)
+    return dP_packed_bed(dp=Dsv, voidage=voidage, vs=vs, rho=rho, mu=mu, L=L,
+                         Dt=Dt, Method=Method)
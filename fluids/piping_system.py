@@ -0,0 +1,447 @@
+# -*- coding: utf-8 -*-
+'''Chemical Engineering Design Library (ChEDL). Utilities for process modeling.
+Copyright (C) 2017 Caleb Bell <Caleb.Andrew.Bell@gmail.com>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.'''
+
+from __future__ import division
+from math import pi
+import numpy as np
+from scipy.constants import inch
+from fluids.fittings import bend_rounded, Kv_to_K, Darby, Hooper
+from fluids.friction import _friction_factor_array
+from fluids.numerics import _scalar_or_array
+
+__all__ = ['PipingSystem', 'dP_piping_systems']
+
+
+class PipingSystem(object):
+    r'''Class representing a line made of pipe runs, fittings and valves in
+    series, for calculating its pressure drop at many flow rates at once
+    (a system curve), or the flow rate for a given pressure drop.
+
+    Every element's loss coefficient is of the form
+    :math:`K = K_c + K_{Re}/Re + C f_d(Re, \epsilon/D)`, and all elements are
+    converted to the basis of the reference diameter `D` of the line:
+
+    .. math::
+        K_{line} = \sum_i \left(\frac{D}{D_i}\right)^4 \left[K_{c,i}
+        + \frac{K_{Re,i}}{Re_i} + C_i f_d(Re_i, \epsilon_i/D_i)\right]
+
+        Re_i = Re\frac{D}{D_i}
+
+        \Delta P = K_{line}\frac{\rho V^2}{2}
+
+    The parts of this sum which do not depend on the Reynolds number are
+    precomputed once; elements with the same diameter and roughness share a
+    single friction factor evaluation.
+
+    Parameters
+    ----------
+    D : float
+        Reference inside diameter of the line; elements with no diameter
+        specified are of this diameter, and velocity is based on it, [m]
+    roughness : float, optional
+        Default roughness of the pipe in the line, [m]
+
+    Attributes
+    ----------
+    elements : list[tuple]
+        Elements of the line as added, each as a tuple of (kind, D,
+        roughness, Kc, KRe, C) with the loss coefficient terms on the basis
+        of the element's own diameter.
+    K_constant : float
+        Sum of the Reynolds number independent loss coefficients on the
+        basis of `D`, [-]
+    K_Re : float
+        Sum of the coefficients of 1/Re on the basis of `D` and its Reynolds
+        number, [-]
+    fd_C : ndarray
+        Multipliers of the friction factor for each friction group (unique
+        diameter and roughness), on the basis of `D`, [-]
+    fd_Re_ratio : ndarray
+        Ratio of each friction group's Reynolds number to that of `D`, [-]
+    fd_eD : ndarray
+        Relative roughness of each friction group, [-]
+
+    Notes
+    -----
+    Loss coefficients from most of the functions in :obj:`fluids.fittings`
+    are independent of Reynolds number (or use the fully turbulent friction
+    factor, as the Crane valve methods do), and are added with `add_K`.
+    Rounded bends (:obj:`fluids.fittings.bend_rounded`) are linear in the
+    friction factor, and use the friction factor of the flow.
+
+    Elevation changes and the change in kinetic energy between the ends of
+    the line are not included.
+
+    Examples
+    --------
+    >>> line = PipingSystem(D=0.05, roughness=1.5E-5)
+    >>> line.add_pipe(L=100.)
+    >>> line.add_bend(angle=90., bend_diameters=1.5)
+    >>> line.add_Darby3K(name='Valve, Gate valve, standard, β = 1')
+    >>> line.add_K(0.5) # sharp entrance
+    >>> line.dP(Q=np.array([0.001, 0.005]), rho=1000., mu=1E-3)
+    array([   6645.44578154,  124701.68151061])
+    >>> line.Q(dP=124701.68151061, rho=1000., mu=1E-3)
+    0.004999999999999947
+    '''
+    def __repr__(self): # pragma: no cover
+        return '<Piping system, D=%g m, %d elements>' %(self.D, len(self.elements))
+
+    def __init__(self, D, roughness=0.):
+        self.D = D
+        self.roughness = roughness
+        self.A = 0.25*pi*D*D
+        self.elements = []
+        self.built = False
+
+    def add_element(self, kind, Kc=0., KRe=0., C=0., D=None, roughness=None):
+        r'''Adds an element with a loss coefficient of the general form
+        :math:`K = K_c + K_{Re}/Re + C f_d(Re, \epsilon/D)` to the line; all
+        terms are on the basis of the element's diameter and Reynolds number.
+
+        Parameters
+        ----------
+        kind : str
+            Description of the element, [-]
+        Kc : float, optional
+            Reynolds number independent loss coefficient, [-]
+        KRe : float, optional
+            Coefficient of 1/Re in the loss coefficient, [-]
+        C : float, optional
+            Multiplier of the Darcy friction factor in the loss coefficient,
+            [-]
+        D : float, optional
+            Inside diameter of the element, [m]
+        roughness : float, optional
+            Roughness of the element, [m]
+        '''
+        D = self.D if D is None else D
+        roughness = self.roughness if roughness is None else roughness
+        self.elements.append((kind, D, roughness, Kc, KRe, C))
+        self.built = False
+
+    def add_pipe(self, L, D=None, roughness=None):
+        r'''Adds a straight pipe run to the line.
+
+        Parameters
+        ----------
+        L : float
+            Length of the pipe, [m]
+        D : float, optional
+            Inside diameter of the pipe, [m]
+        roughness : float, optional
+            Roughness of the pipe, [m]
+        '''
+        D = self.D if D is None else D
+        self.add_element('pipe', C=L/D, D=D, roughness=roughness)
+
+    def add_K(self, K, D=None):
+        r'''Adds a fitting or valve of known, Reynolds number independent,
+        loss coefficient to the line.
+
+        Parameters
+        ----------
+        K : float
+            Loss coefficient of the fitting, on the basis of `D`, [-]
+        D : float, optional
+            Diameter the loss coefficient is based on, [m]
+        '''
+        self.add_element('K', Kc=K, D=D)
+
+    def add_Kv(self, Kv, D=None):
+        r'''Adds a valve of known flow coefficient to the line; see
+        :obj:`fluids.fittings.Kv_to_K`.
+
+        Parameters
+        ----------
+        Kv : float
+            Metric Kv valve flow coefficient (flow rate of water at a pressure
+            drop of 1 bar) [m^3/hr]
+        D : float, optional
+            Inside diameter of the pipe the valve is in, [m]
+        '''
+        D = self.D if D is None else D
+        self.add_element('Kv', Kc=Kv_to_K(Kv, D), D=D)
+
+    def add_bend(self, angle, rc=None, bend_diameters=5, D=None,
+                 roughness=None):
+        r'''Adds a rounded bend to the line; its loss coefficient is
+        calculated with :obj:`fluids.fittings.bend_rounded` at the friction
+        factor of the flow.
+
+        Parameters
+        ----------
+        angle : float
+            Angle of bend, [degrees]
+        rc : float, optional
+            Radius of curvature of the bend, [m]
+        bend_diameters : float, optional (used if rc not provided)
+            Number of diameters of pipe making up the bend radius [-]
+        D : float, optional
+            Inside diameter of the bend, [m]
+        roughness : float, optional
+            Roughness of the bend, [m]
+        '''
+        D = self.D if D is None else D
+        Kc = bend_rounded(D, angle, 0., rc, bend_diameters)
+        C = bend_rounded(D, angle, 1., rc, bend_diameters) - Kc
+        self.add_element('bend', Kc=Kc, C=C, D=D, roughness=roughness)
+
+    def add_Darby3K(self, name=None, K1=None, Ki=None, Kd=None, NPS=None,
+                    D=None):
+        r'''Adds a fitting described by the Darby 3K method to the line;
+        see :obj:`fluids.fittings.Darby3K`.
+
+        Parameters
+        ----------
+        name : str, optional
+            Name of the fitting in :obj:`fluids.fittings.Darby`, [-]
+        K1 : float, optional
+            K1 parameter of the fitting, [-]
+        Ki : float, optional
+            Ki parameter of the fitting, [-]
+        Kd : float, optional
+            Kd parameter of the fitting, [inch^0.3]
+        NPS : float, optional
+            Nominal pipe size of the fitting; the inside diameter in inches if
+            not given, [inch]
+        D : float, optional
+            Inside diameter of the fitting, [m]
+        '''
+        D = self.D if D is None else D
+        if name is not None:
+            K1, Ki, Kd = Darby[name]['K1'], Darby[name]['Ki'], Darby[name]['Kd']
+        elif K1 is None or Ki is None or Kd is None:
+            raise Exception('Name of fitting or constants are required')
+        if NPS is None:
+            NPS = D/inch
+        self.add_element('Darby3K', Kc=Ki*(1. + Kd/NPS**0.3), KRe=K1, D=D)
+
+    def add_Hooper2K(self, name=None, K1=None, Kinfty=None, D=None):
+        r'''Adds a fitting described by the Hooper 2K method to the line;
+        see :obj:`fluids.fittings.Hooper2K`.
+
+        Parameters
+        ----------
+        name : str, optional
+            Name of the fitting in :obj:`fluids.fittings.Hooper`, [-]
+        K1 : float, optional
+            K1 parameter of the fitting, [-]
+        Kinfty : float, optional
+            Kinfty parameter of the fitting, [-]
+        D : float, optional
+            Inside diameter of the fitting, [m]
+        '''
+        D = self.D if D is None else D
+        if name is not None:
+            K1, Kinfty = Hooper[name]['K1'], Hooper[name]['Kinfty']
+        elif K1 is None or Kinfty is None:
+            raise Exception('Name of fitting or constants are required')
+        self.add_element('Hooper2K', Kc=Kinfty*(1. + inch/D), KRe=K1, D=D)
+
+    def build(self):
+        '''Precomputes the Reynolds number independent terms of the line's
+        loss coefficient, and groups the friction terms by diameter and
+        roughness. Called automatically when needed.'''
+        K_constant, K_Re = 0., 0.
+        groups = {}
+        for kind, D, roughness, Kc, KRe, C in self.elements:
+            ratio = self.D/D
+            w = ratio**4
+            K_constant += w*Kc
+            K_Re += w*KRe/ratio
+            if C:
+                key = (D, roughness)
+                groups[key] = groups.get(key, 0.) + w*C
+        self.K_constant = K_constant
+        self.K_Re = K_Re
+        keys = list(groups.keys())
+        self.fd_C = np.array([groups[k] for k in keys], dtype=float)
+        self.fd_Re_ratio = np.array([self.D/k[0] for k in keys], dtype=float)
+        self.fd_eD = np.array([k[1]/k[0] for k in keys], dtype=float)
+        self.built = True
+
+    def K(self, Re):
+        r'''Calculates the total loss coefficient of the line on the basis of
+        its reference diameter, at one or many Reynolds numbers.
+
+        Parameters
+        ----------
+        Re : float or ndarray
+            Reynolds number in the reference diameter, [-]
+
+        Returns
+        -------
+        K : float or ndarray
+            Loss coefficient of the line, [-]
+        '''
+        if not self.built:
+            self.build()
+        Re = np.asarray(Re, dtype=float)
+        K = self.K_constant + self.K_Re/Re
+        if len(self.fd_C):
+            fd = _friction_factor_array(Re[..., None]*self.fd_Re_ratio, self.fd_eD)
+            K = K + np.dot(fd, self.fd_C)
+        return _scalar_or_array(K)
+
+    def dP(self, Q, rho, mu):
+        r'''Calculates the pressure drop across the line at one or many flow
+        rates.
+
+        Parameters
+        ----------
+        Q : float or ndarray
+            Volumetric flow rate, [m^3/s]
+        rho : float or ndarray
+            Density of the fluid, [kg/m^3]
+        mu : float or ndarray
+            Viscosity of the fluid, [Pa*s]
+
+        Returns
+        -------
+        dP : float or ndarray
+            Pressure drop across the line, [Pa]
+        '''
+        V = np.abs(Q)/self.A
+        with np.errstate(divide='ignore', invalid='ignore'):
+            dP = np.where(V == 0., 0., self.K(rho*V*self.D/mu)*0.5*rho*V*V)
+        return _scalar_or_array(dP)
+
+    def Q(self, dP, rho, mu, xtol=1E-12, maxiter=100):
+        r'''Calculates the flow rate through the line at one or many pressure
+        drops. Solved with the secant method on the logarithms of velocity
+        and pressure drop, starting from the pressure drop at a Reynolds
+        number of 1E5; all points are solved together.
+
+        Parameters
+        ----------
+        dP : float or ndarray
+            Pressure drop across the line, [Pa]
+        rho : float or ndarray
+            Density of the fluid, [kg/m^3]
+        mu : float or ndarray
+            Viscosity of the fluid, [Pa*s]
+        xtol : float, optional
+            Relative tolerance on the flow rate, [-]
+        maxiter : int, optional
+            Maximum number of iterations, [-]
+
+        Returns
+        -------
+        Q : float or ndarray
+            Volumetric flow rate, [m^3/s]
+        '''
+        dP, rho, mu = np.broadcast_arrays(*[np.asarray(i, dtype=float) for i in (dP, rho, mu)])
+        zero = dP <= 0.
+        dP_calc = np.where(zero, 1., dP)
+        ln_dP = np.log(dP_calc)
+        x = np.log((2.*dP_calc/(rho*self.K(1E5)))**0.5)
+        f = np.log(self.dP(np.exp(x)*self.A, rho, mu)) - ln_dP
+        slope = np.full(x.shape, 2.)
+        for _ in range(maxiter):
+            step = f/slope
+            x_new = x - step
+            f_new = np.log(self.dP(np.exp(x_new)*self.A, rho, mu)) - ln_dP
+            with np.errstate(divide='ignore', invalid='ignore'):
+                slope_new = (f_new - f)/(x_new - x)
+            slope = np.where(np.isfinite(slope_new) & (slope_new > 0.), slope_new, slope)
+            x, f = x_new, f_new
+            if np.all(np.abs(step) < xtol):
+                break
+        Q = np.where(zero, 0., np.exp(x)*self.A)
+        return _scalar_or_array(Q)
+
+
+def dP_piping_systems(systems, Q, rho, mu):
+    r'''Calculates the pressure drop across many lines at many flow rates at
+    once, for example to build the system curves of a whole plant. The
+    friction terms of all lines are evaluated in a single array operation.
+
+    Parameters
+    ----------
+    systems : list[PipingSystem]
+        Lines to calculate the pressure drop of, [-]
+    Q : float or ndarray
+        Volumetric flow rates, either the same for each line (shape (N,)) or
+        one row per line (shape (len(systems), N)), [m^3/s]
+    rho : float or ndarray
+        Density of the fluid; a scalar for all lines, one per line (shape
+        (len(systems),)), or one per line and flow rate (shape
+        (len(systems), N)). Properties are per line, not per pipe segment,
+        [kg/m^3]
+    mu : float or ndarray
+        Viscosity of the fluid, in the same shapes as `rho`, [Pa*s]
+
+    Returns
+    -------
+    dP : ndarray
+        Pressure drops with one row per line, [Pa]
+
+    Examples
+    --------
+    >>> lines = [PipingSystem(D=D, roughness=1.5E-5) for D in (0.05, 0.1)]
+    >>> for line in lines:
+    ...     line.add_pipe(L=100.)
+    >>> dP_piping_systems(lines, Q=np.array([0.001, 0.005]), rho=1000., mu=1E-3)
+    array([[   6521.80542657,  121818.3829814 ],
+           [    237.12556348,    4136.44177027]])
+    '''
+    K_constant, K_Re, D, A = [], [], [], []
+    fd_C, fd_Re_ratio, fd_eD, ends = [], [], [], [0]
+    for system in systems:
+        if not system.built:
+            system.build()
+        K_constant.append(system.K_constant)
+        K_Re.append(system.K_Re)
+        D.append(system.D)
+        A.append(system.A)
+        fd_C.append(system.fd_C)
+        fd_Re_ratio.append(system.fd_Re_ratio)
+        fd_eD.append(system.fd_eD)
+        ends.append(ends[-1] + len(system.fd_C))
+    D = np.array(D)[:, None]
+    A = np.array(A)[:, None]
+    rho = np.asarray(rho, dtype=float)
+    mu = np.asarray(mu, dtype=float)
+    for name, prop in (('rho', rho), ('mu', mu)):
+        if prop.ndim > 2 or (prop.ndim >= 1 and prop.shape[0] not in (1, len(systems))):
+            raise ValueError('%s must be a scalar or have one row per line; '
+                             'got shape %s for %d lines' %(name, prop.shape, len(systems)))
+    if rho.ndim == 1:
+        rho = rho[:, None]
+    if mu.ndim == 1:
+        mu = mu[:, None]
+    V = np.abs(np.asarray(Q, dtype=float))/A
+    rho, mu, V = np.broadcast_arrays(rho, mu, V)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        Re = rho*V*D/mu
+        K = np.array(K_constant)[:, None] + np.array(K_Re)[:, None]/Re
+
+        owners = np.repeat(np.arange(len(systems)), np.diff(ends))
+        fd_C, fd_Re_ratio, fd_eD = [np.concatenate(i) for i in (fd_C, fd_Re_ratio, fd_eD)]
+        fd = _friction_factor_array(Re[owners]*fd_Re_ratio[:, None], fd_eD[:, None])
+        # Sum the friction terms of each line; lines without pipes add nothing
+        starts, counts = np.array(ends[:-1]), np.diff(ends)
+        has_pipes = counts > 0
+        if np.any(has_pipes):
+            K[has_pipes] += np.add.reduceat(fd*fd_C[:, None], starts[has_pipes], axis=0)
+        return np.where(V == 0., 0., K*0.5*rho*V*V)
@@ -23,8 +23,8 @@ SOFTWARE.'''
 from __future__ import division
 from math import log
 from collections import namedtuple
-from scipy.interpolate import interp1d, interp2d
 from scipy.constants import hp
+from fluids.numerics import Table1D, Table2D
 import os
 from io import open
 
@@ -134,9 +134,9 @@ VFD_efficiencies = [[0.31, 0.77, 0.86, 0.9, 0.91, 0.93, 0.94],
                     [0.55, 0.89, 0.94, 0.95, 0.96, 0.97, 0.97],
                     [0.61, 0.91, 0.95, 0.96, 0.96, 0.97, 0.97],
                     [0.61, 0.91, 0.95, 0.96, 0.96, 0.97, 0.97]]
-VFD_efficiency_interp = interp2d([0.016, 0.125, 0.25, 0.42, 0.5, 0.75, 1],
-                                 [3, 5, 10, 20, 30, 50, 60, 75, 100, 200, 400],
-                                 VFD_efficiencies)
+VFD_efficiency_interp = Table2D([0.016, 0.125, 0.25, 0.42, 0.5, 0.75, 1],
+                                [3, 5, 10, 20, 30, 50, 60, 75, 100, 200, 400],
+                                VFD_efficiencies)
 
 
 def VFD_efficiency(P, load=1):
@@ -245,13 +245,13 @@ nema_high_full_closed_2p = [0.77, 0.84, 0.855, 0.865, 0.885, 0.885, 0.885, 0.895
 nema_high_full_closed_4p = [0.855, 0.865, 0.865, 0.895, 0.895, 0.895, 0.895, 0.917, 0.917, 0.924, 0.93, 0.936, 0.936, 0.941, 0.945, 0.95, 0.954, 0.954, 0.954, 0.958, 0.962, 0.962]
 nema_high_full_closed_6p = [0.825, 0.875, 0.885, 0.895, 0.895, 0.895, 0.895, 0.91, 0.91, 0.917, 0.917, 0.93, 0.93, 0.941, 0.941, 0.945, 0.945, 0.95, 0.95, 0.958, 0.958, 0.958]
 
-nema_high_full_open_2p_i = interp1d(nema_high_P, nema_high_full_open_2p)
-nema_high_full_open_4p_i = interp1d(nema_high_P, nema_high_full_open_4p)
-nema_high_full_open_6p_i = interp1d(nema_high_P, nema_high_full_open_6p)
+nema_high_full_open_2p_i = Table1D(nema_high_P, nema_high_full_open_2p)
+nema_high_full_open_4p_i = Table1D(nema_high_P, nema_high_full_open_4p)
+nema_high_full_open_6p_i = Table1D(nema_high_P, nema_high_full_open_6p)
 
-nema_high_full_closed_2p_i = interp1d(nema_high_P, nema_high_full_closed_2p)
-nema_high_full_closed_4p_i = interp1d(nema_high_P, nema_high_full_closed_4p)
-nema_high_full_closed_6p_i = interp1d(nema_high_P, nema_high_full_closed_6p)
+nema_high_full_closed_2p_i = Table1D(nema_high_P, nema_high_full_closed_2p)
+nema_high_full_closed_4p_i = Table1D(nema_high_P, nema_high_full_closed_4p)
+nema_high_full_closed_6p_i = Table1D(nema_high_P, nema_high_full_closed_6p)
 
 nema_min_P = [1, 1.5, 2, 3, 4, 5, 5.5, 7.5, 10, 15, 20, 25, 30, 40, 50, 60, 75, 100, 125, 150, 175, 200, 250, 300, 350, 400, 450, 500]
 nema_min_full_open_2p  = [0.755, 0.825, 0.84, 0.84, 0.84, 0.855, 0.855, 0.875, 0.885, 0.895, 0.902, 0.91, 0.91, 0.917, 0.924, 0.93, 0.93, 0.93, 0.936, 0.936, 0.945, 0.945, 0.945, 0.95, 0.95, 0.954, 0.958, 0.958]
@@ -263,15 +263,15 @@ nema_min_full_closed_4p = [0.825, 0.84, 0.84, 0.875, 0.875, 0.875, 0.875, 0.895,
 nema_min_full_closed_6p = [0.8, 0.855, 0.865, 0.875, 0.875, 0.875, 0.875, 0.895, 0.895, 0.902, 0.902, 0.917, 0.917, 0.93, 0.93, 0.936, 0.936, 0.941, 0.941, 0.95, 0.95, 0.95, 0.95, 0.95, 0.95, 0.95, 0.95, 0.95]
 nema_min_full_closed_8p = [0.74, 0.77, 0.825, 0.84, 0.84, 0.855, 0.855, 0.855, 0.885, 0.885, 0.895, 0.895, 0.91, 0.91, 0.917, 0.917, 0.93, 0.93, 0.936, 0.936, 0.941, 0.941, 0.945, 0.945, 0.945, 0.945, 0.945, 0.945]
 
-nema_min_full_open_2p_i = interp1d(nema_min_P, nema_min_full_open_2p)
-nema_min_full_open_4p_i = interp1d(nema_min_P, nema_min_full_open_4p)
-nema_min_full_open_6p_i = interp1d(nema_min_P, nema_min_full_open_6p)
-nema_min_full_open_8p_i = interp1d(nema_min_P, nema_min_full_open_8p)
+nema_min_full_open_2p_i = Table1D(nema_min_P, nema_min_full_open_2p)
+nema_min_full_open_4p_i = Table1D(nema_min_P, nema_min_full_open_4p)
+nema_min_full_open_6p_i = Table1D(nema_min_P, nema_min_full_open_6p)
+nema_min_full_open_8p_i = Table1D(nema_min_P, nema_min_full_open_8p)
 
-nema_min_full_closed_2p_i = interp1d(nema_min_P, nema_min_full_closed_2p)
-nema_min_full_closed_4p_i = interp1d(nema_min_P, nema_min_full_closed_4p)
-nema_min_full_closed_6p_i = interp1d(nema_min_P, nema_min_full_closed_6p)
-nema_min_full_closed_8p_i = interp1d(nema_min_P, nema_min_full_closed_8p)
+nema_min_full_closed_2p_i = Table1D(nema_min_P, nema_min_full_closed_2p)
+nema_min_full_closed_4p_i = Table1D(nema_min_P, nema_min_full_closed_4p)
+nema_min_full_closed_6p_i = Table1D(nema_min_P, nema_min_full_closed_6p)
+nema_min_full_closed_8p_i = Table1D(nema_min_P, nema_min_full_closed_8p)
 
 
 def CSA_motor_efficiency(P, closed=False, poles=2, high_efficiency=False):
@@ -22,14 +22,18 @@ SOFTWARE.'''
 
 from __future__ import division
 from math import exp
+import numpy as np
 from scipy.constants import psi, inch, atm
 from fluids.core import F2K, C2K
 from fluids.compressible import is_critical_flow
-from scipy.interpolate import interp1d, interp2d
+from fluids.numerics import Table1D, Table2D, _scalar_or_array
 
 __all__ = ['API526_A_sq_inch', 'API526_letters', 'API526_A',
 'API520_round_size', 'API520_C', 'API520_F2', 'API520_Kv', 'API520_N',
-'API520_SH', 'API520_B', 'API520_W', 'API520_A_g', 'API520_A_steam']
+'API520_SH', 'API520_B', 'API520_W', 'API520_A_g', 'API520_A_steam',
+'API520_A_g_scenarios', 'API520_A_steam_scenarios', 'API520_A_l',
+'API520_omega', 'API520_eta_c', 'API520_A_two_phase', 
+'API520_A_l_scenarios', 'API520_A_two_phase_scenarios']
 
 API526_A_sq_inch = [0.110, 0.196, 0.307, 0.503, 0.785, 1.287, 1.838, 2.853, 3.60,
              4.34, 6.38, 11.05, 16.00, 26.00] # square inches
@@ -294,7 +298,7 @@ _KSH_factors = [[1, 0.98, 0.93, 0.88, 0.84, 0.8, 0.77, 0.74, 0.72, 0.7],
 [1, 1, 1, 1, 0.95, 0.86, 0.8, 0.76, 0.72, 0.69],
 [1, 1, 1, 1, 0.95, 0.85, 0.78, 0.73, 0.69, 0.66],
 [1, 1, 1, 1, 1, 0.82, 0.74, 0.69, 0.65, 0.62]]
-API520_KSH = interp2d(_KSH_tempKs, _KSH_Pa, _KSH_factors)
+API520_KSH = Table2D(_KSH_tempKs, _KSH_Pa, _KSH_factors)
 
 
 def API520_SH(T1, P1):
@@ -327,7 +331,7 @@ def API520_SH(T1, P1):
     Custom example from table 9:
 
     >>> API520_SH(593+273.15, 1066.325E3)
-    0.7201800000000002
+    0.72018
 
     References
     ----------
@@ -346,7 +350,7 @@ def API520_SH(T1, P1):
 # Kw, for liquids. Applicable for all overpressures.
 _Kw_x = [15., 16.5493, 17.3367, 18.124, 18.8235, 19.5231, 20.1351, 20.8344, 21.4463, 22.0581, 22.9321, 23.5439, 24.1556, 24.7674, 25.0296, 25.6414, 26.2533, 26.8651, 27.7393, 28.3511, 28.9629, 29.6623, 29.9245, 30.5363, 31.2357, 31.8475, 32.7217, 33.3336, 34.0329, 34.6448, 34.8196, 35.4315, 36.1308, 36.7428, 37.7042, 38.3162, 39.0154, 39.7148, 40.3266, 40.9384, 41.6378, 42.7742, 43.386, 43.9978, 44.6098, 45.2216, 45.921, 46.5329, 47.7567, 48.3685, 49.0679, 49.6797, 50.]
 _Kw_y = [1, 0.996283, 0.992565, 0.987918, 0.982342, 0.976766, 0.97119, 0.964684, 0.958178, 0.951673, 0.942379, 0.935874, 0.928439, 0.921933, 0.919145, 0.912639, 0.906134, 0.899628, 0.891264, 0.884758, 0.878253, 0.871747, 0.868959, 0.862454, 0.855948, 0.849442, 0.841078, 0.834572, 0.828067, 0.821561, 0.819703, 0.814126, 0.806691, 0.801115, 0.790892, 0.785316, 0.777881, 0.771375, 0.76487, 0.758364, 0.751859, 0.740706, 0.734201, 0.727695, 0.722119, 0.715613, 0.709108, 0.702602, 0.69052, 0.684015, 0.677509, 0.671004, 0.666357]
-API520_Kw = interp1d(_Kw_x, _Kw_y)
+API520_Kw = Table1D(_Kw_x, _Kw_y)
 
 
 def API520_W(Pset, Pback):
@@ -394,11 +398,11 @@ def API520_W(Pset, Pback):
 # Kb Backpressure correction factor, for gases
 _16_over_x = [37.6478, 38.1735, 38.6991, 39.2904, 39.8817, 40.4731, 40.9987, 41.59, 42.1156, 42.707, 43.2326, 43.8239, 44.4152, 44.9409, 45.5322, 46.0578, 46.6491, 47.2405, 47.7661, 48.3574, 48.883, 49.4744, 50]
 _16_over_y = [0.998106, 0.994318, 0.99053, 0.985795, 0.982008, 0.97822, 0.973485, 0.96875, 0.964962, 0.961174, 0.956439, 0.951705, 0.947917, 0.943182, 0.939394, 0.935606, 0.930871, 0.926136, 0.921402, 0.918561, 0.913826, 0.910038, 0.90625]
-API520_Kb_16 = interp1d(_16_over_x, _16_over_y)
+API520_Kb_16 = Table1D(_16_over_x, _16_over_y)
 
 _10_over_x = [30.0263, 30.6176, 31.1432, 31.6689, 32.1945, 32.6544, 33.18, 33.7057, 34.1656, 34.6255, 35.0854, 35.5453, 36.0053, 36.4652, 36.9251, 37.385, 37.8449, 38.2392, 38.6334, 39.0276, 39.4875, 39.9474, 40.4074, 40.8016, 41.1958, 41.59, 42.0499, 42.4442, 42.8384, 43.2326, 43.6925, 44.0867, 44.4809, 44.8752, 45.2694, 45.6636, 46.0578, 46.452, 46.8463, 47.2405, 47.6347, 48.0289, 48.4231, 48.883, 49.2773, 49.6715]
 _10_over_y = [0.998106, 0.995265, 0.99053, 0.985795, 0.981061, 0.975379, 0.969697, 0.963068, 0.957386, 0.950758, 0.945076, 0.938447, 0.930871, 0.925189, 0.918561, 0.910985, 0.904356, 0.897727, 0.891098, 0.883523, 0.876894, 0.870265, 0.862689, 0.856061, 0.848485, 0.840909, 0.83428, 0.827652, 0.820076, 0.8125, 0.805871, 0.798295, 0.79072, 0.783144, 0.775568, 0.768939, 0.762311, 0.754735, 0.747159, 0.739583, 0.732008, 0.724432, 0.716856, 0.70928, 0.701705, 0.695076]
-API520_Kb_10 = interp1d(_10_over_x, _10_over_y)
+API520_Kb_10 = Table1D(_10_over_x, _10_over_y)
 
 
 
@@ -595,3 +599,589 @@ def API520_A_steam(m, T, P1, Kd=0.975, Kb=1, Kc=1):
     return A*0.001**2 # convert mm^2 to m^2
 
 #print [API520_A_steam(m=69615/3600., T=592.5, P1=12236E3, Kd=0.975, Kb=1, Kc=1)]
+
+
+def _API520_C_array(k):
+    k_safe = np.where(k == 1, 2., k)
+    C = 0.03948*(k_safe*(2./(k_safe+1.))**((k_safe+1.)/(k_safe-1.)))**0.5
+    return np.where(k == 1, 0.03948*(1./exp(1))**0.5, C)
+
+
+def _API520_SH_array(T1, P1):
+    KSH = np.where(T1 < C2K(149), 1., API520_KSH(T1, P1))
+    return np.where((P1 > 20679E3+atm) | (T1 > C2K(649)), np.nan, KSH)
+
+
+def _API520_B_array(Pset, Pback, overpressure, balanced):
+    # Backpressure correction of balanced-bellows valves; 1 for the others,
+    # whose overpressure is not checked as it does not enter the correction
+    if not np.all(np.isin(overpressure[balanced], [0.1, 0.16, 0.21])):
+        raise Exception('Only overpressure of 10%, 16%, or 21% are permitted')
+    gauge_backpressure = (Pback-atm)/(Pset-atm)*100 # in percent
+    Kb = np.ones(gauge_backpressure.shape)
+    for op, limit, table in ((0.1, 30., API520_Kb_10), 
+                             (0.16, 38., API520_Kb_16)):
+        mask = balanced & (overpressure == op) & (gauge_backpressure >= limit)
+        if np.any(mask):
+            # The digitized curves begin slightly above their limits
+            Kb[mask] = table(np.clip(gauge_backpressure[mask], 
+                                     table.x_data[0], table.x_data[-1]))
+    Kb[balanced & (gauge_backpressure > 50)] = np.nan
+    return Kb
+
+
+def _API526_select(A):
+    i = np.searchsorted(API526_A, np.where(np.isnan(A), np.inf, A))
+    areas = np.array(API526_A + [np.nan])[i]
+    letters = np.array(API526_letters + [''])[i]
+    return areas, letters
+
+
+def API520_A_g_scenarios(m, T, Z, MW, k, Pset, Pback=atm, overpressure=0.1,
+                         Kd=0.975, Kc=1, balanced=False):
+    r'''Sizes API 520 relief valves passing a gas or a vapor for many
+    relief scenarios at once, and selects the API 526 orifice for each.
+    All parameters may be arrays; they are broadcast together and every 
+    step of the calculation is performed on whole arrays. The relieving
+    pressure is calculated from the set pressure and overpressure, and the
+    backpressure correction for balanced valves with :obj:`API520_B`. 
+    See :obj:`API520_A_g` for the sizing equations.
+
+    Parameters
+    ----------
+    m : float or ndarray
+        Mass flow rate of vapor through the valve, [kg/s]
+    T : float or ndarray
+        Temperature of vapor entering the valve, [K]
+    Z : float or ndarray
+        Compressibility factor of the vapor, [-]
+    MW : float or ndarray
+        Molecular weight of the vapor, [g/mol]
+    k : float or ndarray
+        Isentropic coefficient or ideal gas heat capacity ratio [-]
+    Pset : float or ndarray
+        Set pressure for relief [Pa]
+    Pback : float or ndarray, optional
+        Built-up backpressure; the increase in pressure during flow at the
+        outlet of a pressure-relief device after it opens, [Pa]
+    overpressure : float or ndarray, optional
+        The maximum fraction overpressure; one of 0.1, 0.16, or 0.21 for
+        balanced valves, []
+    Kd : float or ndarray, optional
+        The effective coefficient of discharge, from the manufacturer or for
+        preliminary sizing, using 0.975 normally or 0.62 when used with a
+        rupture disc as described in [1]_, []
+    Kc : float or ndarray, optional
+        Combination correction factor for installation with a rupture disk
+        upstream of the PRV, []
+    balanced : bool or ndarray, optional
+        Whether or not the valve is a balanced spring-loaded PRV, for which
+        the backpressure correction `Kb` is applied, []
+
+    Returns
+    -------
+    A : ndarray
+        Minimum area for relief valve according to [1]_, [m^2]
+    A_API526 : ndarray
+        Area of the selected API 526 orifice, [m^2]
+    letters : ndarray
+        Letter designation of the selected API 526 orifice, [-]
+
+    Notes
+    -----
+    Scenarios which cannot be sized, because their percent gauge 
+    backpressure on a balanced valve is over 50%, have a required area of 
+    NaN. Scenarios larger than the largest API 526 orifice, or with a 
+    required area of NaN, have a selected area of NaN and an empty letter.
+
+    Examples
+    --------
+    Examples 1 and 2 from [1]_, with the set pressure back-calculated:
+
+    >>> A, A_API526, letters = API520_A_g_scenarios(m=24270/3600., T=348.,
+    ... Z=0.90, MW=51., k=1.11, Pset=(670E3-atm)/1.1 + atm,
+    ... Pback=np.array([atm, 532E3]))
+    >>> A
+    array([ 0.00369905,  0.00424836])
+    >>> letters.tolist()
+    ['P', 'Q']
+
+    References
+    ----------
+    .. [1] API Standard 520, Part 1 - Sizing and Selection.
+    '''
+    m, T, Z, MW, k, Pset, Pback, overpressure, Kd, Kc, balanced = np.broadcast_arrays(
+        *[np.asarray(i, dtype=float) for i in (m, T, Z, MW, k, Pset, Pback, 
+                                                overpressure, Kd, Kc, balanced)])
+    Kb = _API520_B_array(Pset, Pback, overpressure, balanced != 0)
+    # Pa to kPa, kg/s to kg/hr in the standard
+    P1 = ((Pset - atm)*(1. + overpressure) + atm)/1000.
+    P2 = Pback/1000.
+    m = m*3600.
+    with np.errstate(divide='ignore'):
+        critical = np.where(k == 1, P1*exp(-0.5) > P2, 
+                            is_critical_flow(P1, P2, k))
+    A_critical = m/(_API520_C_array(k)*Kd*Kb*Kc*P1)*(T*Z/MW)**0.5
+    with np.errstate(invalid='ignore', divide='ignore'):
+        A_subcritical = 17.9*m/(API520_F2(k, P1, P2)*Kd*Kc)*(T*Z/(MW*P1*(P1-P2)))**0.5
+    A = np.where(critical, A_critical, A_subcritical)*0.001**2
+    A = np.where(np.isnan(Kb), np.nan, A)
+    A_API526, letters = _API526_select(A)
+    return A, A_API526, letters
+
+
+def API520_A_steam_scenarios(m, T, Pset, Pback=atm, overpressure=0.1, 
+                             Kd=0.975, Kc=1, balanced=False):
+    r'''Sizes API 520 relief valves passing steam for many relief scenarios
+    at once, and selects the API 526 orifice for each. All parameters may be
+    arrays; they are broadcast together and every step of the calculation
+    is performed on whole arrays. The relieving pressure is calculated from
+    the set pressure and overpressure, and the backpressure correction for 
+    balanced valves with :obj:`API520_B`. See :obj:`API520_A_steam` for the 
+    sizing equation.
+
+    Parameters
+    ----------
+    m : float or ndarray
+        Mass flow rate of steam through the valve, [kg/s]
+    T : float or ndarray
+        Temperature of steam entering the valve, [K]
+    Pset : float or ndarray
+        Set pressure for relief [Pa]
+    Pback : float or ndarray, optional
+        Backpressure, [Pa]
+    overpressure : float or ndarray, optional
+        The maximum fraction overpressure; one of 0.1, 0.16, or 0.21 for
+        balanced valves, []
+    Kd : float or ndarray, optional
+        The effective coefficient of discharge, from the manufacturer or for
+        preliminary sizing, using 0.975 normally or 0.62 when used with a
+        rupture disc as described in [1]_, []
+    Kc : float or ndarray, optional
+        Combination correction factor for installation with a rupture disk
+        upstream of the PRV, []
+    balanced : bool or ndarray, optional
+        Whether or not the valve is a balanced spring-loaded PRV, for which
+        the backpressure correction `Kb` is applied, []
+
+    Returns
+    -------
+    A : ndarray
+        Minimum area for relief valve according to [1]_, [m^2]
+    A_API526 : ndarray
+        Area of the selected API 526 orifice, [m^2]
+    letters : ndarray
+        Letter designation of the selected API 526 orifice, [-]
+
+    Notes
+    -----
+    Scenarios outside the range of :obj:`API520_SH`, or with a percent 
+    gauge backpressure on a balanced valve over 50%, have a required area of 
+    NaN. Scenarios larger than the largest API 526 orifice, or with a 
+    required area of NaN, have a selected area of NaN and an empty letter.
+
+    Examples
+    --------
+    Example 4 from [1]_, with the set pressure back-calculated:
+
+    >>> A, A_API526, letters = API520_A_steam_scenarios(m=69615/3600., 
+    ... T=592.5, Pset=(12236E3-atm)/1.1 + atm)
+    >>> A, str(letters)
+    (0.0011034712423692733, 'K')
+
+    References
+    ----------
+    .. [1] API Standard 520, Part 1 - Sizing and Selection.
+    '''
+    m, T, Pset, Pback, overpressure, Kd, Kc, balanced = np.broadcast_arrays(
+        *[np.asarray(i, dtype=float) for i in (m, T, Pset, Pback, overpressure,
+                                                Kd, Kc, balanced)])
+    Kb = _API520_B_array(Pset, Pback, overpressure, balanced != 0)
+    P1 = (Pset - atm)*(1. + overpressure) + atm
+    KN = API520_N(P1)
+    KSH = _API520_SH_array(T, P1)
+    # Pa to kPa, kg/s to kg/hr in the standard
+    A = 190.5*m*3600./(P1/1000.*Kd*Kb*Kc*KN*KSH)*0.001**2
+    A_API526, letters = _API526_select(A)
+    return A, A_API526, letters
+
+
+def _API520_W_array(Pset, Pback):
+    gauge_backpressure = (Pback-atm)/(Pset-atm)*100 # in percent
+    Kw = np.ones(gauge_backpressure.shape)
+    mask = gauge_backpressure >= 15
+    if np.any(mask):
+        Kw[mask] = API520_Kw(np.minimum(gauge_backpressure[mask], 50.))
+    Kw[gauge_backpressure > 50] = np.nan
+    return Kw
+
+
+def API520_A_l(m, rho, mu, P1, P2=101325, Kd=0.65, Kw=1, Kc=1):
+    r'''Calculates required relief valve area for an API 520 valve passing
+    a liquid, including the correction for viscosity. Accepts arrays.
+
+    .. math::
+        A = \frac{11.78Q}{K_d K_w K_c K_v}\sqrt{\frac{G_1}{P_1 - P_2}}
+
+        Re = \frac{Q(18800G_1)}{\mu \sqrt{A}}
+
+    Parameters
+    ----------
+    m : float or ndarray
+        Mass flow rate of liquid through the valve, [kg/s]
+    rho : float or ndarray
+        Density of the liquid at the flowing temperature, [kg/m^3]
+    mu : float or ndarray
+        Viscosity of the liquid at the flowing temperature, [Pa*s]
+    P1 : float or ndarray
+        Upstream relieving pressure; the set pressure plus the allowable
+        overpressure, plus atmospheric pressure, [Pa]
+    P2 : float or ndarray, optional
+        Total backpressure, [Pa]
+    Kd : float or ndarray, optional
+        The effective coefficient of discharge, from the manufacturer or for
+        preliminary sizing, using 0.65 normally or 0.62 when used with a
+        rupture disc as described in [1]_, []
+    Kw : float or ndarray, optional
+        Correction due to liquid backpressure; see :obj:`API520_W` [-]
+    Kc : float or ndarray, optional
+        Combination correction factor for installation with a rupture disk
+        upstream of the PRV, []
+
+    Returns
+    -------
+    A : float or ndarray
+        Minimum area for relief valve according to [1]_, [m^2]
+
+    Notes
+    -----
+    Units are internally L/min, kPa, cP, and mm^2 to match [1]_. The 
+    viscosity correction :obj:`API520_Kv` depends on the area through the 
+    Reynolds number; the area is solved for by successive substitution,
+    rather than by trying standard orifice sizes as in [1]_, and bisected
+    where that converges too slowly. NaN is returned where the Reynolds
+    number of the solution is under 20, the lower end of the viscosity
+    correction chart in [1]_; below it the area grows without bound as the
+    viscosity rises.
+    Specific gravity is relative to water at 60 degrees Fahrenheit.
+
+    Examples
+    --------
+    >>> API520_A_l(m=100., rho=900., mu=0.1, P1=1.1E6, P2=101325.)
+    0.003682269993825028
+
+    References
+    ----------
+    .. [1] API Standard 520, Part 1 - Sizing and Selection.
+    '''
+    Q = m/rho*60000. # m^3/s to L/min
+    G1 = rho/999.016
+    dP = (P1 - P2)/1000. # Pa to kPa
+    mu = mu*1000. # Pa*s to cP
+    A_0 = 11.78*Q/(Kd*Kw*Kc)*(G1/dP)**0.5
+    Re_coeff = Q*18800.*G1/mu # Re*A^0.5
+    A = A_0
+    for _ in range(100):
+        A_new = A_0/API520_Kv(Re_coeff/A**0.5)
+        converged = np.abs(A_new - A) <= 1E-13*A_new
+        if np.all(converged):
+            break
+        A = A_new
+    if not np.all(converged):
+        # Successive substitution crawls at low Reynolds numbers. A*Kv
+        # increases with A, so the area is then bisected in log space between
+        # 0.99*A_0 (Kv < 1/0.9935) and a bound found by expanding upward
+        A_0, Re_coeff, converged = np.broadcast_arrays(A_0, Re_coeff, converged)
+        A_new = np.array(np.broadcast_to(A_new, converged.shape))
+        a_0, c = A_0[~converged], Re_coeff[~converged]
+        err = lambda A: A*API520_Kv(c/A**0.5) - a_0
+        lo, hi = 0.99*a_0, a_0.copy()
+        for _ in range(500):
+            low = err(hi) < 0.
+            if not np.any(low):
+                break
+            hi = np.where(low, 4.*hi, hi)
+        for _ in range(100):
+            mid = (lo*hi)**0.5
+            below = err(mid) < 0.
+            lo, hi = np.where(below, mid, lo), np.where(below, hi, mid)
+        A_new[~converged] = (lo*hi)**0.5
+    # Below the range of the viscosity correction, areas grow without bound
+    A_new = np.where(Re_coeff/A_new**0.5 < 20., np.nan, A_new)
+    return _scalar_or_array(A_new*0.001**2) # convert mm^2 to m^2
+
+
+def API520_omega(rho0, rho9):
+    r'''Calculates the omega parameter of a two-phase or flashing flow, for 
+    use in the API 520 omega method of two-phase relief valve sizing, from 
+    its density at the inlet and after an isentropic flash to 90% of the 
+    inlet pressure.
+
+    .. math::
+        \omega = 9\left(\frac{\rho_0}{\rho_9} - 1\right)
+
+    Parameters
+    ----------
+    rho0 : float or ndarray
+        Two-phase density at the valve inlet, [kg/m^3]
+    rho9 : float or ndarray
+        Two-phase density after flashing isentropically (or isenthalpically) 
+        to 90% of the inlet pressure, [kg/m^3]
+
+    Returns
+    -------
+    omega : float or ndarray
+        Omega parameter [-]
+
+    Examples
+    --------
+    >>> API520_omega(rho0=500., rho9=400.)
+    2.25
+
+    References
+    ----------
+    .. [1] API Standard 520, Part 1 - Sizing and Selection. Annex C.
+    '''
+    return 9.*(rho0/rho9 - 1.)
+
+
+def API520_eta_c(omega):
+    r'''Calculates the critical pressure ratio of a two-phase flow 
+    according to the omega method, with the explicit approximation in [1]_.
+
+    .. math::
+        \eta_c = \left[1 + \left(1.0446 - 0.0093431\omega^{0.5}\right)
+        \omega^{-0.56261}\right]^{-0.70356 + 0.014685\ln\omega}
+
+    Parameters
+    ----------
+    omega : float or ndarray
+        Omega parameter [-]
+
+    Returns
+    -------
+    eta_c : float or ndarray
+        Critical pressure ratio [-]
+
+    Notes
+    -----
+    The approximation matches the implicit relation of [2]_ within about 
+    2% for omega between 0.02 and 100.
+
+    Examples
+    --------
+    >>> API520_eta_c(2.25)
+    0.706355333707817
+
+    References
+    ----------
+    .. [1] API Standard 520, Part 1 - Sizing and Selection. Annex C.
+    .. [2] Leung, J. C. "Easily Size Relief Devices and Piping for Two-Phase
+       Flow." Chemical Engineering Progress 92, no. 12 (1996): 28-50.
+    '''
+    return (1. + (1.0446 - 0.0093431*omega**0.5)*omega**-0.56261)**(
+            -0.70356 + 0.014685*np.log(omega))
+
+
+def API520_A_two_phase(m, P1, P2, rho0, omega, Kd=0.85, Kb=1, Kc=1):
+    r'''Calculates required relief valve area for an API 520 valve passing
+    a two-phase or flashing flow according to the omega method, at either
+    critical or sub-critical flow. Accepts arrays.
+
+    For critical flow (:math:`\eta_a \le \eta_c`):
+
+    .. math::
+        G = \eta_c\sqrt{\frac{P_1\rho_0}{\omega}}
+
+    For sub-critical flow:
+
+    .. math::
+        G = \frac{\sqrt{-2\left[\omega\ln\eta_a + (\omega-1)(1-\eta_a)
+        \right]}\sqrt{P_1\rho_0}}{\omega\left(\frac{1}{\eta_a}-1\right)
+        + 1}
+
+        A = \frac{m}{K_d K_b K_c G}
+
+        \eta_a = \frac{P_2}{P_1}
+
+    Parameters
+    ----------
+    m : float or ndarray
+        Mass flow rate of fluid through the valve, [kg/s]
+    P1 : float or ndarray
+        Upstream relieving pressure; the set pressure plus the allowable
+        overpressure, plus atmospheric pressure, [Pa]
+    P2 : float or ndarray
+        Total backpressure, [Pa]
+    rho0 : float or ndarray
+        Two-phase density at the valve inlet, [kg/m^3]
+    omega : float or ndarray
+        Omega parameter; see :obj:`API520_omega` [-]
+    Kd : float or ndarray, optional
+        The effective coefficient of discharge, from the manufacturer or for
+        preliminary sizing, using 0.85 for two-phase flow as described in 
+        [1]_, []
+    Kb : float or ndarray, optional
+        Correction due to backpressure [-]
+    Kc : float or ndarray, optional
+        Combination correction factor for installation with a rupture disk
+        upstream of the PRV, []
+
+    Returns
+    -------
+    A : float or ndarray
+        Minimum area for relief valve according to [1]_, [m^2]
+
+    Notes
+    -----
+    The critical pressure ratio is calculated with :obj:`API520_eta_c`.
+
+    Examples
+    --------
+    >>> API520_A_two_phase(m=20., P1=1.1E6, P2=101325., rho0=500., omega=2.25)
+    0.0021305795557579037
+
+    References
+    ----------
+    .. [1] API Standard 520, Part 1 - Sizing and Selection. Annex C.
+    .. [2] Leung, J. C. "Easily Size Relief Devices and Piping for Two-Phase
+       Flow." Chemical Engineering Progress 92, no. 12 (1996): 28-50.
+    '''
+    eta_c = API520_eta_c(omega)
+    eta_a = P2/P1
+    G_critical = eta_c*(P1*rho0/omega)**0.5
+    with np.errstate(invalid='ignore'):
+        G_subcritical = ((-2.*(omega*np.log(eta_a) + (omega - 1.)*(1. - eta_a)))**0.5
+                         *(P1*rho0)**0.5/(omega*(1./eta_a - 1.) + 1.))
+    G = np.where(eta_a <= eta_c, G_critical, G_subcritical)
+    return _scalar_or_array(m/(Kd*Kb*Kc*G))
+
+
+def API520_A_l_scenarios(m, rho, mu, Pset, Pback=atm, overpressure=0.1,
+                         Kd=0.65, Kc=1, balanced=False):
+    r'''Sizes API 520 relief valves passing a liquid for many relief 
+    scenarios at once, and selects the API 526 orifice for each, in the same
+    way as :obj:`API520_A_g_scenarios`. The backpressure correction for 
+    balanced valves is calculated as in :obj:`API520_W`. See 
+    :obj:`API520_A_l` for the sizing equations.
+
+    Parameters
+    ----------
+    m : float or ndarray
+        Mass flow rate of liquid through the valve, [kg/s]
+    rho : float or ndarray
+        Density of the liquid at the flowing temperature, [kg/m^3]
+    mu : float or ndarray
+        Viscosity of the liquid at the flowing temperature, [Pa*s]
+    Pset : float or ndarray
+        Set pressure for relief [Pa]
+    Pback : float or ndarray, optional
+        Total backpressure, [Pa]
+    overpressure : float or ndarray, optional
+        The maximum fraction overpressure, []
+    Kd : float or ndarray, optional
+        The effective coefficient of discharge, []
+    Kc : float or ndarray, optional
+        Combination correction factor for installation with a rupture disk
+        upstream of the PRV, []
+    balanced : bool or ndarray, optional
+        Whether or not the valve is a balanced spring-loaded PRV, for which
+        the backpressure correction `Kw` is applied, []
+
+    Returns
+    -------
+    A : ndarray
+        Minimum area for relief valve according to [1]_, [m^2]
+    A_API526 : ndarray
+        Area of the selected API 526 orifice, [m^2]
+    letters : ndarray
+        Letter designation of the selected API 526 orifice, [-]
+
+    Notes
+    -----
+    Scenarios with a percent gauge backpressure on a balanced valve over 50%
+    have a required area of NaN.
+
+    Examples
+    --------
+    >>> A, A_API526, letters = API520_A_l_scenarios(m=100., rho=900., mu=0.1,
+    ... Pset=(1.1E6-atm)/1.1 + atm)
+    >>> A, str(letters)
+    (0.003682269993825028, 'P')
+
+    References
+    ----------
+    .. [1] API Standard 520, Part 1 - Sizing and Selection.
+    '''
+    m, rho, mu, Pset, Pback, overpressure, Kd, Kc, balanced = np.broadcast_arrays(
+        *[np.asarray(i, dtype=float) for i in (m, rho, mu, Pset, Pback, 
+                                                overpressure, Kd, Kc, balanced)])
+    Kw = np.where(balanced != 0, _API520_W_array(Pset, Pback), 1.)
+    P1 = (Pset - atm)*(1. + overpressure) + atm
+    A = API520_A_l(m, rho, mu, P1, Pback, Kd=Kd, Kw=Kw, Kc=Kc)
+    A_API526, letters = _API526_select(A)
+    return A, A_API526, letters
+
+
+def API520_A_two_phase_scenarios(m, rho0, omega, Pset, Pback=atm, 
+                                 overpressure=0.1, Kd=0.85, Kc=1, 
+                                 balanced=False):
+    r'''Sizes API 520 relief valves passing a two-phase or flashing flow
+    for many relief scenarios at once with the omega method, and selects the 
+    API 526 orifice for each, in the same way as 
+    :obj:`API520_A_g_scenarios`. See :obj:`API520_A_two_phase` for the 
+    sizing equations.
+
+    Parameters
+    ----------
+    m : float or ndarray
+        Mass flow rate of fluid through the valve, [kg/s]
+    rho0 : float or ndarray
+        Two-phase density at the valve inlet, [kg/m^3]
+    omega : float or ndarray
+        Omega parameter; see :obj:`API520_omega` [-]
+    Pset : float or ndarray
+        Set pressure for relief [Pa]
+    Pback : float or ndarray, optional
+        Total backpressure, [Pa]
+    overpressure : float or ndarray, optional
+        The maximum fraction overpressure; one of 0.1, 0.16, or 0.21 for
+        balanced valves, []
+    Kd : float or ndarray, optional
+        The effective coefficient of discharge, []
+    Kc : float or ndarray, optional
+        Combination correction factor for installation with a rupture disk
+        upstream of the PRV, []
+    balanced : bool or ndarray, optional
+        Whether or not the valve is a balanced spring-loaded PRV, for which
+        the vapor backpressure correction `Kb` of :obj:`API520_B` is 
+        applied, []
+
+    Returns
+    -------
+    A : ndarray
+        Minimum area for relief valve according to [1]_, [m^2]
+    A_API526 : ndarray
+        Area of the selected API 526 orifice, [m^2]
+    letters : ndarray
+        Letter designation of the selected API 526 orifice, [-]
+
+    Examples
+    --------
+    >>> A, A_API526, letters = API520_A_two_phase_scenarios(m=20., rho0=500.,
+    ... omega=2.25, Pset=(1.1E6-atm)/1.1 + atm)
+    >>> A, str(letters)
+    (0.0021305795557579037, 'M')
+
+    References
+    ----------
+    .. [1] API Standard 520, Part 1 - Sizing and Selection. Annex C.
+    '''
+    m, rho0, omega, Pset, Pback, overpressure, Kd, Kc, balanced = np.broadcast_arrays(
+        *[np.asarray(i, dtype=float) for i in (m, rho0, omega, Pset, Pback, 
+                                                overpressure, Kd, Kc, balanced)])
+    Kb = _API520_B_array(Pset, Pback, overpressure, balanced != 0)
+    P1 = (Pset - atm)*(1. + overpressure) + atm
+    A = API520_A_two_phase(m, P1, Pback, rho0, omega, Kd=Kd, Kb=Kb, Kc=Kc)
+    A_API526, letters = _API526_select(A)
+    return A, A_API526, letters
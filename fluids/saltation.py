@@ -21,10 +21,14 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.'''
 
 from __future__ import division
+import numpy as np
 from scipy.constants import g, pi
+from fluids.drag import drag_sphere, v_terminal
+from fluids.friction import _friction_factor_array
+from fluids.numerics import _scalar_or_array
 
 __all__ = ['Rizk', 'Matsumoto_1974', 'Matsumoto_1975', 'Matsumoto_1977',
-'Schade', 'Weber_saltation', 'Geldart_Ling']
+'Schade', 'Weber_saltation', 'Geldart_Ling', 'PneumaticConveying']
 
 
 def Rizk(mp, dp, rhog, D):
@@ -290,18 +294,16 @@ def Matsumoto_1977(mp, rhop, dp, rhog, D, Vterminal=1):
     '''
     limit = 1.39*D*(rhop/rhog)**-0.74
     A = pi/4*D**2
-    if limit < dp:
-        # Coarse routine
-        Frp = Vterminal/(g*dp)**0.5
-        Frs_sorta = 1./(g*D)**0.5
-        expression1 = 0.373*(rhop/rhog)**1.06*(Frp/10.)**-3.7*(Frs_sorta/10.)**3.61
-        expression2 = mp/rhog/A
-        return (expression2/expression1)**(1/4.61)
-    else:
-        Frs_sorta = 1./(g*D)**0.5
-        expression1 = 5560*(dp/D)**1.43*(Frs_sorta/10.)**4
-        expression2 = mp/rhog/A
-        return (expression2/expression1)**(0.2)
+    Frs_sorta = 1./(g*D)**0.5
+    expression2 = mp/rhog/A
+    # Coarse routine
+    Frp = Vterminal/(g*dp)**0.5
+    expression1 = 0.373*(rhop/rhog)**1.06*(Frp/10.)**-3.7*(Frs_sorta/10.)**3.61
+    V_coarse = (expression2/expression1)**(1/4.61)
+    # Fine routine
+    expression1 = 5560*(dp/D)**1.43*(Frs_sorta/10.)**4
+    V_fine = (expression2/expression1)**(0.2)
+    return _scalar_or_array(np.where(limit < dp, V_coarse, V_fine))
 
 
 def Schade(mp, rhop, dp, rhog, D):
@@ -441,13 +443,10 @@ def Weber_saltation(mp, rhop, dp, rhog, D, Vterminal=4):
        Journal of Chemical Engineering 31, no. 1 (March 2014): 35-46.
        doi:10.1590/S0104-66322014000100005
     '''
-    if Vterminal <= 3:
-        term1 = (7 + 8/3.*Vterminal)*(dp/D)**0.1
-    else:
-        term1 = 15.*(dp/D)**0.1
+    term1 = np.where(Vterminal <= 3, 7 + 8/3.*Vterminal, 15.)*(dp/D)**0.1
     term2 = 1./(g*D)**0.5
     term3 = mp/rhog/(pi/4*D**2)
-    return (term1/term2*term3**0.25)**(1/1.25)
+    return _scalar_or_array((term1/term2*term3**0.25)**(1/1.25))
 
 
 def Geldart_Ling(mp, rhog, D, mug):
@@ -509,8 +508,200 @@ def Geldart_Ling(mp, rhog, D, mug):
        doi:10.1590/S0104-66322014000100005
     '''
     Gs = mp/(pi/4*D**2)
-    if Gs/D <= 47000:
-        return 1.5*Gs**0.465*D**-0.01*mug**0.055*rhog**-0.42
-    else:
-        return 8.7*Gs**0.302*D**0.153*mug**0.055*rhog**-0.42
+    V = np.where(Gs/D <= 47000, 1.5*Gs**0.465*D**-0.01, 8.7*Gs**0.302*D**0.153)
+    return _scalar_or_array(V*mug**0.055*rhog**-0.42)
+
+
+_saltation_methods = {
+    'Rizk': lambda mp, rhop, dp, rhog, D, mug, Vt: Rizk(mp, dp, rhog, D),
+    'Matsumoto_1974': lambda mp, rhop, dp, rhog, D, mug, Vt: Matsumoto_1974(mp, rhop, dp, rhog, D, Vt),
+    'Matsumoto_1975': lambda mp, rhop, dp, rhog, D, mug, Vt: Matsumoto_1975(mp, rhop, dp, rhog, D, Vt),
+    'Matsumoto_1977': lambda mp, rhop, dp, rhog, D, mug, Vt: Matsumoto_1977(mp, rhop, dp, rhog, D, Vt),
+    'Schade': lambda mp, rhop, dp, rhog, D, mug, Vt: Schade(mp, rhop, dp, rhog, D),
+    'Weber_saltation': lambda mp, rhop, dp, rhog, D, mug, Vt: Weber_saltation(mp, rhop, dp, rhog, D, Vt),
+    'Geldart_Ling': lambda mp, rhop, dp, rhog, D, mug, Vt: Geldart_Ling(mp, rhog, D, mug)}
+
+
+class PneumaticConveying(object):
+    r'''Class representing dilute phase pneumatic conveying lines, with a
+    horizontal run followed by a vertical lift, according to the method of
+    [1]_. The inputs may be arrays or floats, which are broadcast together,
+    so a whole grid of solids loadings, particle sizes and pipe diameters is
+    evaluated in one call. All parameters are also attributes.
+
+    The gas velocity is, unless specified, `V_ratio` times the saltation
+    velocity from the chosen correlation. The particle velocity in the
+    horizontal run is from the correlation of Hinkle, and in the vertical
+    lift it is the gas velocity less the terminal velocity; the voidages
+    follow from the solids mass balance. The pressure drop is the sum of:
+
+    .. math::
+        \Delta P_{acc} = \frac{1}{2}\rho_f\epsilon U_f^2
+        + \frac{1}{2}\rho_p(1-\epsilon)U_p^2
+
+        \Delta P_{f,gas} = \frac{f_d\rho_f\epsilon U_f^2 L}{2D}
+
+        \Delta P_{f,solids,horizontal} = \frac{2 f_p(1-\epsilon)\rho_p U_p^2
+        L}{D};\; f_p = \frac{3}{8}\frac{\rho_f}{\rho_p}\frac{D}{d_p}C_D
+        \left(\frac{U_f - U_p}{U_p}\right)^2
+
+        \Delta P_{f,solids,vertical} = 0.057 G H\sqrt{\frac{g}{D}}
+
+        \Delta P_{gravity} = [\rho_p(1-\epsilon) + \rho_f\epsilon]gH
+
+        U_p = U_f(1 - 0.0638d_p^{0.3}\rho_p^{0.5})
+
+    Parameters
+    ----------
+    mp : float or ndarray
+        Solid mass flow rate, [kg/s]
+    dp : float or ndarray
+        Particle diameter, [m]
+    rhop : float or ndarray
+        Particle density, [kg/m^3]
+    rhog : float or ndarray
+        Gas density, [kg/m^3]
+    mug : float or ndarray
+        Gas viscosity, [Pa*s]
+    D : float or ndarray
+        Diameter of pipe, [m]
+    L : float or ndarray, optional
+        Length of the horizontal run, [m]
+    H : float or ndarray, optional
+        Height of the vertical lift, [m]
+    roughness : float or ndarray, optional
+        Roughness of the pipe wall, [m]
+    V : float or ndarray, optional
+        Superficial gas velocity; if not given, `V_ratio` times the saltation
+        velocity, [m/s]
+    V_ratio : float or ndarray, optional
+        Ratio of the gas velocity to the saltation velocity, [-]
+    Vterminal : float or ndarray, optional
+        Terminal velocity of the particles in the gas; calculated with
+        `v_terminal` if not given, [m/s]
+    saltation_method : str, optional
+        Name of the saltation velocity correlation; one of 'Rizk',
+        'Matsumoto_1974', 'Matsumoto_1975', 'Matsumoto_1977', 'Schade',
+        'Weber_saltation' or 'Geldart_Ling'
+    Method : str, optional
+        A string of the drag correlation to use, as in the dictionary
+        drag_sphere_correlations
+
+    Attributes
+    ----------
+    V_salt : ndarray
+        Saltation velocity of the gas, [m/s]
+    loading : ndarray
+        Ratio of the mass flow of solids to that of gas, [-]
+    Re : ndarray
+        Reynolds number of the gas with the superficial velocity, [-]
+    fd : ndarray
+        Darcy friction factor of the gas, [-]
+    voidage : ndarray
+        Voidage in the horizontal run, [-]
+    Uf : ndarray
+        Interstitial gas velocity in the horizontal run, [m/s]
+    Up : ndarray
+        Particle velocity in the horizontal run, [m/s]
+    Cd : ndarray
+        Drag coefficient of the particles in the horizontal run, [-]
+    voidage_vertical : ndarray
+        Voidage in the vertical lift, [-]
+    Uf_vertical : ndarray
+        Interstitial gas velocity in the vertical lift, [m/s]
+    Up_vertical : ndarray
+        Particle velocity in the vertical lift, [m/s]
+    dP_acceleration : ndarray
+        Pressure drop accelerating the gas and solids from rest, [Pa]
+    dP_gas_friction : ndarray
+        Pressure drop from gas to wall friction in the line, [Pa]
+    dP_solids_friction : ndarray
+        Pressure drop from solids to wall friction in the line, [Pa]
+    dP_gravity : ndarray
+        Pressure drop lifting the gas and solids, [Pa]
+    dP : ndarray
+        Total pressure drop of the line, [Pa]
 
+    Notes
+    -----
+    Particles whose velocity from Hinkle's correlation would not be positive
+    give NaN results. Bends, and the re-acceleration of the solids after
+    them, are not included.
+
+    Examples
+    --------
+    >>> line = PneumaticConveying(mp=0.25, dp=100E-6, rhop=2500., rhog=1.2,
+    ...                           mug=1.8E-5, D=np.array([0.078, 0.1]), L=50., H=10.)
+    >>> line.V_salt
+    array([ 9.88330928,  9.42168012])
+    >>> line.dP
+    array([ 22634.1823439 ,  13772.09655499])
+
+    References
+    ----------
+    .. [1] Rhodes, Martin J. Introduction to Particle Technology. Wiley, 2013.
+    '''
+    __slots__ = ('mp', 'dp', 'rhop', 'rhog', 'mug', 'D', 'L', 'H', 'roughness',
+                 'V', 'V_ratio', 'Vterminal', 'saltation_method', 'Method',
+                 'A', 'G', 'V_salt', 'loading', 'Re', 'fd', 'voidage', 'Uf',
+                 'Up', 'Cd', 'voidage_vertical', 'Uf_vertical', 'Up_vertical',
+                 'dP_acceleration', 'dP_gas_friction', 'dP_solids_friction',
+                 'dP_gravity', 'dP')
+
+    def __init__(self, mp, dp, rhop, rhog, mug, D, L=0., H=0., roughness=0.,
+                 V=None, V_ratio=1.5, Vterminal=None, saltation_method='Rizk',
+                 Method=None):
+        if saltation_method not in _saltation_methods:
+            raise Exception('Saltation method not recognized')
+        given = [np.asarray(i, dtype=float) for i in (mp, dp, rhop, rhog, mug,
+                 D, L, H, roughness, V_ratio) + tuple(i for i in (V, Vterminal) if i is not None)]
+        shape = np.broadcast(*given).shape
+        mp, dp, rhop, rhog, mug, D, L, H, roughness, V_ratio = [
+            np.array(np.broadcast_to(i, shape)) for i in given[:10]]
+        self.mp, self.dp, self.rhop, self.rhog, self.mug = mp, dp, rhop, rhog, mug
+        self.D, self.L, self.H, self.roughness = D, L, H, roughness
+        self.V_ratio = V_ratio
+        self.saltation_method, self.Method = saltation_method, Method
+
+        if Vterminal is None:
+            Vterminal = v_terminal(dp.ravel(), rhop.ravel(), rhog.ravel(),
+                                   mug.ravel(), Method=Method).reshape(shape)
+        self.Vterminal = Vterminal = np.array(np.broadcast_to(Vterminal, shape), dtype=float)
+        self.V_salt = _saltation_methods[saltation_method](mp, rhop, dp, rhog, D, mug, Vterminal)
+        if V is None:
+            V = V_ratio*self.V_salt
+        self.V = V = np.array(np.broadcast_to(V, shape), dtype=float)
+
+        self.A = A = 0.25*pi*D*D
+        self.G = G = mp/A
+        self.loading = G/(rhog*V)
+        self.Re = rhog*V*D/mug
+        self.fd = fd = _friction_factor_array(self.Re, roughness/D)
+
+        # Horizontal run; with Up = slip*Uf and Uf = V/voidage, the solids mass
+        # balance G = rhop*(1 - voidage)*Up gives the voidage directly
+        slip = 1. - 0.0638*dp**0.3*rhop**0.5
+        slip = np.where(slip > 0., slip, np.nan)
+        self.voidage = voidage = 1./(1. + G/(rhop*slip*V))
+        self.Uf = Uf = V/voidage
+        self.Up = Up = slip*Uf
+        self.Cd = Cd = drag_sphere(rhog*(Uf - Up)*dp/mug, Method=Method)
+        fp = 0.375*rhog/rhop*D/dp*Cd*((Uf - Up)/Up)**2
+        dP_gas_h = fd*rhog*voidage*Uf*Uf*L/(2.*D)
+        dP_solids_h = 2.*fp*(1. - voidage)*rhop*Up*Up*L/D
+
+        # Vertical lift; Up = Uf - Vterminal, so the mass balance is a
+        # quadratic in the voidage, of which this is the root below one
+        b = V + Vterminal + G/rhop
+        self.voidage_vertical = voidage_v = 2.*V/(b + np.sqrt(b*b - 4.*Vterminal*V))
+        self.Uf_vertical = Uf_v = V/voidage_v
+        self.Up_vertical = Uf_v - Vterminal
+        dP_gas_v = fd*rhog*voidage_v*Uf_v*Uf_v*H/(2.*D)
+        dP_solids_v = 0.057*G*H*(g/D)**0.5
+
+        self.dP_acceleration = 0.5*rhog*voidage*Uf*Uf + 0.5*rhop*(1. - voidage)*Up*Up
+        self.dP_gas_friction = dP_gas_h + dP_gas_v
+        self.dP_solids_friction = dP_solids_h + dP_solids_v
+        self.dP_gravity = (rhop*(1. - voidage_v) + rhog*voidage_v)*g*H
+        self.dP = (self.dP_acceleration + self.dP_gas_friction
+                   + self.dP_solids_friction + self.dP_gravity)
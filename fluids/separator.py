@@ -21,13 +21,17 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.'''
 
 from __future__ import division
-from math import log, exp, pi
+from math import pi
+import numpy as np
 from scipy.constants import g
 from scipy.interpolate import UnivariateSpline
 from scipy.constants import foot, psi
+from fluids.geometry import V_from_h, a_torispherical
+from fluids.numerics import _scalar_or_array
 
 __all__ = ['v_Sounders_Brown', 'K_separator_Watkins',
-           'K_separator_demister_York', 'K_Sounders_Brown_theoretical']
+           'K_separator_demister_York', 'K_Sounders_Brown_theoretical',
+           'size_separators']
 
 
 # 92 points taken from a 2172x3212 page scan, after dewarping the scan,
@@ -104,13 +108,13 @@ def K_separator_Watkins(x, rhol, rhog, horizontal=False, method='spline'):
 
     Parameters
     ----------
-    x : float
+    x : float or ndarray
         Quality of fluid entering separator, [-]
-    rhol : float
+    rhol : float or ndarray
         Density of liquid phase [kg/m^3]
-    rhog : float
+    rhog : float or ndarray
         Density of gas phase [kg/m^3]
-    horizontal : bool, optional
+    horizontal : bool or ndarray, optional
         Whether to use the vertical or horizontal value; horizontal is 1.25 
         higher
     method : str
@@ -118,7 +122,7 @@ def K_separator_Watkins(x, rhol, rhog, horizontal=False, method='spline'):
 
     Returns
     -------
-    K : float
+    K : float or ndarray
         Sounders Brown horizontal or vertical `K` factor for two-phase 
         separator design only, [m/s]
 
@@ -130,6 +134,8 @@ def K_separator_Watkins(x, rhol, rhog, horizontal=False, method='spline'):
     No limits checking is enforced. However, the x-axis spans only 0.006 to
     5.4, and the function should not be used outside those limits.
 
+    For arrays, the spline is evaluated at all of the points in one call.
+
     Examples
     --------
     >>> K_separator_Watkins(0.88, 985.4, 1.3, horizontal=True)
@@ -146,30 +152,30 @@ def K_separator_Watkins(x, rhol, rhog, horizontal=False, method='spline'):
     '''
     factor = (1. - x)/x*(rhog/rhol)**0.5
     if method == 'spline':
-        K = float(Watkins_interp(factor))
+        K = Watkins_interp(factor)
     elif method == 'blackwell':
-        X = log(factor)    
+        X = np.log(factor)
         A = -1.877478097
         B = -0.81145804597
         C = -0.1870744085
         D = -0.0145228667
         E = -0.00101148518
-        K = exp(A + X*(B + X*(C + X*(D + E*X))))
+        K = np.exp(A + X*(B + X*(C + X*(D + E*X))))
     elif method == 'branan':
-        X = log(factor)
+        X = np.log(factor)
         A = -1.942936
         B = -0.814894
         C = -0.179390
         D = -0.0123790
         E = 0.000386235
         F = 0.000259550
-        K = exp(A + X*(B + X*(C + X*(D + X*(E + F*X)))))
+        K = np.exp(A + X*(B + X*(C + X*(D + X*(E + F*X)))))
     else:
         raise Exception("Only methods 'spline', 'branan', and 'blackwell' are supported.")
-    K *= foot # Converts units of ft/s to m/s; the graph and all fits are in ft/s 
-    if horizontal:
-        K *= 1.25 # Watkins recommends a factor of 1.25 for horizontal separators over vertical separators
-    return K
+    K = K*foot # Converts units of ft/s to m/s; the graph and all fits are in ft/s 
+    # Watkins recommends a factor of 1.25 for horizontal separators over vertical separators
+    K = np.where(horizontal, K*1.25, K)
+    return _scalar_or_array(K)
 
 
 def K_separator_demister_York(P, horizontal=False):
@@ -197,15 +203,15 @@ def K_separator_demister_York(P, horizontal=False):
 
     Parameters
     ----------
-    P : float
+    P : float or ndarray
         Pressure of separator, [Pa]
-    horizontal : bool, optional
+    horizontal : bool or ndarray, optional
         Whether to use the vertical or horizontal value; horizontal is 1.25 
         times higher, [-]
 
     Returns
     -------
-    K : float
+    K : float or ndarray
         Sounders Brown Horizontal or vertical `K` factor for two-phase
         seperator design with a demister, [m/s]
 
@@ -228,25 +234,18 @@ def K_separator_demister_York(P, horizontal=False):
        1993): 53-60.
     '''
     P = P/psi # Correlation in terms of psia
-    if P < 15:
-        if P < 1: 
-            P = 1 # Prevent negative K values, but as a consequence be  
-            # optimistic for K values; limit is 0.185 ft/s but real values
-            # should probably be lower
-        K = 0.1821 + 0.0029*P + 0.0460*log(P)
-    elif P < 40:
-        K = 0.35
-    else:
-        if P > 5500:
-            P = 5500 # Do not allow for lower K values above 5500 psia, as
-            # the limit is stated to be 5500
-        K = 0.430 - 0.023*log(P)
-    K *= foot # Converts units of ft/s to m/s; the graph and all fits are in ft/s 
-    if horizontal:
-        # Watkins recommends a factor of 1.25 for horizontal separators over 
-        # vertical separators as well
-        K *= 1.25 
-    return K
+    # Under 1 psia, prevent negative K values, but as a consequence be
+    # optimistic for K values; limit is 0.185 ft/s but real values should
+    # probably be lower. Do not allow for lower K values above 5500 psia, as
+    # the limit is stated to be 5500
+    P = np.clip(P, 1., 5500.)
+    K = np.where(P < 15, 0.1821 + 0.0029*P + 0.0460*np.log(P),
+                 np.where(P < 40, 0.35, 0.430 - 0.023*np.log(P)))
+    K = K*foot # Converts units of ft/s to m/s; the graph and all fits are in ft/s 
+    # Watkins recommends a factor of 1.25 for horizontal separators over 
+    # vertical separators as well
+    K = np.where(horizontal, K*1.25, K)
+    return _scalar_or_array(K)
 
 
 def v_Sounders_Brown(K, rhol, rhog):
@@ -261,16 +260,16 @@ def v_Sounders_Brown(K, rhol, rhog):
         
     Parameters
     ----------
-    K : float
+    K : float or ndarray
         Sounders Brown `K` factor for two-phase separator design, [m/s]
-    rhol : float
+    rhol : float or ndarray
         Density of liquid phase [kg/m^3]
-    rhog : float
+    rhog : float or ndarray
         Density of gas phase [kg/m^3]
 
     Returns
     -------
-    v_max : float
+    v_max : float or ndarray
         Maximum allowable vapor velocity in a two-phase separator to permit 
         separation between entrained droplets and the gas, [m/s]
 
@@ -380,4 +379,158 @@ def K_Sounders_Brown_theoretical(D, Cd, g=g):
        within the Right Limits" Chemical Engineering Progress, (October 1, 
        1993): 53-60.
     '''
-    return (4.0*g*D/(3.0*Cd))**0.5
\ No newline at end of file
+    return (4.0*g*D/(3.0*Cd))**0.5
+
+
+def size_separators(mg, ml, rhog, rhol, P=None, horizontal=False,
+                    demister=False, t_retention=300., L_over_D=3.,
+                    h_fraction=0.5, heads='ellipsoidal', a_ratio=0.25,
+                    f=1., k=0.06, method='spline'):
+    r'''Sizes two-phase separators for arrays of cases at once. The maximum
+    allowable gas velocity of each is found from its Sounders-Brown `K`
+    factor, with `K_separator_Watkins` or, for separators with a demister,
+    `K_separator_demister_York`, and `v_Sounders_Brown`. The vessels have a
+    fixed ratio of length to diameter and two identical heads, and their
+    diameter is the larger of those needed for the gas and for the liquid:
+
+        * The gas must flow no faster than the maximum velocity; upward
+          through the whole cross section of vertical separators, and
+          through the vapor space above the normal liquid level of
+          horizontal ones.
+        * The liquid held below the normal liquid level must be at least
+          the liquid flow times the retention time.
+
+    All the inputs except `P` (if not needed), `heads`, `a_ratio`, `f`, `k`
+    and `method` may be arrays, which are broadcast together.
+
+    Parameters
+    ----------
+    mg : float or ndarray
+        Mass flow rate of gas, [kg/s]
+    ml : float or ndarray
+        Mass flow rate of liquid, [kg/s]
+    rhog : float or ndarray
+        Density of gas phase [kg/m^3]
+    rhol : float or ndarray
+        Density of liquid phase [kg/m^3]
+    P : float or ndarray, optional
+        Pressure of separator; needed for those with a demister, [Pa]
+    horizontal : bool or ndarray, optional
+        Whether each separator is horizontal or vertical, [-]
+    demister : bool or ndarray, optional
+        Whether each separator has a demister, [-]
+    t_retention : float or ndarray, optional
+        Retention time of the liquid below the normal liquid level, [s]
+    L_over_D : float or ndarray, optional
+        Ratio of length of the cylindrical section to the diameter, [-]
+    h_fraction : float or ndarray, optional
+        Normal liquid level as a fraction of the height of the vessel,
+        including its heads for vertical separators, [-]
+    heads : str, optional
+        Type of both heads of the vessels; one of [None, 'conical',
+        'ellipsoidal', 'spherical', 'torispherical'], as in `TANK`
+    a_ratio : float, optional
+        Ratio of the depth of the heads to the diameter; not used for
+        torispherical heads, whose depth follows from `f` and `k`, [-]
+    f : float, optional
+        Dish-radius parameter of torispherical heads; fD = dish radius, [-]
+    k : float, optional
+        Knuckle-radius parameter of torispherical heads; kD = knuckle
+        radius, [-]
+    method : str, optional
+        Method of `K_separator_Watkins` for separators without a demister;
+        one of 'spline, 'blackwell', or 'branan'
+
+    Returns
+    -------
+    K : float or ndarray
+        Sounders Brown `K` factor of each separator, [m/s]
+    v_max : float or ndarray
+        Maximum allowable gas velocity in each separator, [m/s]
+    D : float or ndarray
+        Diameter of the cylindrical section of each separator, [m]
+    L : float or ndarray
+        Length of the cylindrical section of each separator, [m]
+    V_liquid : float or ndarray
+        Volume of liquid held at the normal liquid level, [m^3]
+
+    Notes
+    -----
+    At a fixed ratio of length to diameter, the liquid volume at the normal
+    level is proportional to :math:`D^3`, so the diameter needed for the
+    liquid follows directly from that volume in a vessel of unit diameter.
+    Volumes are those of `V_from_h`, as in `TANK`.
+
+    The fraction of the cross section of a horizontal separator filled with
+    liquid at a level :math:`h = fD` is:
+
+    .. math::
+        \frac{\theta - \sin\theta}{2\pi};\; \theta = 2\arccos(1 - 2f)
+
+    No allowance is made for inlet devices, or for the minimum heights of
+    vertical separators above the liquid level; diameters are not rounded.
+
+    Examples
+    --------
+    >>> K, v_max, D, L, V_liquid = size_separators(mg=10., ml=np.array([1., 4.]),
+    ...     rhog=20., rhol=800., horizontal=np.array([False, True]))
+    >>> v_max
+    array([ 0.72073839,  1.03586504])
+    >>> D
+    array([ 0.93983417,  1.108673  ])
+    >>> V_liquid
+    array([ 1.08665662,  1.78381185])
+
+    References
+    ----------
+    .. [1] Svrcek, W. Y., and W. D. Monnery. "Design Two-Phase Separators
+       within the Right Limits" Chemical Engineering Progress, (October 1,
+       1993): 53-60.
+    '''
+    given = [np.asarray(i, dtype=float) for i in (mg, ml, rhog, rhol, horizontal,
+             demister, t_retention, L_over_D, h_fraction)]
+    shape = np.broadcast(*given).shape
+    (mg, ml, rhog, rhol, horizontal, demister, t_retention, L_over_D,
+     h_fraction) = [np.broadcast_to(i, shape) for i in given]
+    horizontal, demister = horizontal.astype(bool), demister.astype(bool)
+
+    K = K_separator_Watkins(mg/(mg + ml), rhol, rhog, horizontal, method)
+    if np.any(demister):
+        if P is None:
+            raise Exception('Pressure is required for separators with a demister')
+        K = np.where(demister, K_separator_demister_York(np.broadcast_to(P, shape), horizontal), K)
+    K = np.array(np.broadcast_to(K, shape))
+    v_max = v_Sounders_Brown(K, rhol, rhog)
+
+    # Gas capacity; horizontal separators only have the vapor space above
+    # the liquid for the gas
+    theta = 2.*np.arccos(1. - 2.*h_fraction)
+    A_gas_fraction = np.where(horizontal, 1. - (theta - np.sin(theta))/(2.*pi), 1.)
+    D_gas = (4.*mg/(rhog*v_max*pi*A_gas_fraction))**0.5
+
+    # Liquid capacity, from the liquid held in a vessel of unit diameter
+    if heads == 'torispherical':
+        a = a_torispherical(1., f, k)
+    else:
+        a = a_ratio if heads is not None else 0.
+        f = k = None
+    V_unit = _V_liquid_separators(h_fraction, 1., L_over_D, horizontal, heads,
+                                  a, f, k)
+    D_liquid = (ml/rhol*t_retention/V_unit)**(1/3.)
+
+    D = np.maximum(D_gas, D_liquid)
+    L = L_over_D*D
+    V_liquid = _V_liquid_separators(h_fraction, D, L, horizontal, heads, a*D,
+                                    f, k)
+    return (_scalar_or_array(K), _scalar_or_array(v_max), _scalar_or_array(D),
+            _scalar_or_array(L), _scalar_or_array(V_liquid))
+
+
+def _V_liquid_separators(h_fraction, D, L, horizontal, heads, a, f, k):
+    # Liquid volume at the normal level of arrays of horizontal and vertical
+    # vessels with two identical heads
+    V_horizontal = V_from_h(h_fraction*D, D, L, True, heads, heads, a, a,
+                            f, k, f, k)
+    V_vertical = V_from_h(h_fraction*(L + 2.*a), D, L, False, heads, heads,
+                          a, a, f, k, f, k)
+    return np.where(horizontal, V_horizontal, V_vertical)
@@ -0,0 +1,376 @@
+# -*- coding: utf-8 -*-
+'''Chemical Engineering Design Library (ChEDL). Utilities for process modeling.
+Copyright (C) 2017 Caleb Bell <Caleb.Andrew.Bell@gmail.com>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.'''
+
+from __future__ import division
+from math import pi
+import numpy as np
+from numpy.polynomial.chebyshev import chebder
+from scipy.constants import g
+from fluids.core import dP_from_K
+from fluids.geometry import (_chebval_tanks, _stack_coefficients,
+                             _tank_chebyshev_coefficients)
+
+__all__ = ['TankTransient']
+
+
+# Constants of the Rosenbrock 2(3) pair of Shampine and Reichelt (ode23s)
+_ROS_D = 1.0/(2.0 + 2.0**0.5)
+_ROS_E32 = 6.0 + 2.0**0.5
+
+
+class TankTransient(object):
+    r'''Class for simulating the level of liquid in many tanks at once as they
+    drain by gravity through an outlet, are pumped out, and are filled.
+    The volume of liquid in each tank is integrated:
+
+    .. math::
+        \frac{dV}{dt} = Q_{in} - Q_{pump} - Q_{out}(h)
+
+    The gravity outflow is that of an outlet line of total loss coefficient
+    `K_outlet`, with the flow stopping if the driving pressure reverses:
+
+    .. math::
+        \rho g (h + z_{outlet}) + \Delta P_{outlet} = \frac{1}{2}K_{outlet}
+        \rho V_{outlet}^2
+
+    Levels are calculated from volumes with the Chebyshev approximators of
+    each tank (see :obj:`fluids.geometry.TANK.set_chebyshev_approximators`),
+    which are evaluated for every tank in a single array operation; tanks
+    which already have approximators use them, and the others are fit once
+    per geometry.
+
+    Parameters
+    ----------
+    tanks : list[TANK]
+        Tanks to simulate; the same tank may appear more than once, for
+        different scenarios, [-]
+    D_outlet : float or ndarray, optional
+        Inside diameter of the gravity outlet of each tank; 0 for no outlet,
+        [m]
+    K_outlet : float or ndarray, optional
+        Total loss coefficient of the outlet line, including its entrance and
+        exit, on the basis of `D_outlet`, [-]
+    z_outlet : float or ndarray, optional
+        Height of the bottom of each tank above the discharge of its outlet,
+        [m]
+    dP_outlet : float or ndarray, optional
+        Pressure above the liquid less the pressure at the discharge of the
+        outlet, [Pa]
+    Q_in : float, ndarray or callable, optional
+        Flow rate of liquid into each tank; or a function of time returning
+        it, [m^3/s]
+    Q_pump : float, ndarray or callable, optional
+        Flow rate of liquid pumped out of each tank; or a function of time
+        returning it, [m^3/s]
+    rho : float or ndarray, optional
+        Density of the liquid, [kg/m^3]
+    deg_forward : int, optional
+        Degree of the volume from height series fit to tanks without one, [-]
+    deg_backwards : int, optional
+        Degree of the height from volume series fit to tanks without one, [-]
+
+    Attributes
+    ----------
+    N : int
+        Number of tanks, [-]
+    V_total : ndarray
+        Total volume of each tank, [m^3]
+    h_max : ndarray
+        Height of each tank, [m]
+    A_outlet : ndarray
+        Flow area of each outlet, [m^2]
+
+    Notes
+    -----
+    A tank which empties stays empty, with its outflows limited to its
+    inflow; a tank which fills stays full, with the excess inflow spilled.
+    The times at which this first happens are found to within the
+    tolerance of the integration.
+
+    Levels are as accurate as the height from volume series; ~1E-4 of the
+    tank height at the default degree for horizontal tanks. Vertical tanks
+    are poorer near the apexes of their heads, by up to ~0.5% of the tank
+    height with conical heads. Levels can be recalculated rigorously from
+    the integrated volumes with :obj:`fluids.geometry.TankFleet.h_from_V`.
+
+    Examples
+    --------
+    Draining a vertical tank through a short 50 mm line:
+
+    >>> from fluids.geometry import TANK
+    >>> T = TANK(D=1.2, L=4, horizontal=False)
+    >>> sim = TankTransient([T], D_outlet=0.05, K_outlet=1.5)
+    >>> V, h, t_empty, t_full = sim.simulate(t=[0., 120., 600.], h0=3.)
+    >>> h[:, 0]
+    array([ 3.        ,  1.83704024,  0.        ])
+    >>> t_empty
+    array([ 551.84729744])
+    '''
+    def __repr__(self): # pragma: no cover
+        return '<TankTransient of %d tanks>' %(self.N)
+
+    def __init__(self, tanks, D_outlet=0., K_outlet=1., z_outlet=0.,
+                 dP_outlet=0., Q_in=0., Q_pump=0., rho=1000.,
+                 deg_forward=50, deg_backwards=200):
+        self.tanks = list(tanks)
+        self.N = N = len(self.tanks)
+        c_forward, c_backward = _tank_chebyshev_coefficients(self.tanks,
+                                                             deg_forward,
+                                                             deg_backwards)
+        self.c_forward = _stack_coefficients(c_forward)
+        self.c_backward = _stack_coefficients(c_backward)
+        self.c_backward_der = _stack_coefficients([chebder(c) for c in c_backward])
+        self.V_total = np.array([T.V_total for T in self.tanks], dtype=float)
+        self.h_max = np.array([T.h_max for T in self.tanks], dtype=float)
+
+        self.A_outlet = 0.25*pi*np.asarray(D_outlet, dtype=float)**2 + np.zeros(N)
+        self.z_outlet = np.asarray(z_outlet, dtype=float) + np.zeros(N)
+        self.dP_outlet = np.asarray(dP_outlet, dtype=float) + np.zeros(N)
+        self.rho = np.asarray(rho, dtype=float) + np.zeros(N)
+        # Pressure drop in each outlet at a velocity of 1 m/s
+        dP_unit = dP_from_K(np.asarray(K_outlet, dtype=float), self.rho, 1.)
+        self.dP_unit = np.where(self.A_outlet > 0., dP_unit, 1.)
+        self.Q_in = Q_in if callable(Q_in) else np.asarray(Q_in, dtype=float)
+        self.Q_pump = Q_pump if callable(Q_pump) else np.asarray(Q_pump, dtype=float)
+
+    def V_from_h(self, h):
+        r'''Calculates the volume of liquid in each tank from its level, with
+        the volume from height series.
+
+        Parameters
+        ----------
+        h : ndarray
+            Height of liquid in each tank, [m]
+
+        Returns
+        -------
+        V : ndarray
+            Volume of liquid in each tank, [m^3]
+        '''
+        h = np.clip(h, 0., self.h_max)
+        V = _chebval_tanks((2.0*h - self.h_max)/self.h_max, self.c_forward)
+        return np.clip(V, 0., self.V_total)
+
+    def h_from_V(self, V):
+        r'''Calculates the level of liquid in each tank from its volume, with
+        the height from volume series.
+
+        Parameters
+        ----------
+        V : ndarray
+            Volume of liquid in each tank, [m^3]
+
+        Returns
+        -------
+        h : ndarray
+            Height of liquid in each tank, [m]
+        '''
+        V = np.clip(V, 0., self.V_total)
+        h = _chebval_tanks((2.0*V - self.V_total)/self.V_total, self.c_backward)
+        return np.clip(h, 0., self.h_max)
+
+    def Q_out(self, h):
+        r'''Calculates the gravity outflow of each tank at a level of liquid.
+
+        Parameters
+        ----------
+        h : ndarray
+            Height of liquid in each tank, [m]
+
+        Returns
+        -------
+        Q : ndarray
+            Flow rate out of each tank through its outlet, [m^3/s]
+        '''
+        dP = self.rho*g*(h + self.z_outlet) + self.dP_outlet
+        return self.A_outlet*(np.maximum(dP, 0.)/self.dP_unit)**0.5
+
+    def dV_dt(self, t, V):
+        r'''Calculates the rate of change of the volume of liquid in each
+        tank; the right hand side of the integrated equations.
+
+        Parameters
+        ----------
+        t : float or ndarray
+            Time, or the time of each tank, [s]
+        V : ndarray
+            Volume of liquid in each tank, [m^3]
+
+        Returns
+        -------
+        dV_dt : ndarray
+            Rate of change of volume of liquid in each tank, [m^3/s]
+        '''
+        net = self._net_flow(t, V)
+        return np.where(self._held(V, net), 0., net)
+
+    def _net_flow(self, t, V):
+        Q_in = self.Q_in(t) if callable(self.Q_in) else self.Q_in
+        Q_pump = self.Q_pump(t) if callable(self.Q_pump) else self.Q_pump
+        return Q_in - Q_pump - self.Q_out(self.h_from_V(V))
+
+    def _dnet_dV(self, V):
+        # Derivative of the net flow into each tank with respect to its
+        # volume, through the outflow's dependence on the level
+        V = np.clip(V, 0., self.V_total)
+        h = self.h_from_V(V)
+        dh_dV = _chebval_tanks((2.0*V - self.V_total)/self.V_total, self.c_backward_der)
+        dh_dV = np.maximum(dh_dV*2.0/self.V_total, 0.)
+        dP = self.rho*g*(h + self.z_outlet) + self.dP_outlet
+        with np.errstate(divide='ignore', invalid='ignore'):
+            dQ_dh = np.where(dP > 0., 0.5*self.A_outlet*self.rho*g/(dP*self.dP_unit)**0.5, 0.)
+            J = -dQ_dh*dh_dV
+        return np.where(np.isnan(J), 0., np.where(np.isneginf(J), -1E100, J))
+
+    def _held(self, V, net):
+        # Empty tanks with more flow out than in, and full tanks with more
+        # flow in than out, stay as they are
+        return ((V <= 0.) & (net < 0.)) | ((V >= self.V_total) & (net > 0.))
+
+    def simulate(self, t, V0=None, h0=None, rtol=1E-6, maxiter=100000):
+        r'''Integrates the volume of liquid in every tank, from initial
+        volumes or levels, to the specified times.
+
+        Each tank is integrated with its own step size by the Rosenbrock 2(3)
+        method of [1]_, which remains stable for nearly empty horizontal
+        tanks, whose level changes quickly with volume; the steps of one tank
+        are not limited by another emptying or filling. The steps of all tanks
+        are taken together, in array operations.
+
+        Parameters
+        ----------
+        t : ndarray
+            Increasing times to report the volumes and levels at; the first is
+            the initial time, [s]
+        V0 : float or ndarray, optional
+            Initial volume of liquid in each tank, [m^3]
+        h0 : float or ndarray, optional
+            Initial level of liquid in each tank, if `V0` is not given, [m]
+        rtol : float, optional
+            Relative tolerance of the integration, [-]
+        maxiter : int, optional
+            Maximum number of steps, [-]
+
+        Returns
+        -------
+        V : ndarray
+            Volume of liquid in each tank (columns) at each time (rows),
+            [m^3]
+        h : ndarray
+            Level of liquid in each tank (columns) at each time (rows), [m]
+        t_empty : ndarray
+            First time each tank is empty, or NaN if it does not empty, [s]
+        t_full : ndarray
+            First time each tank is full, or NaN if it does not fill, [s]
+
+        Notes
+        -----
+        The absolute tolerance of the volume of each tank is `rtol` times
+        1E-3 of its total volume. A tank is empty or full once its volume is
+        within this tolerance of either limit; steps which would overshoot a
+        limit by more than this are retaken, shortened to end at it.
+
+        If `Q_in` or `Q_pump` are functions, they are called with an array
+        of the time of each tank.
+
+        References
+        ----------
+        .. [1] Shampine, Lawrence F., and Mark W. Reichelt. "The MATLAB ODE
+           Suite." SIAM Journal on Scientific Computing 18, no. 1 (January 1,
+           1997): 1-22. doi:10.1137/S1064827594276424.
+        '''
+        t_eval = np.asarray(t, dtype=float)
+        if V0 is None:
+            if h0 is None:
+                raise Exception('Either V0 or h0 is required')
+            V0 = self.V_from_h(np.asarray(h0, dtype=float) + np.zeros(self.N))
+        V = np.clip(np.asarray(V0, dtype=float) + np.zeros(self.N), 0., self.V_total)
+        V_total = self.V_total
+        atol = 1E-3*rtol*V_total
+        N, M = self.N, len(t_eval)
+
+        V_out = np.empty((M, N))
+        V_out[0] = V
+        t_empty = np.where(V <= atol, t_eval[0], np.nan)
+        t_full = np.where(V >= V_total - atol, t_eval[0], np.nan)
+        t = np.full(N, t_eval[0])
+        i_out = np.ones(N, dtype=int)
+        timed = callable(self.Q_in) or callable(self.Q_pump)
+        net = self._net_flow(t, V)
+        with np.errstate(divide='ignore'):
+            step = np.minimum(1E-2*V_total/np.abs(net), t_eval[-1] - t_eval[0])
+        for _ in range(maxiter):
+            running = i_out < M
+            if not running.any():
+                break
+            t_target = t_eval[np.minimum(i_out, M - 1)]
+            dt = np.where(running, np.minimum(step, t_target - t), 0.)
+
+            # Within a step, the flows of tanks which are not held at a limit
+            # are those of the liquid in them, beyond the limits or not
+            moving = ~self._held(V, net)
+            F0 = np.where(moving, net, 0.)
+            hdJ = dt*_ROS_D*np.where(moving, self._dnet_dV(V), 0.)
+            hdT = 0.
+            if timed:
+                delta = 1E-7*np.maximum(np.abs(t), 1.)
+                hdT = dt*_ROS_D*np.where(moving, self._net_flow(t + delta, V) - net, 0.)/delta
+            W = 1.0 - hdJ
+            k1 = (F0 + hdT)/W
+            F1 = np.where(moving, self._net_flow(t + 0.5*dt, V + 0.5*dt*k1), 0.)
+            k2 = (F1 - k1)/W + k1
+            V_new = V + dt*k2
+            net_new = self._net_flow(t + dt, V_new)
+            F2 = np.where(moving, net_new, 0.)
+            k3 = (F2 - _ROS_E32*(k2 - F1) - 2.0*(k1 - F0) + hdT)/W
+            scale = atol + rtol*np.maximum(np.abs(V), np.abs(V_new))
+            error = np.abs(dt/6.0*(k1 - 2.0*k2 + k3))/scale
+
+            # Steps overshooting a limit are retaken, ending near it
+            V_limit = np.where(V_new < 0., 0., V_total)
+            overshoot = (V_new < -atol) | (V_new > V_total + atol)
+            accept = running & (error <= 1.) & ~overshoot
+            with np.errstate(divide='ignore', invalid='ignore'):
+                factor = np.clip(0.9*error**(-1/3.), 0.2, 5.)
+                shortened = np.clip((V_limit - V)/(V_new - V), 0.05, 0.9)
+            step = np.where(overshoot & (error <= 1.), dt*shortened,
+                            np.where(accept, np.maximum(step, dt)*factor,
+                                     dt*np.minimum(factor, 1.)))
+
+            t = np.where(accept, t + dt, t)
+            emptied = accept & (V_new <= atol)
+            filled = accept & (V_new >= V_total - atol)
+            V = np.where(accept, V_new, V)
+            V = np.where(emptied, 0., np.where(filled, V_total, V))
+            net = np.where(accept, net_new, net)
+            if (emptied | filled).any():
+                net = np.where(emptied | filled, self._net_flow(t, V), net)
+            t_empty = np.where(emptied & np.isnan(t_empty), t, t_empty)
+            t_full = np.where(filled & np.isnan(t_full), t, t_full)
+
+            reported = accept & (t == t_target)
+            rows = np.where(reported)[0]
+            V_out[i_out[rows], rows] = V[rows]
+            i_out = i_out + reported
+        else:
+            raise Exception('Integration did not reach the final time in %d steps' %maxiter)
+        return V_out, self.h_from_V(V_out), t_empty, t_full
@@ -22,7 +22,9 @@ SOFTWARE.'''
 
 from fluids import *
 from numpy.testing import assert_allclose
+import numpy as np
 import pytest
+import warnings
 
 def test_control_valve():
     from fluids.control_valve import cavitation_index, FF_critical_pressure_ratio_l, is_choked_turbulent_l, is_choked_turbulent_g, Reynolds_valve, loss_coefficient_piping, Reynolds_factor
@@ -138,3 +140,201 @@ def test_control_valve_size_g():
     # Laminar custom example with iteration
     Kv = size_control_valve_g(T=320., MW=39.95, mu=5.625E-5, gamma=1.67, Z=1.0, P1=2.8E5, P2=2.7E5, Q=0.1/3600., D1=0.015, D2=0.015, d=0.001, FL=0.98, Fd=0.07, xT=0.8)
     assert_allclose(Kv, 0.989125783445497)
+
+
+def test_Kv_characteristic():
+    Kvs = [Kv_characteristic(0.5, 100., i) for i in valve_characteristics]
+    assert_allclose(Kvs, [50., 14.142135623730951, 70.71067811865476])
+    
+    Kvs = Kv_characteristic(np.array([0., 1.]), 100., 'equal percentage', rangeability=20.)
+    assert_allclose(Kvs, [5., 100.])
+    
+    with pytest.raises(Exception):
+        Kv_characteristic(0.5, 100., 'parabolic')
+
+
+def test_rate_control_valve_l():
+    kwargs = dict(rho=965.4, Psat=70.1E3, Pc=22120E3, mu=3.1472E-4, P1=680E3)
+    # Round trips of the sizing examples
+    Q = rate_control_valve_l(P2=220E3, C=164.9954763704956, D1=0.15, D2=0.15, d=0.15, FL=0.9, Fd=0.46, **kwargs)
+    assert_allclose(Q, 0.1)
+    
+    Q = rate_control_valve_l(P2=220E3, C=238.05817216710483, D1=0.1, D2=0.1, d=0.1, FL=0.6, Fd=0.98, **kwargs)
+    assert_allclose(Q, 0.1)
+    
+    # With reducer and expander - sizing iteration is only to 1%
+    Q = rate_control_valve_l(P2=220E3, C=177.44417090966715, D1=0.1, D2=0.09, d=0.08, FL=0.9, Fd=0.46, **kwargs)
+    assert_allclose(Q, 0.1, rtol=1E-2)
+    
+    # Laminar
+    Q = rate_control_valve_l(rho=965.4, Psat=70.1E3, Pc=22120E3, mu=3.1472E-2, P1=680E3, P2=220E3, C=3.0947562381723626, D1=0.01, D2=0.01, d=0.01, FL=0.6, Fd=0.98)
+    assert_allclose(Q, 0.001279243100949802)
+    
+    # Arrays, choked at the lower pressures
+    P2s = np.linspace(680E3, 100E3, 50)
+    Qs = rate_control_valve_l(P2=P2s, C=100., D1=0.1, D2=0.09, d=0.08, FL=0.6, Fd=0.98, **kwargs)
+    Qs_scalar = [rate_control_valve_l(P2=P2, C=100., D1=0.1, D2=0.09, d=0.08, FL=0.6, Fd=0.98, **kwargs) for P2 in P2s]
+    assert_allclose(Qs, Qs_scalar)
+    assert Qs[-1] == Qs[-2]
+    assert np.all(np.diff(Qs) >= 0)
+
+
+
+def test_control_valve_rating_invalid_inputs():
+    kwargs_l = dict(rho=965.4, Psat=70.1E3, Pc=22120E3, mu=3.1472E-4, P1=680E3, D1=0.1, D2=0.09, d=0.08, FL=0.9, Fd=0.46)
+    kwargs_g = dict(T=433., MW=44.01, mu=1.4665E-4, gamma=1.30, Z=0.988, P1=680E3, D1=0.08, D2=0.1, d=0.05, FL=0.85, Fd=0.42, xT=0.60)
+    for rate, dP, kwargs in [(rate_control_valve_l, dP_control_valve_l, kwargs_l),
+                             (rate_control_valve_g, dP_control_valve_g, kwargs_g)]:
+        # Reverse flow and negative coefficients raise, as negative flows do
+        with pytest.raises(ValueError):
+            rate(P2=700E3, C=100., **kwargs)
+        with pytest.raises(ValueError):
+            rate(P2=300E3, C=-1., **kwargs)
+        with pytest.raises(ValueError):
+            dP(Q=0.01, C=-1., **kwargs)
+        # Closed valves pass nothing, with no warnings
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            Qs = rate(P2=300E3, C=np.array([0., 100.]), **kwargs)
+            assert Qs[0] == 0 and Qs[1] > 0
+            assert rate(P2=680E3, C=100., **kwargs) == 0
+            dPs = dP(Q=np.array([0., 0.01]), C=0., **kwargs)
+        assert dPs[0] == 0 and np.isnan(dPs[1])
+
+
+def test_dP_control_valve_l():
+    kwargs = dict(rho=965.4, Psat=70.1E3, Pc=22120E3, mu=3.1472E-4, P1=680E3, C=100., D1=0.1, D2=0.09, d=0.08, FL=0.9, Fd=0.46)
+    P2s = np.linspace(650E3, 300E3, 10)
+    Qs = rate_control_valve_l(P2=P2s, **kwargs)
+    dPs = dP_control_valve_l(Q=Qs, **kwargs)
+    assert_allclose(dPs, 680E3 - P2s)
+    
+    # Above choked flow
+    assert np.isnan(dP_control_valve_l(Q=1., **kwargs))
+    
+    # No flow, no pressure drop; reverse flow is not supported
+    assert dP_control_valve_l(Q=0., **kwargs) == 0
+    assert_allclose(dP_control_valve_l(Q=np.array([0., Qs[0]]), **kwargs), [0., 30E3])
+    with pytest.raises(ValueError):
+        dP_control_valve_l(Q=-0.01, **kwargs)
+    
+    # Laminar
+    kwargs = dict(rho=965.4, Psat=70.1E3, Pc=22120E3, mu=3.1472E-2, P1=680E3, C=3.0947562381723626, D1=0.01, D2=0.01, d=0.01, FL=0.9, Fd=0.98)
+    Q = rate_control_valve_l(P2=220E3, **kwargs)
+    dP = dP_control_valve_l(Q=Q, **kwargs)
+    assert_allclose(dP, 460E3)
+
+
+def test_rate_control_valve_g():
+    kwargs = dict(T=433., MW=44.01, mu=1.4665E-4, gamma=1.30, Z=0.988, P1=680E3, D1=0.08, D2=0.1, d=0.05, FL=0.85, Fd=0.42, xT=0.60)
+    # Y uses xTP here; the sizing function keeps xT in Y, so the two differ
+    # slightly when the valve has reducers and is not choked
+    Q = rate_control_valve_g(P2=310E3, C=72.58664545391052, **kwargs)
+    assert_allclose(Q, 1.075122540600178)
+    assert_allclose(Q, 38/36., rtol=2E-2)
+    
+    # Choked
+    Q = rate_control_valve_g(P2=30E3, C=70.67468803987839, **kwargs)
+    assert_allclose(Q, 38/36., rtol=1E-2)
+    
+    P2s = np.linspace(680E3, 10E3, 20)
+    Qs = rate_control_valve_g(P2=P2s, C=72.58664545391052, **kwargs)
+    assert_allclose(Qs, [rate_control_valve_g(P2=P2, C=72.58664545391052, **kwargs) for P2 in P2s])
+    assert Qs[0] == 0
+    assert Qs[-1] == Qs[-2]
+    
+    # No fittings, example 4
+    Q = rate_control_valve_g(T=320., MW=39.95, mu=5.625E-5, gamma=1.67, Z=1.0, P1=2.8E5, P2=1.3E5, C=0.016498765335995726, D1=0.015, D2=0.015, d=0.015, FL=0.98, Fd=0.07, xT=0.8)
+    assert_allclose(Q, 0.00016433549970397757)
+
+
+def test_dP_control_valve_g():
+    kwargs = dict(T=433., MW=44.01, mu=1.4665E-4, gamma=1.30, Z=0.988, P1=680E3, C=72.58664545391052, D1=0.08, D2=0.1, d=0.05, FL=0.85, Fd=0.42, xT=0.60)
+    P2s = np.linspace(650E3, 400E3, 10)
+    Qs = rate_control_valve_g(P2=P2s, **kwargs)
+    assert_allclose(dP_control_valve_g(Q=Qs, **kwargs), 680E3 - P2s)
+    
+    dPs = dP_control_valve_g(Q=np.array([0.5, 1.0, 2.0]), **kwargs)
+    assert_allclose(dPs[0:2], [40625.29058287, 236377.3225597])
+    assert np.isnan(dPs[2])
+
+    # No flow, no pressure drop; reverse flow is not supported
+    assert dP_control_valve_g(Q=0., **kwargs) == 0
+    with pytest.raises(ValueError):
+        dP_control_valve_g(Q=-0.5, **kwargs)
+
+
+def test_control_valve_g_choked_with_reducers():
+    # Flow must not fall as the pressure drop rises past choking, which
+    # happens with reducers if Y uses xT rather than xTP
+    kwargs = dict(T=433., MW=44.01, mu=1.4665E-4, gamma=1.30, Z=0.988, P1=680E3, C=72.59, D1=0.05, D2=0.1, d=0.05, FL=0.85, Fd=0.42, xT=0.60)
+    P2s = np.linspace(679E3, 1E3, 200)
+    Qs = rate_control_valve_g(P2=P2s, **kwargs)
+    assert np.all(np.diff(Qs) >= 0)
+
+    dPs = dP_control_valve_g(Q=Qs, **kwargs)
+    unchoked = Qs < Qs[-1]
+    assert_allclose(dPs[unchoked], (680E3 - P2s)[unchoked])
+
+
+def test_ControlValve():
+    valve = ControlValve(d=0.08, D1=0.1, D2=0.09, Kv_max=200., FL=0.9, Fd=0.46, xT=0.6, characteristic='equal percentage')
+    liquid = dict(rho=965.4, Psat=70.1E3, Pc=22120E3, mu=3.1472E-4, P1=680E3)
+    openings = np.linspace(0.1, 1, 10)
+    Qs = valve.Q_l(P2=400E3, opening=openings, **liquid)
+    Qs_expect = [rate_control_valve_l(P2=400E3, C=Kv_characteristic(i, 200., 'equal percentage'), D1=0.1, D2=0.09, d=0.08, FL=0.9, Fd=0.46, **liquid) for i in openings]
+    assert_allclose(Qs, Qs_expect)
+    assert_allclose(valve.dP_l(Q=Qs, opening=openings, **liquid), 280E3)
+    
+    gas = dict(T=433., MW=44.01, mu=1.4665E-4, gamma=1.30, Z=0.988, P1=680E3)
+    Q = valve.Q_g(P2=500E3, opening=0.5, **gas)
+    Q_expect = rate_control_valve_g(P2=500E3, C=valve.Kv(0.5), D1=0.1, D2=0.09, d=0.08, FL=0.9, Fd=0.46, xT=0.6, **gas)
+    assert_allclose(Q, Q_expect)
+    assert_allclose(valve.dP_g(Q=Q, opening=0.5, **gas), 180E3)
+    
+    with pytest.raises(Exception):
+        ControlValve(d=0.08, D1=0.1, D2=0.09, Kv_max=200., FL=0.9, Fd=0.46, characteristic='parabolic')
+
+
+def test_xFz_estimate():
+    assert_allclose(xFz_estimate(C=100., FL=0.9, Fd=0.46), 0.2367746983237004)
+    assert_allclose(xFz_estimate(C=np.array([100., 1E-10]), FL=0.9, Fd=0.46), [0.2367746983237004, 0.9], rtol=1E-4)
+
+
+def test_control_valve_regime_l():
+    P2s = np.array([600E3, 400E3, 150E3, 50E3])
+    regimes = control_valve_regime_l(680E3, P2s, 70.1E3, 22120E3, FL=0.9, xFz=0.4)
+    assert_allclose(regimes, [0, 1, 2, 3])
+    regimes_scalar = [control_valve_regime_l(680E3, P2, 70.1E3, 22120E3, FL=0.9, xFz=0.4) for P2 in P2s]
+    assert_allclose(regimes, regimes_scalar)
+    assert type(regimes_scalar[0]) is int
+    
+    # Fittings lower the choking pressure drop
+    assert 1 == control_valve_regime_l(680E3, 200E3, 70.1E3, 22120E3, FL=0.9, xFz=0.4)
+    assert 2 == control_valve_regime_l(680E3, 200E3, 70.1E3, 22120E3, FL=0.9, xFz=0.4, FLP=0.8, FP=0.95)
+    
+
+def test_ControlValve_envelope_l():
+    valve = ControlValve(d=0.08, D1=0.1, D2=0.1, Kv_max=200., FL=0.9, Fd=0.46)
+    liquid = dict(rho=965.4, Psat=70.1E3, Pc=22120E3, mu=3.1472E-4)
+    P2, P1 = np.meshgrid(np.linspace(0.5E5, 9E5, 100), np.linspace(1E6, 2E6, 10))
+    Q, dP, regime = valve.envelope_l(P1=P1, P2=P2, opening=0.7, **liquid)
+    assert Q.shape == regime.shape == (10, 100)
+    assert_allclose(dP, P1 - P2)
+    assert set(np.unique(regime)) == set([0, 1, 2, 3])
+    # Choked flow rate is constant with outlet pressure at each inlet pressure
+    for Q_row, regime_row in zip(Q, regime):
+        assert_allclose(Q_row[regime_row == 2], Q_row[regime_row == 2][0])
+    
+    # Specified flow rates instead, same answers
+    Q2, dP2, regime2 = valve.envelope_l(P1=P1, Q=Q, opening=0.7, **liquid)
+    mask = regime < 2
+    assert_allclose(dP2[mask], dP[mask])
+    assert_allclose(regime2[mask], regime[mask])
+    
+    Q, dP, regime = valve.envelope_l(P1=680E3, Q=1., **liquid)
+    assert np.isnan(dP)
+    assert valve_regimes_l[regime] == 'over capacity'
+    
+    with pytest.raises(Exception):
+        valve.envelope_l(P1=680E3, **liquid)
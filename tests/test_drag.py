@@ -21,6 +21,8 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.'''
 
 from fluids import *
+from fluids.drag import drag_sphere_correlations
+from scipy.constants import g
 import numpy as np
 from numpy.testing import assert_allclose
 import pytest
@@ -164,9 +166,111 @@ def test_v_terminal():
     assert_allclose(v_t, 4.271340888888888e-05)
 
 
+
+def test_v_terminal_array():
+    D = np.logspace(-6, -2, 40)
+    for Method in [None, 'Clift', 'Haider_Levenspiel', 'Morrison']:
+        for cache in (True, False):
+            v_ts = v_terminal(D, 2600., 1.2, 1.8E-5, Method=Method, cache=cache)
+            v_ts_scalar = [v_terminal(float(d), 2600., 1.2, 1.8E-5, Method=Method) for d in D]
+            assert_allclose(v_ts, v_ts_scalar, rtol=1E-11)
+
+    # Broadcasting over a grid of sizes and fluids, including laminar elements
+    rho = np.array([[1.2], [1000.]])
+    mu = np.array([[1.8E-5], [1E-3]])
+    v_ts = v_terminal(D, 2600., rho, mu)
+    assert v_ts.shape == (2, 40)
+    assert_allclose(v_ts[1], [v_terminal(float(d), 2600., 1000., 1E-3) for d in D], rtol=1E-11)
+
+    # Beyond Re = 1E6 no correlation applies
+    v_ts = v_terminal(np.array([1E-3, 1.]), 7800., 1.2, 1.8E-5)
+    assert_allclose(v_ts[0], v_terminal(1E-3, 7800., 1.2, 1.8E-5), rtol=1E-11)
+    assert np.isnan(v_ts[1])
+
+    # Across the drag crisis of Morrison, where Newton's method does not
+    # converge from the explicit starting point
+    D = np.linspace(0.042, 0.053, 12)
+    v_ts_scalar = [v_terminal(float(d), 7800., 1.2, 1.8E-5, Method='Morrison') for d in D]
+    for cache in (True, False):
+        v_ts = v_terminal(D, 7800., 1.2, 1.8E-5, Method='Morrison', cache=cache)
+        assert_allclose(v_ts, v_ts_scalar, rtol=1E-11)
+
+    # Across the jump in Cd of Clift at Re = 4E5 there is no solution
+    D = np.array([0.052, 0.056, 0.0626])
+    for cache in (True, False):
+        v_ts = v_terminal(D, 7800., 1.2, 1.8E-5, Method='Clift', cache=cache)
+        assert np.isnan(v_ts[1])
+        assert_allclose(v_ts[[0, 2]], [v_terminal(float(d), 7800., 1.2, 1.8E-5, Method='Clift') for d in D[[0, 2]]], rtol=1E-11)
+    with pytest.raises(Exception):
+        v_terminal(0.056, 7800., 1.2, 1.8E-5, Method='Clift')
+
+    # Methods which are specified are used beyond Re = 1E6
+    assert_allclose(v_terminal(np.array([1.]), 7800., 1.2, 1.8E-5, Method='Stokes'),
+                    9.80665*(7800. - 1.2)/(18*1.8E-5), rtol=1E-11)
+
+
 def test_integrate_drag_sphere():
     ans = integrate_drag_sphere(D=0.001, rhop=2200., rho=1.2, mu=1.78E-5, t=0.5, V=30, distance=True)
     assert_allclose(ans, (9.686465044063436, 7.829454643649386))
 
     ans = integrate_drag_sphere(D=0.001, rhop=2200., rho=1.2, mu=1.78E-5, t=0.5, V=30)
     assert_allclose(ans, 9.686465044063436)
+
+
+def test_drag_arrays():
+    Re = np.logspace(-4, 6, 301)
+    Re = np.concatenate([Re, [0.01, 0.1, 212963.26847812787, 20., 260., 5000.]])
+    for name, (func, Re_min, Re_max) in drag_sphere_correlations.items():
+        Cds = func(Re)
+        assert type(Cds) is np.ndarray and Cds.shape == Re.shape
+        assert_allclose(Cds, [func(float(i)) for i in Re], rtol=1E-12)
+        assert type(func(200.)) is float
+
+    Cds = drag_sphere(Re)
+    assert_allclose(Cds, [drag_sphere(float(i)) for i in Re], rtol=1E-12)
+    assert_allclose(drag_sphere(Re, Method='Clift'), Clift(Re))
+
+    Cds = drag_sphere(np.array([[0.05, 1E7], [200., 3E5]]))
+    assert_allclose(Cds[1], [drag_sphere(200.), drag_sphere(3E5)])
+    assert_allclose(Cds[0, 0], drag_sphere(0.05))
+    assert np.isnan(Cds[0, 1])
+
+    methods = sorted(drag_sphere(np.array([3E5, 5E5]), AvailableMethods=True))
+    assert methods == ['Almedeij', 'Barati_high', 'Ceylan', 'Clift', 'Morrison']
+
+
+def test_integrate_drag_spheres():
+    V, x = integrate_drag_sphere(D=0.001, rhop=2200., rho=1.2, mu=1.78E-5, t=0.5, V=30, distance=True)
+    for implicit in (True, False):
+        states = list(integrate_drag_spheres(D=0.001, rhop=2200., rho=1.2, mu=1.78E-5, t=[0, 0.25, 0.5],
+                                             x0=[0.], V0=[-30.], dt=1E-3, implicit=implicit))
+        assert len(states) == 3 and states[0][0] == 0. and states[-1][0] == 0.5
+        assert states[-1][1].shape == (1,)
+        assert_allclose(states[-1][2], [-V], rtol=1E-6)
+        assert_allclose(states[-1][1], [-x], rtol=1E-5) # trapezoidal distance there
+
+    # Stokes drag in a uniform wind has an exact solution, which the implicit
+    # scheme reproduces with any step
+    D = np.array([1E-5, 3E-5, 1E-4])
+    rhop, rho, mu = 2500., 1.2, 1.8E-5
+    wind = np.array([2., 0., 0.])
+    ts = [0., 0.01, 0.5]
+    beta = (18*mu/(D*D*rhop))[:, None]
+    v_eq = wind + np.array([0., 0., -g*(rhop - rho)/rhop])/beta
+    V0 = np.array([[0., 1., 0.]]*3)
+    states = integrate_drag_spheres(D=D, rhop=rhop, rho=rho, mu=mu, t=ts, x0=np.zeros((3, 3)),
+                                    V0=V0, u=lambda t, x: wind, Method='Stokes')
+    for t, x, v in states:
+        decay = np.exp(-beta*t)
+        assert_allclose(v, v_eq + (V0 - v_eq)*decay, rtol=1E-12, atol=1E-15)
+        assert_allclose(x, v_eq*t + (V0 - v_eq)*(1. - decay)/beta, rtol=1E-12, atol=1E-15)
+
+    # Particles reach their terminal velocities relative to an updraft
+    D = np.array([5E-5, 2E-4, 1E-3])
+    # with steps far longer than the smallest relaxation time, 0.36 ms
+    for t, x, v in integrate_drag_spheres(D=D, rhop=2600., rho=1000., mu=1E-3, t=[0., 3.],
+                                          x0=np.zeros((3, 2)), dt=1E-2,
+                                          u=lambda t, x: np.array([0., 0.01])):
+        pass
+    assert_allclose(v[:, 1], 0.01 - v_terminal(D, 2600., 1000., 1E-3), rtol=1E-9)
+    assert_allclose(v[:, 0], 0., atol=1E-15)
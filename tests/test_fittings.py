@@ -23,6 +23,7 @@ SOFTWARE.'''
 from __future__ import division
 from fluids import *
 from math import pi
+import numpy as np
 from numpy.testing import assert_allclose
 from scipy.constants import *
 import pytest
@@ -150,6 +151,66 @@ def test_fittings():
         
 
 
+def test_contraction_diffuser_array():
+    Di2 = np.array([0.2, 0.4, 0.6])
+    assert_allclose(contraction_sharp(1., Di2), [contraction_sharp(1., D) for D in Di2])
+    assert_allclose(contraction_round(1., Di2, 0.04), [contraction_round(1., D, 0.04) for D in Di2])
+    assert_allclose(contraction_conical(1., Di2, 0.0185, angle=30.),
+                    [contraction_conical(1., D, 0.0185, angle=30.) for D in Di2])
+    assert_allclose(contraction_beveled(1., Di2, l=0.1, angle=120.),
+                    [contraction_beveled(1., D, l=0.1, angle=120.) for D in Di2])
+    assert type(contraction_sharp(1., 0.4)) is float
+
+    # All regions of the conical diffuser at once
+    Di1 = np.array([.1**0.5, 1/3., 2/3., 1/3., 2/3.])
+    angles = np.array([10., 50., 40., 120., 120.])
+    fds = np.array([0.02, 0.03, 0.03, 0.0185, 0.0185])
+    Ks = diffuser_conical(Di1, 1., angle=angles, fd=fds)
+    assert_allclose(Ks, [diffuser_conical(a, 1., angle=b, fd=c) for a, b, c in zip(Di1, angles, fds)])
+    # Invalid points are NaN in a batch; a scalar raises
+    Ks = diffuser_conical(.5, 1., angle=np.array([30., 1800.]), fd=0.02)
+    assert np.isnan(Ks[1]) and not np.isnan(Ks[0])
+    # Friction factor only optional for abrupt diffusers
+    assert_allclose(diffuser_conical(1/3., 1., angle=120.), 0.812308728765127, rtol=1E-3)
+    with pytest.raises(Exception):
+        diffuser_conical(1/3., 1., angle=np.array([50., 120.]))
+
+    assert_allclose(diffuser_curved(Di2/2, Di2, 0.5), [diffuser_curved(D/2, D, 0.5) for D in Di2])
+    assert_allclose(diffuser_pipe_reducer(Di2/2, Di2, 1.5, 0.07),
+                    [diffuser_pipe_reducer(D/2, D, 1.5, 0.07) for D in Di2])
+
+    # The input list of staged diameters is not modified
+    DEs = [2, 3, 4, 5, 6, 7, 8, 9]
+    diffuser_conical_staged(1., 10., DEs, [1]*9, fd=0.01)
+    assert DEs == [2, 3, 4, 5, 6, 7, 8, 9]
+
+
+def test_K_contraction_diffuser():
+    assert K_contraction(1., 0.4) == contraction_sharp(1., 0.4)
+    assert K_contraction(1., 0.4, rc=0.04) == contraction_round(1., 0.4, 0.04)
+    assert K_contraction(0.1, 0.04, fd=0.0185, l=0.04) == contraction_conical(0.1, 0.04, 0.0185, l=0.04)
+    assert K_contraction(0.5, 0.1, l=0.07, angle=120.) == contraction_beveled(0.5, 0.1, l=0.07, angle=120.)
+    methods = K_contraction(1., 0.4, fd=0.02, rc=0.1, l=0.1, angle=30., AvailableMethods=True)
+    assert methods == ['Rennels round', 'Rennels beveled', 'Rennels conical', 'Rennels sharp']
+    assert_allclose(K_contraction(1., 0.4, fd=0.02, l=0.1, angle=30., Method='Rennels conical'),
+                    contraction_conical(1., 0.4, 0.02, angle=30.))
+
+    assert K_diffuser(.5, 1.) == diffuser_sharp(.5, 1.)
+    assert K_diffuser(1/3., 1., fd=0.03, angle=50.) == diffuser_conical(1/3., 1., angle=50., fd=0.03)
+    assert K_diffuser(.5, .75, fd=0.07, l=1.5, AvailableMethods=True) == \
+        ['Rennels conical', 'Rennels curved', 'Rennels pipe reducer', 'Rennels sharp']
+    assert K_diffuser(.5, .75, fd=0.07, l=1.5, Method='Rennels pipe reducer') == \
+        diffuser_pipe_reducer(.5, .75, 1.5, 0.07)
+    assert K_diffuser(.5, 1., l=2., Method='Rennels curved') == diffuser_curved(.5, 1., 2.)
+    Ks = K_diffuser(np.array([.2, .5]), 1.)
+    assert_allclose(Ks, [diffuser_sharp(.2, 1.), diffuser_sharp(.5, 1.)])
+
+    with pytest.raises(Exception):
+        K_contraction(1., 0.4, Method='BADMETHOD')
+    with pytest.raises(Exception):
+        K_diffuser(.5, 1., Method='BADMETHOD')
+
+
 def test_valve_coefficients():
     Cv = Kv_to_Cv(2)
     assert_allclose(Cv, 2.3121984567073133)
@@ -438,4 +499,249 @@ def test_v_lift_valve_Crane():
     assert_allclose(v, 1.0252301935349286)
     
     v = v_lift_valve_Crane(rho=998.2, style='swing check angled')
-    assert_allclose(v, 1.4243074011010037)
\ No newline at end of file
+    assert_allclose(v, 1.4243074011010037)
+
+def test_Darby3K_Hooper2K_by_ID():
+    assert Darby_names[Darby3K_ID('Valve, Swing check')] == 'Valve, Swing check'
+    IDs = Darby3K_ID(Darby_names)
+    assert_allclose(IDs, np.arange(len(Darby)))
+    
+    NPS = np.array([0.5, 2., 12.])[:, None, None]
+    Re = np.array([100., 1E4, 1E6])[None, :, None]
+    Ks = Darby3K_by_ID(NPS, Re, IDs)
+    assert Ks.shape == (3, 3, len(Darby))
+    for i in range(3):
+        for j in range(3):
+            for k, name in enumerate(Darby_names):
+                assert_allclose(Ks[i, j, k], Darby3K(NPS=NPS[i, 0, 0], Re=Re[0, j, 0], name=name))
+    K = Darby3K_by_ID(2., 1E4, Darby3K_ID('Valve, Angle valve, 45°, full line size, β = 1'))
+    assert type(K) is float
+    assert_allclose(K, 1.1572523963562353)
+    
+    Di = np.array([0.5, 2., 12.])[:, None]
+    IDs = Hooper2K_ID(Hooper_names)
+    Ks = Hooper2K_by_ID(Di, 1E4, IDs)
+    for i in range(3):
+        for k, name in enumerate(Hooper_names):
+            assert_allclose(Ks[i, k], Hooper2K(Di=Di[i, 0], Re=1E4, name=name))
+    assert_allclose(Hooper2K_by_ID(2., 1E4, Hooper2K_ID('Valve, Globe, Standard')), 6.15)
+    
+    with pytest.raises(Exception):
+        Darby3K_ID('fail')
+    with pytest.raises(Exception):
+        Hooper2K_ID(['Valve, Globe, Standard', 'fail'])
+    
+    # IDs outside of the tables are rejected rather than indexing from the end
+    with pytest.raises(ValueError):
+        Darby3K_by_ID(2., 1E4, -1)
+    with pytest.raises(ValueError):
+        Hooper2K_by_ID(2., 1E4, np.array([0, -2]))
+    with pytest.raises(ValueError):
+        Darby3K_by_ID(2., 1E4, len(Darby))
+    with pytest.raises(ValueError):
+        Hooper2K_by_ID(2., 1E4, 1.)
+
+
+def test_bend_rounded_arrays_methods():
+    angles = np.array([15., 30., 45., 60., 75., 90.])
+    Ks = bend_rounded(Di=4.020, rc=4.0*5, angle=angles, fd=0.0163)
+    assert_allclose(Ks, [bend_rounded(Di=4.020, rc=4.0*5, angle=i, fd=0.0163) for i in angles], rtol=1E-13)
+    assert_allclose(bend_miter(angles), [bend_miter(i) for i in angles], rtol=1E-13)
+    assert type(bend_miter(90.)) is float
+    
+    # Friction factor from Re and roughness, many bends and flows at once
+    Res = np.array([1E3, 1E4, 1E5, 1E6])[:, None]
+    Ks = bend_rounded(Di=0.1, angle=angles, Re=Res, roughness=4.5E-5)
+    assert Ks.shape == (4, 6)
+    for i in range(4):
+        for j in range(6):
+            fd = friction_factor(Re=Res[i, 0], eD=4.5E-4)
+            assert_allclose(Ks[i, j], bend_rounded(Di=0.1, angle=angles[j], fd=fd), rtol=1E-12)
+    
+    # Ito method: values and its two regimes
+    K = bend_rounded(Di=.1, angle=90., Re=1E5, method='Ito')
+    assert_allclose(K, 0.24110659853156202)
+    K = bend_rounded(Di=.1, angle=90., Re=1E3, bend_diameters=2., method='Ito')
+    assert_allclose(K, 0.4505130994477679)
+    # Close to the Rennels method for smooth pipe in turbulent flow
+    for r in (1.5, 2., 5.):
+        K_Ito = bend_rounded(Di=.1, angle=90., Re=1E5, bend_diameters=r, method='Ito')
+        K_Rennels = bend_rounded(Di=.1, angle=90., Re=1E5, bend_diameters=r)
+        assert_allclose(K_Ito, K_Rennels, rtol=0.05)
+    Ks = bend_rounded(Di=.1, angle=np.array([45., 90., 180.]), Re=np.array([[1E4], [1E5]]), method='Ito')
+    assert Ks.shape == (2, 3)
+    assert np.all(np.diff(Ks, axis=1) > 0)
+    assert np.all(np.diff(Ks, axis=0) < 0)
+    
+    with pytest.raises(Exception):
+        bend_rounded(Di=.1, angle=90.)
+    with pytest.raises(Exception):
+        bend_rounded(Di=.1, angle=90., fd=0.02, method='Ito')
+    with pytest.raises(Exception):
+        bend_rounded(Di=.1, angle=90., fd=0.02, method='fail')
+
+
+def test_K_valve_Crane():
+    styles = {'angle': 3, 'globe stop check': 3, 'angle stop check': 3,
+              'diaphragm': 2, 'foot': 2, 'butterfly': 3, 'plug': 3}
+    np.random.seed(0)
+    N = 300
+    kinds = np.random.choice(K_valve_Crane_kinds, N)
+    D2 = np.random.choice([0.05, 0.2, 0.3, 0.5], N)
+    D1 = np.where(np.random.rand(N) < 0.3, D2, D2*np.random.uniform(0.5, 1, N))
+    angle = np.random.choice([0., 5., 15., 30., 45., 60.], N)
+    fd = np.random.uniform(0.01, 0.02, N)
+    style = np.array([np.random.randint(styles.get(k, 1)) for k in kinds])
+    Ks = K_valve_Crane(kinds, fd=fd, D1=D1, D2=D2, angle=angle, style=style)
+    
+    scalar_funcs = {
+        'gate': lambda i: K_gate_valve_Crane(D1[i], D2[i], angle[i], fd[i]),
+        'globe': lambda i: K_globe_valve_Crane(D1[i], D2[i], fd[i]),
+        'angle': lambda i: K_angle_valve_Crane(D1[i], D2[i], fd[i], style[i]),
+        'swing check angled': lambda i: K_swing_check_valve_Crane(fd[i], True),
+        'swing check straight': lambda i: K_swing_check_valve_Crane(fd[i], False),
+        'lift check angled': lambda i: K_lift_check_valve_Crane(D1[i], D2[i], fd[i], True),
+        'lift check straight': lambda i: K_lift_check_valve_Crane(D1[i], D2[i], fd[i], False),
+        'tilting disk check': lambda i: K_tilting_disk_check_valve_Crane(D2[i], angle[i], fd[i]),
+        'globe stop check': lambda i: K_globe_stop_check_valve_Crane(D1[i], D2[i], fd[i], style[i]),
+        'angle stop check': lambda i: K_angle_stop_check_valve_Crane(D1[i], D2[i], fd[i], style[i]),
+        'ball': lambda i: K_ball_valve_Crane(D1[i], D2[i], angle[i], fd[i]),
+        'diaphragm': lambda i: K_diaphragm_valve_Crane(fd[i], style[i]),
+        'foot': lambda i: K_foot_valve_Crane(fd[i], style[i]),
+        'butterfly': lambda i: K_butterfly_valve_Crane(D2[i], fd[i], style[i]),
+        'plug': lambda i: K_plug_valve_Crane(D1[i], D2[i], angle[i], fd[i], style[i]),
+    }
+    assert set(scalar_funcs) == set(K_valve_Crane_kinds)
+    for i in range(N):
+        assert_allclose(Ks[i], scalar_funcs[kinds[i]](i), rtol=1E-13)
+    
+    K = K_valve_Crane('gate', fd=.015, D1=.1, D2=.146, angle=13.115)
+    assert type(K) is float
+    assert_allclose(K, 1.145830368873396)
+    
+    # Each function accepts arrays directly
+    Ks = K_gate_valve_Crane(D1=np.array([.1, .1, .1]), D2=.146, angle=np.array([0., 13.115, 60.]), fd=.015)
+    assert_allclose(Ks, [K_gate_valve_Crane(.1, .146, i, .015) for i in [0., 13.115, 60.]])
+    Ds = np.array([.1, .25, .5])
+    assert_allclose(K_butterfly_valve_Crane(Ds, .016, style=1), [K_butterfly_valve_Crane(D, .016, style=1) for D in Ds])
+    
+    with pytest.raises(Exception):
+        K_valve_Crane(['gate', 'fail'], fd=.015, D1=.1)
+    with pytest.raises(KeyError):
+        K_valve_Crane('plug', fd=.015, D1=.1, style=5)
+
+
+def test_K_tee_Crane():
+    # Reference values from the scalar K_*_Crane tee functions before they
+    # delegated to K_tee_Crane; (Q_branch/Q_comb, beta_branch^2, angle)
+    q = np.array([0.1, 0.3, 0.45, 0.55, 0.7, 0.9, 0.35, 0.65])
+    b = np.array([0.2, 0.35, 0.5, 0.7, 1.0, 0.5, 1.0, 0.2])
+    angle = np.array([90., 90., 45., 60., 30., 90., 45., 60.])
+    Ks_expect = {(True, True): [-0.3700000000000001, 0.7546938775510207, 0.34867249999999983, 0.4291122448979593, 0.25157000000000007, 2.3209999999999997, 0.06129337500000001, 9.205000000000004],
+                 (False, True): [0.14500000000000002, 0.375, 0.12645000000000006, 0.365357142857143, 0.05740000000000001, 0.585, 0.40477499999999994, -1.2350000000000003],
+                 (True, False): [1.25, 1.7346938775510206, 0.3921616895208765, 0.7940867346938775, 0.1665386608210715, 1.9719999999999995, 0.4957449500038393, 7.065625000000002],
+                 (False, False): [0.004000000000000001, 0.036, -0.040499999999999994, 0.009075000000000008, 0.05879999999999998, 0.1944, -0.0735, 0.169]}
+    for (branch, converging), K_expect in Ks_expect.items():
+        K = K_tee_Crane(q, b, angle, branch=branch, converging=converging)
+        assert_allclose(K, K_expect, rtol=1E-9, atol=1E-12)
+        assert_allclose([K_tee_Crane(*args, branch=branch, converging=converging) for args in zip(q, b, angle)],
+                        K_expect, rtol=1E-9, atol=1E-12)
+
+    np.random.seed(0)
+    N = 400
+    q = np.random.uniform(0.01, 0.99, N)
+    b = np.random.choice([0.2, 0.3, 0.4, 0.5, 0.7, 1.], N)
+    angle = np.random.choice([30., 45., 60., 90.], N)
+    for branch, converging in Ks_expect:
+        K, dK = K_tee_Crane(q, b, angle, branch=branch, converging=converging, derivative=True)
+        assert K.shape == dK.shape == (N,)
+        # Central finite differences; skip points next to the breaks in the method
+        h = 1E-6
+        near_break = np.min(np.abs(q[:, None] - np.array([0.4, 0.5, 0.6])), axis=1) < 1E-3
+        K_high = K_tee_Crane(q + h, b, angle, branch=branch, converging=converging)
+        K_low = K_tee_Crane(q - h, b, angle, branch=branch, converging=converging)
+        assert_allclose(dK[~near_break], ((K_high - K_low)/(2*h))[~near_break], rtol=1E-6, atol=1E-6)
+    
+    K, dK = K_tee_Crane(0.3, 1., derivative=True)
+    assert type(K) is float and type(dK) is float
+    
+    # Existing functions accept arrays too
+    Ks = K_branch_diverging_Crane(0.146, 0.146, np.array([0.02525, 0.03]), 0.01583, angle=45)
+    assert_allclose(Ks[0], 0.4639895627496694)
+
+
+def test_valve_data_to_K():
+    np.random.seed(0)
+    N = 1000
+    D = np.random.uniform(0.01, 0.5, N)
+    kind = np.random.randint(0, 4, N)
+    K = np.where(kind == 0, np.random.uniform(0.1, 10, N), np.nan)
+    Kv = np.where(kind == 1, np.random.uniform(1, 1000, N), np.nan)
+    Cv = np.where(kind == 2, np.random.uniform(1, 1000, N), np.nan)
+    K_expect = []
+    for i in range(N):
+        if kind[i] == 0:
+            K_expect.append(K[i])
+        elif kind[i] == 1:
+            K_expect.append(Kv_to_K(Kv[i], D[i]))
+        elif kind[i] == 2:
+            K_expect.append(Cv_to_K(Cv[i], D[i]))
+        else:
+            K_expect.append(np.nan)
+    K_expect = np.array(K_expect)
+    
+    data = np.zeros(N, dtype=[('tag', 'U8'), ('D', float), ('K', float), ('Kv', float), ('Cv', float)])
+    data['D'], data['K'], data['Kv'], data['Cv'] = D, K, Kv, Cv
+    assert_allclose(valve_data_to_K(data), K_expect, rtol=1E-13)
+    assert_allclose(valve_data_to_K(data, D_basis=0.1), change_K_basis(K_expect, D, 0.1), rtol=1E-13)
+    # Missing columns
+    assert_allclose(valve_data_to_K({'D': D, 'K': K}), K)
+    
+    # Conversions take arrays, including of integers
+    assert_allclose(Kv_to_K(np.array([1, 2]), 0.01), [Kv_to_K(1., 0.01), Kv_to_K(2., 0.01)])
+    assert_allclose(Cv_to_K(np.array([1, 2]), 0.01), [Cv_to_K(1., 0.01), Cv_to_K(2., 0.01)])
+    assert_allclose(K_to_Cv(Cv_to_K(Cv[kind == 2], D[kind == 2]), D[kind == 2]), Cv[kind == 2])
+    assert_allclose(Cv_to_Kv(Kv_to_Cv(Kv)), Kv)
+
+
+def test_iter_valve_data_to_K(tmpdir):
+    from io import StringIO
+    lines = [u'tag,D,K,Kv,Cv']
+    D = np.linspace(0.01, 0.5, 25)
+    for i, d in enumerate(D):
+        values = [u'', u'', u'']
+        values[i % 3] = repr(float(i + 1))
+        lines.append(u','.join([u'V-%d' %i, repr(d)] + values))
+    text = u'\n'.join(lines) + u'\n'
+    data = {'D': D, 'K': np.where(np.arange(25) % 3 == 0, np.arange(1., 26.), np.nan),
+            'Kv': np.where(np.arange(25) % 3 == 1, np.arange(1., 26.), np.nan),
+            'Cv': np.where(np.arange(25) % 3 == 2, np.arange(1., 26.), np.nan)}
+    
+    chunks = list(iter_valve_data_to_K(StringIO(text), D_basis=0.1, chunksize=10))
+    assert [len(i) for i in chunks] == [10, 10, 5]
+    assert_allclose(np.concatenate(chunks), valve_data_to_K(data, D_basis=0.1), rtol=1E-13)
+    
+    path = str(tmpdir.join('valves.csv'))
+    with open(path, 'w') as f:
+        f.write(text)
+    K = np.concatenate(list(iter_valve_data_to_K(path)))
+    assert_allclose(K, valve_data_to_K(data), rtol=1E-13)
+    
+    with pytest.raises(Exception):
+        list(iter_valve_data_to_K(StringIO(u'tag,K\nV-1,1\n')))
+    
+    # Blank lines and rows of empty cells, as spreadsheets export, are skipped
+    blank = lines[:5] + [u'', u',,,,'] + lines[5:] + [u'', u'  ']
+    chunks = list(iter_valve_data_to_K(StringIO(u'\n'.join(blank) + u'\n'), D_basis=0.1, chunksize=10))
+    assert [len(i) for i in chunks] == [10, 10, 5]
+    assert_allclose(np.concatenate(chunks), valve_data_to_K(data, D_basis=0.1), rtol=1E-13)
+    
+    # Trailing empty values may be left off entirely
+    short = [line.rstrip(u',') for line in lines]
+    K = np.concatenate(list(iter_valve_data_to_K(StringIO(u'\n'.join(short) + u'\n'))))
+    assert_allclose(K, valve_data_to_K(data), rtol=1E-13)
+    
+    # Files without a header row
+    for text in (u'', u'\n,,\n'):
+        with pytest.raises(Exception, match='header'):
+            list(iter_valve_data_to_K(StringIO(text)))
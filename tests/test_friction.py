@@ -331,4 +331,10 @@ def test_friction_Kumar():
         
     assert_allclose(all_ans, all_ans_expect)
 
-    
\ No newline at end of file
+    
+
+
+def test_friction_factor_array():
+    Re = np.array([100., 2039., 2041., 1E5, 1E8])
+    fds = friction._friction_factor_array(Re, 1E-4)
+    assert_allclose(fds, [friction_factor(Re=i, eD=1E-4) for i in Re], rtol=1E-13)
@@ -232,6 +232,121 @@ def test_geometry():
         V_from_h(h=7, D=1.5, L=5., horizontal=False)
 
 
+def test_V_from_h_array():
+    # Every head type, vertical and horizontal, as a strapping table at once
+    kwargs = [dict(D=10., L=25., horizontal=True, sideA='ellipsoidal', sideB='guppy', sideA_a=2, sideB_a=2),
+              dict(D=10., L=25., horizontal=True, sideA='spherical', sideB='conical', sideA_a=2, sideB_a=2),
+              dict(D=10., L=25., horizontal=True, sideA='spherical', sideB='spherical', sideA_a=0.05, sideB_a=-0.05),
+              dict(D=10., L=25., horizontal=True, sideA='torispherical', sideB='torispherical', sideA_f=1., sideA_k=0.06, sideB_f=1., sideB_k=0.06),
+              dict(D=8., L=10., horizontal=False, sideA='conical', sideB='spherical', sideA_a=3., sideB_a=4.),
+              dict(D=8., L=10., horizontal=False, sideA='ellipsoidal', sideB='torispherical', sideA_a=3., sideB_a=1.3547, sideB_f=1., sideB_k=0.06),
+              dict(D=8., L=10., horizontal=False, sideA='torispherical', sideA_a=1.3547, sideA_f=1., sideA_k=0.06)]
+    for kw in kwargs:
+        h_max = kw['D'] if kw['horizontal'] else kw['L'] + kw.get('sideA_a', 0) + kw.get('sideB_a', 0)
+        hs = np.linspace(0, h_max, 51)
+        Vs = V_from_h(hs, **kw)
+        assert_allclose(Vs, [V_from_h(h, **kw) for h in hs], rtol=1E-13)
+        assert np.all(np.diff(Vs) > 0)
+        assert type(V_from_h(hs[7], **kw)) is float
+
+    # Out of range points are NaN in an array
+    Vs = V_from_h(np.array([-1., 5., 11.]), D=10., L=25.)
+    assert np.isnan(Vs[0]) and np.isnan(Vs[2])
+    assert_allclose(Vs[1], V_from_h(5., D=10., L=25.))
+    with pytest.raises(Exception):
+        V_from_h(-1., D=10., L=25.)
+
+    # Individual head functions
+    hs = np.array([0., 24., 60., 132.])
+    for f in (V_vertical_conical, V_vertical_ellipsoidal, V_vertical_spherical):
+        assert_allclose(f(132., 33., hs), [f(132., 33., h) for h in hs], rtol=1E-13)
+    for f in (V_vertical_conical_concave, V_vertical_ellipsoidal_concave, V_vertical_spherical_concave):
+        assert_allclose(f(113., -33., hs), [f(113., -33., h) for h in hs], rtol=1E-13)
+    assert_allclose(V_vertical_torispherical(132., 1.0, 0.06, hs),
+                    [V_vertical_torispherical(132., 1.0, 0.06, h) for h in hs], rtol=1E-13)
+    assert_allclose(V_vertical_torispherical_concave(113., 0.71, 0.081, hs),
+                    [V_vertical_torispherical_concave(113., 0.71, 0.081, h) for h in hs], rtol=1E-13)
+    hs = np.array([0., 1., 36., 54., 84., 107., 108.])
+    for f in (V_horiz_conical, V_horiz_ellipsoidal, V_horiz_guppy, V_horiz_spherical):
+        assert_allclose(f(108., 156., 42., hs), [f(108., 156., 42., h) for h in hs], rtol=1E-13)
+    assert_allclose(V_horiz_torispherical(108., 156., 1., 0.06, hs),
+                    [V_horiz_torispherical(108., 156., 1., 0.06, h) for h in hs], rtol=1E-13)
+
+
+def test_V_horiz_quadrature():
+    # The fixed Gauss-Legendre rule against adaptive quadrature
+    V = V_horiz_spherical(108., 156., 108*.009, 84., headonly=True)
+    assert_allclose(V, 4017.620844135061, rtol=1E-9)
+
+    # Across all three regions of a torispherical head, against values from
+    # adaptive quadrature
+    hs = np.array([0., 1., 5., 20., 54., 80., 100., 106.5, 108.])
+    Vs = V_horiz_torispherical(108., 156., 1., 0.06, hs, headonly=True)
+    Vs_quad = [0.0, 28.69909574567603, 647.8151431684628, 8735.350100617667,
+               51017.708847047645, 85675.93977441546, 100474.69241390306,
+               101971.62234197496, 102035.41769409469]
+    assert_allclose(Vs, Vs_quad, rtol=1E-9)
+
+
+def test_SA_from_h():
+    # Hemispherical heads have the wetted area of a zone of a sphere
+    hs = np.linspace(0, 2., 9)
+    SAs = SA_from_h(hs, D=2., L=3., sideA='spherical', sideB='spherical', sideA_a=1., sideB_a=1.)
+    assert_allclose(SAs, 3*2*np.arccos(1. - hs) + 2*pi*hs, rtol=1E-12)
+
+    # Ellipsoidal head wetted area against adaptive quadrature, and a flat end
+    hs = np.array([0.05, 0.3, 1.3, 1.97])
+    SAs = SA_from_h(hs, D=2., L=0., sideA='ellipsoidal', sideA_a=0.6)
+    SAs_quad = [0.09626471804302163, 0.6270777049045643, 3.1081101563989804, 4.637433595428423]
+    SAs_flat = np.arccos(1. - hs) - (1. - hs)*(2*hs - hs**2)**0.5
+    assert_allclose(SAs, SAs_quad + SAs_flat, rtol=1E-10)
+
+    # Every head type, vertical and horizontal; full tanks have the area of
+    # SA_tank and half full symmetric horizontal tanks have half of it
+    kwargs = [dict(D=10., L=25., horizontal=True, sideA='ellipsoidal', sideB='guppy', sideA_a=2, sideB_a=2),
+              dict(D=10., L=25., horizontal=True, sideA='spherical', sideB='conical', sideA_a=2, sideB_a=2),
+              dict(D=10., L=25., horizontal=True, sideA='torispherical', sideB='torispherical', sideA_a=1.6934, sideB_a=1.6934, sideA_f=1., sideA_k=0.06, sideB_f=1., sideB_k=0.06),
+              dict(D=8., L=10., horizontal=False, sideA='conical', sideB='spherical', sideA_a=3., sideB_a=4.),
+              dict(D=8., L=10., horizontal=False, sideA='ellipsoidal', sideB='torispherical', sideA_a=9., sideB_a=1.3547, sideB_f=1., sideB_k=0.06),
+              dict(D=8., L=10., horizontal=False, sideA='torispherical', sideA_a=1.3547, sideA_f=1., sideA_k=0.06)]
+    for kw in kwargs:
+        h_max = kw['D'] if kw['horizontal'] else kw['L'] + kw.get('sideA_a', 0) + kw.get('sideB_a', 0)
+        hs = np.linspace(0, h_max, 51)
+        SAs = SA_from_h(hs, **kw)
+        assert_allclose(SAs, [SA_from_h(h, **kw) for h in hs], rtol=1E-13)
+        assert np.all(np.diff(SAs) > 0)
+        assert type(SA_from_h(hs[7], **kw)) is float
+        assert_allclose(SAs[-1], SA_tank(**{k: v for k, v in kw.items() if k != 'horizontal'}), rtol=1E-13)
+    assert_allclose(SA_from_h(5., **kwargs[2]), 0.5*SA_tank(**{k: v for k, v in kwargs[2].items() if k != 'horizontal'}), rtol=1E-13)
+
+    # Flat ends of vertical tanks are wet from above the bottom and when full
+    assert_allclose(SA_from_h([0., 1E-9, 1., 2.], D=1., L=2., horizontal=False),
+                    [0., pi/4, pi/4 + pi, 2*pi/4 + 2*pi], atol=1E-8)
+
+    # Out of range points are NaN in an array
+    SAs = SA_from_h(np.array([-1., 5., 11.]), D=10., L=25.)
+    assert np.isnan(SAs[0]) and np.isnan(SAs[2])
+    with pytest.raises(Exception):
+        SA_from_h(-1., D=10., L=25.)
+    with pytest.raises(Exception):
+        SA_from_h(1., D=10., L=25., horizontal=False, sideA='guppy', sideA_a=2.)
+
+    # Head area functions
+    Ds, As = np.array([2., 2., 1., 2.54]), np.array([1., 0.999, 2., 0.5])
+    for f in (SA_ellipsoidal_head, SA_conical_head, SA_guppy_head, SA_partial_sphere):
+        assert_allclose(f(Ds, As), [f(D, a) for D, a in zip(Ds, As)], rtol=1E-13)
+    assert_allclose(SA_torispheroidal(Ds, 1., np.array([0.06, 0.1, 0.06, 0.2])),
+                    [SA_torispheroidal(D, 1., k) for D, k in zip(Ds, [0.06, 0.1, 0.06, 0.2])], rtol=1E-13)
+
+    # Chebyshev approximators
+    for T in [TANK(D=2., L=5., sideA='torispherical', sideB='guppy'),
+              TANK(D=2., L=5., horizontal=False, sideA='conical', sideB='ellipsoidal', sideB_a=2.5),
+              TANK(D=2., L=5., horizontal=False, sideB='spherical')]:
+        hs = np.linspace(0, T.h_max, 101)
+        assert_allclose(T.SA_from_h(hs, 'chebyshev'), T.SA_from_h(hs), rtol=1E-7, atol=1E-7*T.A)
+        assert_allclose(T.SA_from_h(T.h_max, 'chebyshev'), T.A, rtol=1E-12)
+
+
 def test_geometry_tank():
     V1 = TANK(D=1.2, L=4, horizontal=False).V_total
     assert_allclose(V1, 4.523893421169302)
@@ -276,6 +391,36 @@ def test_geometry_tank():
         TANK(V=10, L=10, sideA='conical', sideA_a_ratio=None)
    
      
+def test_size_tanks():
+    V = np.array([0.5, 10., 300.])
+    for horizontal in (True, False):
+        for sideA, sideB in [(None, None), ('conical', 'ellipsoidal'), ('torispherical', 'spherical'),
+                             ('guppy', 'torispherical')]:
+            for kwargs in (dict(D=1.2), dict(L=6.), dict(L_over_D=3.)):
+                D, L = size_tanks(V, horizontal=horizontal, sideA=sideA, sideB=sideB, **kwargs)
+                for Vi, Di, Li in zip(V, D, L):
+                    T = TANK(D=Di, L=Li, horizontal=horizontal, sideA=sideA, sideB=sideB)
+                    assert_allclose(T.V_total, Vi, rtol=1E-8)
+                    T2 = TANK(V=Vi, horizontal=horizontal, sideA=sideA, sideB=sideB, **kwargs)
+                    assert_allclose([T2.D, T2.L], [Di, Li], rtol=1E-13)
+
+    # Heads of specified depth
+    D, L = size_tanks(20., L_over_D=0.7, sideA='spherical', sideA_a=0.5, sideB='conical', sideB_a=0.8)
+    assert_allclose(TANK(D=D, L=L, sideA='spherical', sideA_a=0.5, sideB='conical', sideB_a=0.8).V_total, 20.)
+    assert_allclose(L/D, 0.7)
+
+    # Volumes smaller than the heads alone
+    D, L = size_tanks([1., 5.], D=2., sideA='spherical', sideA_a=1.5)
+    assert np.isnan(D[0]) and np.isnan(L[0])
+    assert_allclose(D[1], 2.)
+    with pytest.raises(Exception):
+        size_tanks(1., D=2., sideA='spherical', sideA_a=1.5)
+    with pytest.raises(Exception):
+        size_tanks(1., D=2., L=3.)
+    with pytest.raises(Exception):
+        size_tanks(1., L=3., sideA='conical', sideA_a=0.5)
+
+
 @pytest.mark.slow       
 def test_geometry_tank_chebyshev():
     # Test auto set Chebyshev table
@@ -316,7 +461,138 @@ def test_geometry_tank_fuzz_h_from_V():
     with pytest.raises(Exception):
         T.h_from_V(1E-5, 'NOTAMETHOD')
 
+
+
+def test_geometry_tank_approximator_cache(tmpdir):
+    from fluids.geometry import _TANK_approximators
+    kwargs = dict(L=1.2, L_over_D=3.5, sideA='torispherical', sideB='torispherical')
+    T1, T2 = TANK(**kwargs), TANK(**kwargs)
+    assert T1.geometry_hash() == T2.geometry_hash()
+    assert T1.geometry_hash() != TANK(L=1.2, L_over_D=3.5, sideA='torispherical').geometry_hash()
+    assert T1.geometry_hash() != TANK(L=1.2, L_over_D=3.5, sideA='torispherical', sideB='torispherical', sideB_k=0.1).geometry_hash()
+    # Unused torispherical parameters do not change the hash
+    assert TANK(D=1., L=3.).geometry_hash() == TANK(D=1., L=3., sideA_f=0.9).geometry_hash()
+
+    # The cache is opt-in
+    _TANK_approximators.clear()
+    T1.set_table(n=150)
+    T1.set_chebyshev_approximators(deg_forward=20, deg_backwards=30)
+    assert not _TANK_approximators
+
+    T1.set_chebyshev_approximators(deg_forward=100, deg_backwards=600, cache=True)
+    T2.set_chebyshev_approximators(deg_forward=100, deg_backwards=600, cache=True)
+    assert_allclose(T2.c_forward, T1.c_forward, rtol=0)
+    assert_allclose(T2.c_backward, T1.c_backward, rtol=0)
+    T1.set_table(n=150, cache=True)
+    T2.set_table(n=150, cache=True)
+    assert_allclose(T2.volumes, T1.volumes, rtol=0)
+    # Copies are stored and handed out; modifying one tank's arrays does not
+    # change the cache or other tanks
+    assert T2.c_forward is not T1.c_forward and T2.volumes is not T1.volumes
+    T2.c_forward[0] += 1.
+    T2.volumes[1] += 1.
+    T5 = TANK(**kwargs)
+    T5.set_chebyshev_approximators(deg_forward=100, deg_backwards=600, cache=True)
+    T5.set_table(n=150, cache=True)
+    assert_allclose(T5.c_forward, T1.c_forward, rtol=0)
+    assert_allclose(T5.volumes, T1.volumes, rtol=0)
+
+    # The backward series, fit without brenth, agrees with it
+    for V in np.linspace(0, T1.V_total, 15):
+        assert_allclose(T1.h_from_V(V, 'chebyshev'), T1.h_from_V(V, 'brenth'), rtol=1E-7, atol=1E-7)
+
+    path = str(tmpdir.join('tanks.json'))
+    T1.set_SA_chebyshev_approximator(deg=60, cache=True)
+    save_tank_approximators(path)
+    c_forward, c_backward, volumes = T1.c_forward, T1.c_backward, T1.volumes
+    _TANK_approximators.clear()
+    load_tank_approximators(path)
+    T3 = TANK(**kwargs)
+    T3.set_chebyshev_approximators(deg_forward=100, deg_backwards=600, cache=True)
+    T3.set_table(n=150, cache=True)
+    assert_allclose(T3.c_forward, c_forward, rtol=0)
+    assert_allclose(T3.c_backward, c_backward, rtol=0)
+    assert_allclose(T3.volumes, volumes, rtol=0)
+    assert_allclose(T3.h_from_V(0.05), T1.h_from_V(0.05), rtol=1E-14)
+    T3.set_SA_chebyshev_approximator(deg=60, cache=True)
+    T4 = TANK(**kwargs)
+    T4.set_SA_chebyshev_approximator(deg=60, cache=True)
+    assert_allclose(T4.c_SA, T3.c_SA, rtol=0)
+    assert_allclose(T3.c_SA, T1.c_SA, rtol=0)
+
+    # Without the cache, nothing is shared
+    T3.set_chebyshev_approximators(deg_forward=100, deg_backwards=600)
+    assert T3.c_forward is not _TANK_approximators[(T3.geometry_hash(), 'chebyshev', 100, 600)]['c_forward']
+    _TANK_approximators.clear()
     
+def test_TankFleet():
+    heads = [None, 'conical', 'ellipsoidal', 'torispherical', 'spherical', 'guppy']
+    tanks = []
+    for i, (horizontal, sideA, sideB) in enumerate([(h, A, B) for h in (True, False)
+                                                    for A in heads for B in heads]):
+        if not horizontal and 'guppy' in (sideA, sideB):
+            continue
+        tanks.append(TANK(D=1.5 + 0.05*i, L=4. + 0.1*i, horizontal=horizontal,
+                          sideA=sideA, sideB=sideB))
+    fleet = TankFleet(tanks)
+    assert fleet.N == len(tanks)
+
+    h = np.array([np.linspace(0, 1, 7)*T.h_max for T in tanks]).T
+    V, overfill = fleet.V_from_h(h)
+    assert V.shape == h.shape
+    assert not overfill.any()
+    V_loop = np.array([[T.V_from_h(hi) for T, hi in zip(tanks, row)] for row in h])
+    assert_allclose(V, V_loop, rtol=1E-12, atol=1E-12)
+    assert_allclose(V[-1], fleet.V_total, rtol=1E-13)
+
+    # Levels are recovered from the volumes, rigorously by default
+    h_calc, overfill = fleet.h_from_V(V[:-1])
+    assert not overfill.any()
+    assert_allclose(h_calc, h[:-1], rtol=1E-9, atol=1E-9)
+    h_calc, overfill = fleet.h_from_V(fleet.V_total, method='full')
+    assert not overfill.any()
+    assert_allclose(h_calc, fleet.h_max, rtol=1E-15)
+
+    # The stacked Chebyshev approximators match each tank's own
+    assert not fleet.chebyshev
+    h_cheb, overfill = fleet.h_from_V(V[:-1], method='chebyshev')
+    assert fleet.chebyshev
+    assert not overfill.any()
+    assert_allclose(h_cheb, h[:-1], rtol=0, atol=1E-3)
+    h_loop = np.array([[T.h_from_V(Vi, 'chebyshev') for T, Vi in zip(tanks, row)] for row in V[:-1]])
+    assert_allclose(h_cheb, np.clip(h_loop, 0., fleet.h_max), rtol=1E-12, atol=1E-12)
+    with pytest.raises(Exception):
+        fleet.h_from_V(V, method='NOTAMETHOD')
+
+    # Chebyshev levels are poorest near the apex of a vertical conical bottom
+    fleet_cone = TankFleet([TANK(D=2.34, L=10., horizontal=False, sideA='conical', sideA_a=0.99),
+                            TANK(D=2.34, L=10., sideA='conical', sideA_a=0.99)])
+    V_cone = np.linspace(0., 1., 2001)[:, None]*fleet_cone.V_total
+    h_full = fleet_cone.h_from_V(V_cone)[0]
+    error = np.abs(fleet_cone.h_from_V(V_cone, method='chebyshev')[0] - h_full).max(axis=0)/fleet_cone.h_max
+    assert error[0] < 5E-3
+    assert error[1] < 1E-4
+    assert_allclose(fleet_cone.V_from_h(h_full)[0], V_cone, rtol=1E-12, atol=1E-12)
+
+    # Overfilled and negative readings are flagged and clipped
+    V, overfill = fleet.V_from_h(np.where(np.arange(fleet.N) % 2, 1.1*fleet.h_max, -1.))
+    assert_allclose(V, np.where(np.arange(fleet.N) % 2, fleet.V_total, 0.))
+    assert_allclose(overfill, np.arange(fleet.N) % 2)
+    for method in ('chebyshev', 'full'):
+        h_calc, overfill = fleet.h_from_V(1.1*fleet.V_total, method=method)
+        assert_allclose(h_calc, fleet.h_max)
+        assert overfill.all()
+        h_calc, overfill = fleet.h_from_V(-fleet.V_total, method=method)
+        assert_allclose(h_calc, 0., atol=1E-9)
+
+    # Torispherical heads accept arrays of f and k
+    f, k = np.array([1., 0.9, 0.8]), np.array([0.06, 0.1, 0.2])
+    V = V_vertical_torispherical(2., f, k, 0.3)
+    assert_allclose(V, [V_vertical_torispherical(2., fi, ki, 0.3) for fi, ki in zip(f, k)])
+    V = V_horiz_torispherical(2., 3., f, k, 0.7)
+    assert_allclose(V, [V_horiz_torispherical(2., 3., fi, ki, 0.7) for fi, ki in zip(f, k)])
+
+
 def test_basic():
     psi = sphericity(10., 2.)
     assert_allclose(psi, 0.767663317071005)
@@ -344,6 +620,20 @@ def test_basic():
 
     V = V_multiple_hole_cylinder(0.01, 0.1, [(0.005, 1)])
     assert_allclose(V, 5.890486225480862e-06)
+
+    # Arrays of particles
+    x, y = np.array([10., 1.5, 0.01]), np.array([2., 0.1, 0.1])
+    for f in (sphericity, aspect_ratio, circularity, A_cylinder, V_cylinder):
+        assert_allclose(f(x, y), [f(xi, yi) for xi, yi in zip(x, y)], rtol=1E-13)
+    Do, L = np.array([0.01, 0.02, 0.015]), np.array([0.1, 0.05, 0.02])
+    Di, n = np.array([0.005, 0.002, 0.001]), np.array([1, 4, 7])
+    for f in (A_hollow_cylinder, V_hollow_cylinder):
+        assert_allclose(f(Di, Do, L), [f(*args) for args in zip(Di, Do, L)], rtol=1E-13)
+    for f in (A_multiple_hole_cylinder, V_multiple_hole_cylinder):
+        assert_allclose(f(Do, L, [(Di, n), (0.001, 1)]),
+                        [f(Do[i], L[i], [(Di[i], n[i]), (0.001, 1)]) for i in range(3)], rtol=1E-13)
+        assert_allclose(f(0.01, L, np.array([[0.005, 1], [0.001, 2]])),
+                        [f(0.01, Li, [(0.005, 1), (0.001, 2)]) for Li in L], rtol=1E-13)
     
     
 def test_HelicalCoil():
@@ -513,3 +803,62 @@ def test_RectangularOffsetStripFinExchanger():
     # With layers, plate thickness, width (fully defined)
 #    ROSFE = RectangularOffsetStripFinExchanger(fin_length=.05, fin_height=.01, fin_thickness=.003, fin_spacing=.05, length=1.2, width=2.401, plate_thickness=.005, layers=40)
 #    assert_allclose(ROSFE.A_HX_layer, 0.267552)
+
+
+def test_geometry_arrays():
+    # Struct-of-arrays classes against the single-object classes
+    np.random.seed(0)
+    n = 20
+    Dt, Do, H, pitch, Di = (np.random.uniform(.01, .02, n), np.random.uniform(.2, .5, n),
+                            np.random.uniform(.5, 2, n), np.random.uniform(.02, .05, n),
+                            np.random.uniform(.005, .01, n))
+    pitch[3], Do[7] = Dt[3]*.9, Dt[7]*.9
+    coils = HelicalCoilArray(Dt=Dt, Do_total=Do + Dt, H=H, pitch=pitch, Di=Di)
+    for i in range(n):
+        if i in (3, 7):
+            with pytest.raises(Exception):
+                HelicalCoil(Dt=Dt[i], Do=Do[i], H=H[i], pitch=pitch[i], Di=Di[i])
+            assert np.isnan(coils.tube_length[i]) and np.isnan(coils.annulus_volume[i])
+            continue
+        coil = HelicalCoil(Dt=Dt[i], Do=Do[i], H=H[i], pitch=pitch[i], Di=Di[i])
+        for attr in HelicalCoil.__slots__:
+            assert_allclose(getattr(coils, attr)[i], getattr(coil, attr), rtol=1E-13)
+    assert_allclose(HelicalCoilArray(Dt=Dt, Do=Do, N=coils.N, pitch=pitch).H, H, rtol=1E-13)
+
+    amplitude, wavelength = np.random.uniform(2E-4, 2E-3, n), np.random.uniform(3E-3, 2E-2, n)
+    kwargs = dict(length=1.2, width=np.random.uniform(.2, .5, n), d_port=.05,
+                  plates=np.random.randint(10, 100, n))
+    for chevron_angle in (np.random.uniform(30, 60, n), (30., np.random.uniform(30, 60, n))):
+        exs = PlateExchangerArray(amplitude, wavelength, chevron_angle=chevron_angle, **kwargs)
+        for i in range(n):
+            chevron = (tuple(float(np.broadcast_to(c, n)[i]) for c in chevron_angle)
+                       if isinstance(chevron_angle, tuple) else chevron_angle[i])
+            ex = PlateExchanger(amplitude[i], wavelength[i], chevron_angle=chevron, length=1.2,
+                                width=kwargs['width'][i], d_port=.05, plates=int(kwargs['plates'][i]))
+            for attr in PlateExchanger.__slots__:
+                value = getattr(ex, attr)
+                if attr == 'chevron_angles':
+                    assert_allclose([c[i] for c in exs.chevron_angles], value, rtol=1E-13)
+                elif value is not None:
+                    assert_allclose(getattr(exs, attr)[i], value, rtol=1E-13)
+
+    h, t, s = np.random.uniform(.005, .03, n), np.random.uniform(1E-4, 1E-3, n), np.random.uniform(.002, .02, n)
+    l = np.random.uniform(.002, .01, n)
+    kwargs = dict(length=1.2, width=np.random.uniform(.5, 2.5, n), layers=40, plate_thickness=.005)
+    fins = RectangularFinExchangerArray(h, t, s, **kwargs)
+    strips = RectangularOffsetStripFinExchangerArray(l, h, t, s)
+    for i in range(n):
+        fin = RectangularFinExchanger(h[i], t[i], s[i], length=1.2, width=kwargs['width'][i],
+                                      layers=40, plate_thickness=.005)
+        for attr in RectangularFinExchanger.__slots__:
+            if hasattr(fin, attr) and attr != 'flow':
+                assert_allclose(getattr(fins, attr)[i], getattr(fin, attr), rtol=1E-13)
+        strip = RectangularOffsetStripFinExchanger(l[i], h[i], t[i], s[i])
+        for attr in RectangularOffsetStripFinExchanger.__slots__ + ['blockage_ratio', 'A_channel', 'Dh', 'fin_count']:
+            assert_allclose(getattr(strips, attr)[i], getattr(strip, attr), rtol=1E-13)
+
+    # The single-object classes have no per-instance dictionaries
+    for obj in (HelicalCoil(Do=30, H=20, pitch=5, Dt=2), PlateExchanger(5E-4, 3.7E-3),
+                RectangularFinExchanger(0.03, 0.001, 0.012),
+                RectangularOffsetStripFinExchanger(.05, .01, .003, .05)):
+        assert not hasattr(obj, '__dict__')
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+'''Chemical Engineering Design Library (ChEDL). Utilities for process modeling.
+Copyright (C) 2017, 2017 Caleb Bell <Caleb.Andrew.Bell@gmail.com>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.'''
+
+from __future__ import division
+from fluids.numerics import *
+from numpy.testing import assert_allclose
+import numpy as np
+import pytest
+
+
+def test_Table1D():
+    x = [1., 2., 4., 8.]
+    y = [1., 3., 2., 10.]
+    table = Table1D(x, y)
+    assert not table.built
+    assert_allclose(table(3.), 2.5)
+    assert table.built
+    assert type(table(3.)) is float
+    
+    pts = np.linspace(1, 8, 50)
+    assert_allclose(table(pts), np.interp(pts, x, y))
+    assert_allclose(table(pts), [table(i) for i in pts])
+    # Breakpoints exactly
+    assert_allclose(table(np.array(x)), y)
+    assert_allclose([table(i) for i in x], y)
+    
+    with pytest.raises(ValueError):
+        table(0.5)
+    with pytest.raises(ValueError):
+        table(np.array([2., 9.]))
+    
+    # Clamped to the ends of the table, not extrapolated
+    table = Table1D(x, y, clamp=True)
+    assert_allclose([table(0.), table(10.)], [1., 10.])
+    assert_allclose(table(np.array([0., 10.])), [1., 10.])
+
+
+def test_Table2D():
+    x = [0., 1., 3.]
+    y = [0., 10.]
+    z = [[0., 1., 5.], [10., 11., 17.]]
+    table = Table2D(x, y, z)
+    assert_allclose(table(0.5, 5.), 5.5)
+    assert_allclose(table(2., 10.), 14.)
+    assert_allclose(table(2., 0.), 3.)
+    assert_allclose(table(2., 5.), 8.5)
+    # Nearest edge outside
+    assert_allclose(table(-1., 20.), 10.)
+    assert_allclose(table(5., -1.), 5.)
+
+    xs = np.array([0.5, 2., 2., -1.])
+    ys = np.array([5., 10., 5., 20.])
+    assert_allclose(table(xs, ys), [5.5, 14., 8.5, 10.])
+    # Broadcasting
+    assert table(np.linspace(0, 3, 4), np.linspace(0, 10, 5)[:, None]).shape == (5, 4)
@@ -92,4 +92,35 @@ def test_packed_bed():
 def test_Guo_Sun():
     dP = Guo_Sun(dp=14.2E-3, voidage=0.492, vs=0.6, rho=1E3, mu=1E-3, Dt=40.9E-3)
     assert_allclose(dP, 42019.529911473706)
-    # Confirmed to be 42 kPa from a graph they provided
\ No newline at end of file
+    # Confirmed to be 42 kPa from a graph they provided
+
+def test_packed_bed_particles():
+    import numpy as np
+    from math import pi
+    # Uniform spheres are the bed of their diameter
+    A, V = np.full(5, pi*1E-6), np.full(5, pi/6*1E-9)
+    psis, Dpe, Dsv, psi = packed_bed_particles(A, V)
+    assert_allclose(psis, 1.)
+    assert_allclose(Dpe, 1E-3)
+    assert_allclose([Dsv, psi], [1E-3, 1.])
+    assert_allclose(dP_packed_bed_particles(A, V, vs=1E-3, rho=1E3, mu=1E-3, voidage=0.4),
+                    dP_packed_bed(dp=1E-3, voidage=0.4, vs=1E-3, rho=1E3, mu=1E-3))
+
+    # Counts are the same as repeated particles
+    A, V, counts = np.array([pi*1E-6, 24E-6]), np.array([pi/6*1E-9, 8E-9]), np.array([3, 2])
+    ans = packed_bed_particles(np.repeat(A, counts), np.repeat(V, counts))
+    ans_counts = packed_bed_particles(A, V, counts)
+    assert_allclose(ans[2:], ans_counts[2:])
+    assert_allclose(ans_counts[0], [1., 0.8059959770082346])
+    assert_allclose(ans_counts[1], [1E-3, 2E-3*(6/pi)**(1/3.)])
+
+    # Uniform cubes with the voidage estimated for a tube; the bed's diameter
+    # is the cube's volume-equivalent diameter times its sphericity
+    A, V = np.full(10, 24E-6), np.full(10, 8E-9)
+    Dpe, psi = 2E-3*(6/pi)**(1/3.), 0.8059959770082346
+    voidage = voidage_Benyahia_Oneil(Dpe=Dpe, Dt=0.05, sphericity=psi)
+    dP = dP_packed_bed_particles(A, V, vs=1E-2, rho=1E3, mu=1E-3, Dt=0.05)
+    assert_allclose(dP, dP_packed_bed(dp=Dpe, voidage=voidage, vs=1E-2, rho=1E3, mu=1E-3,
+                                      Dt=0.05, sphericity=psi))
+    with pytest.raises(Exception):
+        dP_packed_bed_particles(A, V, vs=1E-2, rho=1E3, mu=1E-3)
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+'''Chemical Engineering Design Library (ChEDL). Utilities for process modeling.
+Copyright (C) 2017 Caleb Bell <Caleb.Andrew.Bell@gmail.com>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.'''
+
+from __future__ import division
+from fluids import *
+from math import pi
+from scipy.constants import inch
+from numpy.testing import assert_allclose
+import numpy as np
+import pytest
+
+
+def test_PipingSystem():
+    D, D2, roughness = 0.05, 0.04, 1.5E-5
+    line = PipingSystem(D=D, roughness=roughness)
+    line.add_pipe(L=100.)
+    line.add_pipe(L=10., D=D2, roughness=4.5E-5)
+    line.add_bend(angle=90., bend_diameters=1.5)
+    line.add_Darby3K(name='Valve, Gate valve, standard, β = 1')
+    line.add_Hooper2K(name='Valve, Check, Swing', D=D2)
+    line.add_Kv(Kv=50.)
+    line.add_K(0.5)
+    
+    rho, mu = 1000., 1E-3
+    Qs = np.array([1E-5, 1E-3, 5E-3, 2E-2])
+    dPs = line.dP(Qs, rho, mu)
+    for Q, dP in zip(Qs, dPs):
+        V = Q/(pi/4*D**2)
+        V2 = Q/(pi/4*D2**2)
+        Re = Reynolds(V=V, D=D, rho=rho, mu=mu)
+        Re2 = Reynolds(V=V2, D=D2, rho=rho, mu=mu)
+        fd = friction_factor(Re=Re, eD=roughness/D)
+        fd2 = friction_factor(Re=Re2, eD=4.5E-5/D2)
+        K = (K_from_f(fd=fd, L=100., D=D) + bend_rounded(Di=D, angle=90., fd=fd, bend_diameters=1.5)
+             + Darby3K(NPS=D/inch, Re=Re, name='Valve, Gate valve, standard, β = 1')
+             + Kv_to_K(50., D) + 0.5)
+        K2 = K_from_f(fd=fd2, L=10., D=D2) + Hooper2K(Di=D2/inch, Re=Re2, name='Valve, Check, Swing')
+        dP_expect = dP_from_K(K=K, rho=rho, V=V) + dP_from_K(K=K2, rho=rho, V=V2)
+        assert_allclose(dP, dP_expect, rtol=1E-12)
+        assert_allclose(line.dP(Q, rho, mu), dP_expect, rtol=1E-12)
+    
+    assert line.dP(0., rho, mu) == 0.
+    assert line.Q(0., rho, mu) == 0.
+    
+    # Round trip through laminar and turbulent flow
+    assert_allclose(line.Q(dPs, rho, mu), Qs, rtol=1E-10)
+    assert_allclose(line.Q(dPs[2], rho, mu), Qs[2], rtol=1E-10)
+    
+    # Adding elements rebuilds the precomputed terms
+    K_before = line.K(1E5)
+    line.add_K(1.)
+    assert_allclose(line.K(1E5), K_before + 1.)
+    
+    with pytest.raises(Exception):
+        line.add_Darby3K(K1=800.)
+    with pytest.raises(Exception):
+        line.add_Hooper2K(K1=800.)
+
+
+def test_dP_piping_systems():
+    lines = []
+    for D in (0.02, 0.05, 0.1):
+        line = PipingSystem(D=D, roughness=4.5E-5)
+        line.add_pipe(L=50.)
+        line.add_pipe(L=5., D=0.8*D)
+        line.add_bend(angle=45.)
+        line.add_Darby3K(name='Valve, Globe valve, standard, β = 1')
+        lines.append(line)
+    # No friction terms at all
+    line = PipingSystem(D=0.1)
+    line.add_K(3.)
+    lines.append(line)
+    
+    Qs = np.linspace(1E-5, 1E-2, 7)
+    dPs = dP_piping_systems(lines, Qs, rho=1000., mu=1E-3)
+    assert dPs.shape == (4, 7)
+    for line, dP in zip(lines, dPs):
+        assert_allclose(dP, line.dP(Qs, 1000., 1E-3), rtol=1E-12)
+    
+    # Properties and flows for each line
+    rhos = np.array([1000., 900., 800., 700.])
+    mus = np.array([1E-3, 1E-2, 1E-1, 1.])
+    Qs_each = np.outer([1., 2., 3., 4.], Qs)
+    dPs = dP_piping_systems(lines, Qs_each, rho=rhos, mu=mus)
+    for i, line in enumerate(lines):
+        assert_allclose(dPs[i], line.dP(Qs_each[i], rhos[i], mus[i]), rtol=1E-12)
+    
+    # Properties for each line and flow rate; a line without pipes between others
+    lines.insert(1, lines.pop())
+    rhos_each = np.outer([1000., 900., 800., 700.], np.linspace(1., 1.1, 7))
+    dPs = dP_piping_systems(lines, Qs, rho=rhos_each, mu=1E-3)
+    for i, line in enumerate(lines):
+        assert_allclose(dPs[i], line.dP(Qs, rhos_each[i], 1E-3), rtol=1E-12)
+    
+    # Properties per flow rate or per pipe segment are not accepted
+    with pytest.raises(ValueError):
+        dP_piping_systems(lines, Qs, rho=np.full(7, 1000.), mu=1E-3)
+    with pytest.raises(ValueError):
+        dP_piping_systems(lines, Qs, rho=1000., mu=np.full(9, 1E-3))
@@ -23,6 +23,7 @@ SOFTWARE.'''
 from __future__ import division
 from fluids import *
 from numpy.testing import assert_allclose
+import numpy as np
 import pytest
 
 
@@ -78,3 +79,161 @@ def test_safety_valve():
     A = API520_A_steam(m=69615/3600., T=592.5, P1=12236E3, Kd=0.975, Kb=1, Kc=1)
     assert_allclose(A, 0.0011034712423692733)
 
+
+
+def test_API520_A_g_scenarios():
+    from fluids.safety_valve import atm
+    np.random.seed(0)
+    N = 200
+    m = np.random.uniform(0.1, 20., N)
+    T = np.random.uniform(250., 600., N)
+    Z = np.random.uniform(0.8, 1., N)
+    MW = np.random.uniform(16., 100., N)
+    k = np.random.uniform(1.05, 1.4, N)
+    Pset = np.random.uniform(3E5, 3E6, N)
+    Pback = atm + np.random.uniform(0., 0.45, N)*(Pset - atm)
+    overpressure = np.random.choice([0.1, 0.16, 0.21], N)
+    balanced = np.random.choice([True, False], N)
+    
+    A, A_API526, letters = API520_A_g_scenarios(m, T, Z, MW, k, Pset, Pback, overpressure, balanced=balanced)
+    for i in range(N):
+        P1 = (Pset[i] - atm)*(1. + overpressure[i]) + atm
+        Kb = API520_B(Pset[i], Pback[i], overpressure[i]) if balanced[i] else 1
+        A_expect = API520_A_g(m[i], T[i], Z[i], MW[i], k[i], P1, Pback[i], Kb=Kb)
+        assert_allclose(A[i], A_expect)
+        try:
+            A_round = API520_round_size(A_expect)
+            assert_allclose(A_API526[i], A_round)
+            assert letters[i] == API526_letters[API526_A.index(A_round)]
+        except Exception:
+            assert np.isnan(A_API526[i])
+            assert letters[i] == ''
+
+    # Scalar inputs, k = 1
+    A, A_API526, letter = API520_A_g_scenarios(m=24270/3600., T=348., Z=0.90, MW=51., k=1., Pset=(670E3-atm)/1.1 + atm)
+    assert_allclose(A, API520_A_g(m=24270/3600., T=348., Z=0.90, MW=51., k=1.000001, P1=670E3), rtol=1E-5)
+    assert letter == 'P'
+    
+    # Backpressure over 50% of set on balanced valve
+    A, A_API526, letter = API520_A_g_scenarios(m=1., T=348., Z=0.90, MW=51., k=1.1, Pset=1E6, Pback=7E5, overpressure=0.16, balanced=True)
+    assert np.isnan(A) and np.isnan(A_API526) and letter == ''
+    
+    with pytest.raises(Exception):
+        API520_A_g_scenarios(m=1., T=348., Z=0.90, MW=51., k=1.1, Pset=1E6, overpressure=0.17, balanced=True)
+    # Overpressure only enters the backpressure correction of balanced valves
+    A, A_API526, letter = API520_A_g_scenarios(m=1., T=348., Z=0.90, MW=51., k=1.1, Pset=1E6, overpressure=0.25)
+    assert_allclose(A, API520_A_g(m=1., T=348., Z=0.90, MW=51., k=1.1, P1=(1E6 - atm)*1.25 + atm, P2=atm))
+    with pytest.raises(Exception):
+        API520_A_g_scenarios(m=1., T=348., Z=0.90, MW=51., k=1.1, Pset=1E6, overpressure=[0.1, 0.25], balanced=[False, True])
+
+
+def test_API520_A_steam_scenarios():
+    from fluids.safety_valve import atm
+    T = np.linspace(400., 950., 20)
+    Pset = np.linspace(2E5, 15E6, 20)[:, None]
+    A, A_API526, letters = API520_A_steam_scenarios(m=69615/3600., T=T, Pset=Pset)
+    assert A.shape == (20, 20)
+    for i in range(20):
+        for j in range(20):
+            P1 = (Pset[i, 0] - atm)*1.1 + atm
+            try:
+                A_expect = API520_A_steam(m=69615/3600., T=T[j], P1=P1)
+            except Exception:
+                assert np.isnan(A[i, j])
+                continue
+            assert_allclose(A[i, j], A_expect)
+    assert np.isnan(A).sum() == 20 # The highest temperature
+    
+    A, A_API526, letter = API520_A_steam_scenarios(m=69615/3600., T=592.5, Pset=(12236E3-atm)/1.1 + atm)
+    assert_allclose(A, 0.0011034712423692733)
+    assert letter == 'K'
+
+
+def test_API520_A_l():
+    A = API520_A_l(m=100., rho=900., mu=0.1, P1=1.1E6, P2=101325.)
+    assert_allclose(A, 0.003682269993825028)
+    
+    # Converged area satisfies the viscosity correction at its own Reynolds number
+    Q, G1 = 100./900.*60000., 900./999.016
+    Re = Q*18800.*G1/(100.*(A*1E6)**0.5)
+    A_expect = 11.78*Q/(0.65*API520_Kv(Re))*(G1/((1.1E6 - 101325.)/1000.))**0.5*1E-6
+    assert_allclose(A, A_expect)
+    
+    # Inviscid limit
+    A = API520_A_l(m=100., rho=900., mu=1E-9, P1=1.1E6, P2=101325.)
+    assert_allclose(A, 11.78*Q/(0.65*1.0/0.9935)*(G1/998.675)**0.5*1E-6, rtol=1E-5)
+    
+    mus = np.array([1E-3, 0.1, 1.])
+    As = API520_A_l(m=100., rho=900., mu=mus, P1=1.1E6, P2=101325.)
+    assert_allclose(As, [API520_A_l(m=100., rho=900., mu=mu, P1=1.1E6, P2=101325.) for mu in mus])
+
+    # Viscous liquid, solved where successive substitution is slow
+    A = API520_A_l(m=100., rho=900., mu=30., P1=1.1E6, P2=101325.)
+    Re = Q*18800.*G1/(30000.*(A*1E6)**0.5)
+    A_expect = 11.78*Q/(0.65*API520_Kv(Re))*(G1/((1.1E6 - 101325.)/1000.))**0.5*1E-6
+    assert_allclose(A, A_expect, rtol=1E-12)
+    
+    # Solutions below the range of the viscosity correction are NaN
+    As = API520_A_l(m=100., rho=900., mu=np.array([30., 100., 1E4]), P1=1.1E6, P2=101325.)
+    assert_allclose(As[0], A)
+    assert np.all(np.isnan(As[1:]))
+    assert np.isnan(API520_A_l(m=100., rho=900., mu=100., P1=1.1E6, P2=101325.))
+
+
+def test_API520_omega():
+    assert_allclose(API520_omega(rho0=500., rho9=400.), 2.25)
+    
+    # Explicit critical pressure ratio vs the implicit relation of Leung
+    from scipy.optimize import brentq
+    for omega in [0.05, 0.5, 1., 2.25, 10., 100.]:
+        f = lambda n: n**2 + (omega**2 - 2*omega)*(1-n)**2 + 2*omega**2*np.log(n) + 2*omega**2*(1-n)
+        assert_allclose(API520_eta_c(omega), brentq(f, 1E-6, 1-1E-9), rtol=2E-3)
+
+
+def test_API520_A_two_phase():
+    A = API520_A_two_phase(m=20., P1=1.1E6, P2=101325., rho0=500., omega=2.25)
+    assert_allclose(A, 0.0021305795557579037)
+    
+    # Critical flow does not depend on backpressure
+    A2 = API520_A_two_phase(m=20., P1=1.1E6, P2=5E5, rho0=500., omega=2.25)
+    assert_allclose(A, A2)
+    
+    # Sub-critical flow is continuous with critical flow at the critical ratio
+    eta_c = API520_eta_c(2.25)
+    A3 = API520_A_two_phase(m=20., P1=1.1E6, P2=1.1E6*eta_c*1.000001, rho0=500., omega=2.25)
+    assert_allclose(A3, A, rtol=1E-3)
+    
+    P2s = np.linspace(1E5, 1.05E6, 10)
+    As = API520_A_two_phase(m=20., P1=1.1E6, P2=P2s, rho0=500., omega=2.25)
+    assert np.all(np.diff(As) >= 0)
+    assert_allclose(As, [API520_A_two_phase(m=20., P1=1.1E6, P2=P2, rho0=500., omega=2.25) for P2 in P2s])
+
+
+def test_API520_A_l_two_phase_scenarios():
+    from fluids.safety_valve import atm
+    Pset = np.linspace(3E5, 3E6, 10)
+    A, A_API526, letters = API520_A_l_scenarios(m=50., rho=900., mu=np.array([1E-3, 0.1])[:, None], Pset=Pset)
+    assert A.shape == (2, 10)
+    for i, mu in enumerate([1E-3, 0.1]):
+        for j in range(10):
+            P1 = (Pset[j] - atm)*1.1 + atm
+            assert_allclose(A[i, j], API520_A_l(m=50., rho=900., mu=mu, P1=P1, P2=atm))
+            assert letters[i, j] == API526_letters[API526_A.index(A_API526[i, j])]
+    
+    # Balanced valve backpressure correction
+    A, _, _ = API520_A_l_scenarios(m=50., rho=900., mu=1E-3, Pset=1E6, Pback=4E5, balanced=True)
+    Kw = API520_W(1E6, 4E5)
+    assert_allclose(A, API520_A_l(m=50., rho=900., mu=1E-3, P1=(1E6-atm)*1.1+atm, P2=4E5, Kw=Kw))
+    A, A_API526, letter = API520_A_l_scenarios(m=50., rho=900., mu=1E-3, Pset=1E6, Pback=7E5, balanced=True)
+    assert np.isnan(A) and letter == ''
+    
+    A, A_API526, letters = API520_A_two_phase_scenarios(m=20., rho0=500., omega=np.array([0.5, 2.25, 10.]), Pset=Pset[:, None])
+    assert A.shape == (10, 3)
+    for i in range(10):
+        for j, omega in enumerate([0.5, 2.25, 10.]):
+            P1 = (Pset[i] - atm)*1.1 + atm
+            assert_allclose(A[i, j], API520_A_two_phase(m=20., P1=P1, P2=atm, rho0=500., omega=omega))
+    
+    A, A_API526, letter = API520_A_two_phase_scenarios(m=20., rho0=500., omega=2.25, Pset=(1.1E6-atm)/1.1 + atm)
+    assert_allclose(A, 0.0021305795557579037)
+    assert letter == 'M'
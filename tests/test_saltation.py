@@ -56,4 +56,68 @@ def test_Weber_saltation():
 def test_Geldart_Ling():
     V1 = Geldart_Ling(1., 1.2, 0.1, 2E-5)
     V2 = Geldart_Ling(50., 1.2, 0.1, 2E-5)
-    assert_allclose([V1, V2], [7.467495862402707, 44.01407469835619])
\ No newline at end of file
+    assert_allclose([V1, V2], [7.467495862402707, 44.01407469835619])
+
+
+def test_saltation_arrays():
+    mp = np.array([0.2, 1., 5., 50.])
+    dp = np.array([1E-4, 1E-3, 2E-4, 3E-3])
+    D = np.array([0.05, 0.1, 0.1, 0.2])
+    Vt = np.array([2., 5.24, 1., 3.])
+    calls = [(Rizk, (mp, dp, 1.2, D)),
+             (Matsumoto_1974, (mp, 1000., dp, 1.2, D, Vt)),
+             (Matsumoto_1975, (mp, 1000., dp, 1.2, D, Vt)),
+             (Matsumoto_1977, (mp, 1000., dp, 1.2, D, Vt)),
+             (Schade, (mp, 1000., dp, 1.2, D)),
+             (Weber_saltation, (mp, 1000., dp, 1.2, D, Vt)),
+             (Geldart_Ling, (mp, 1.2, D, 2E-5))]
+    for f, args in calls:
+        Vs = f(*args)
+        Vs_scalar = [f(*[np.broadcast_to(a, (4,))[i] for a in args]) for i in range(4)]
+        assert_allclose(Vs, Vs_scalar, rtol=1E-14)
+        assert type(f(*[np.broadcast_to(a, (4,))[0].item() for a in args])) is float
+
+
+def test_PneumaticConveying():
+    from fluids.friction import friction_factor
+    from scipy.constants import g
+    # A design grid of loadings, particle sizes and pipe diameters
+    mp = np.array([0.25, 1., 4.])[:, None, None]
+    dp = np.array([1E-4, 5E-4])[None, :, None]
+    D = np.array([0.05, 0.078, 0.1])
+    line = PneumaticConveying(mp=mp, dp=dp, rhop=2500., rhog=1.2, mug=1.8E-5, D=D,
+                              L=50., H=10., roughness=5E-5)
+    assert line.dP.shape == (3, 2, 3)
+    assert_allclose(line.V_salt, Rizk(mp, dp, 1.2, D))
+    assert_allclose(line.V, 1.5*line.V_salt)
+    assert_allclose(line.Vterminal[0, :, 0], [v_terminal(1E-4, 2500., 1.2, 1.8E-5),
+                                             v_terminal(5E-4, 2500., 1.2, 1.8E-5)], rtol=1E-10)
+    assert_allclose(line.fd[0, 0], [friction_factor(Re, eD=5E-5/Di) for Re, Di in zip(line.Re[0, 0], D)])
+    assert_allclose(line.Cd[1, 1, 1], drag_sphere(1.2*(line.Uf - line.Up)[1, 1, 1]*5E-4/1.8E-5))
+
+    # Solids mass balances and the particle velocities
+    G = mp/(0.25*np.pi*D**2)
+    assert_allclose(2500.*(1. - line.voidage)*line.Up, G*np.ones((1, 2, 1)))
+    assert_allclose(2500.*(1. - line.voidage_vertical)*line.Up_vertical, G*np.ones((1, 2, 1)))
+    assert_allclose(line.Up_vertical, line.Uf_vertical - line.Vterminal)
+    assert_allclose(line.Up/line.Uf, (1. - 0.0638*dp**0.3*2500.**0.5)*np.ones((3, 1, 3)))
+    assert_allclose(line.dP, line.dP_acceleration + line.dP_gas_friction
+                    + line.dP_solids_friction + line.dP_gravity)
+    assert_allclose(line.dP_gravity, (2500.*(1. - line.voidage_vertical)
+                                      + 1.2*line.voidage_vertical)*g*10.)
+
+    # Specified velocity, other saltation correlations, and a single line
+    line = PneumaticConveying(mp=1., dp=1E-3, rhop=1000., rhog=1.2, mug=1.8E-5, D=0.1,
+                              L=20., V=25., saltation_method='Weber_saltation', Vterminal=4.)
+    assert_allclose(line.V_salt, 15.227445436331474)
+    assert_allclose(line.V, 25.)
+    assert line.dP_gravity == 0.
+
+    # Particles too large and dense for Hinkle's particle velocity
+    line = PneumaticConveying(mp=1., dp=np.array([1E-3, 0.05]), rhop=2500., rhog=1.2,
+                              mug=1.8E-5, D=0.2, L=10.)
+    assert np.isfinite(line.dP[0]) and np.isnan(line.dP[1])
+
+    with pytest.raises(Exception):
+        PneumaticConveying(mp=1., dp=1E-3, rhop=1000., rhog=1.2, mug=1.8E-5, D=0.1,
+                           saltation_method='BADMETHOD')
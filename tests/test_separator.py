@@ -59,4 +59,75 @@ def test_v_Sounders_Brown():
     
 def test_K_Sounders_Brown_theoretical():
     K = K_Sounders_Brown_theoretical(D=150E-6, Cd=0.5)
-    assert_allclose(K, 0.06263114241333939)
\ No newline at end of file
+    assert_allclose(K, 0.06263114241333939)
+
+
+def test_separator_arrays():
+    import numpy as np
+    from scipy.constants import psi
+    x = np.array([0.1, 0.5, 0.88, 0.99])
+    horizontal = np.array([False, True, True, False])
+    for method in ['spline', 'branan', 'blackwell']:
+        Ks = K_separator_Watkins(x, 985.4, 1.3, horizontal, method)
+        assert_allclose(Ks, [K_separator_Watkins(xi, 985.4, 1.3, h, method)
+                             for xi, h in zip(x, horizontal)], rtol=1E-13)
+    assert type(K_separator_Watkins(0.88, 985.4, 1.3)) is float
+
+    P = np.array([.1, 1, 10, 20, 40, 50, 5600])*psi
+    assert_allclose(K_separator_demister_York(P),
+                    [K_separator_demister_York(Pi) for Pi in P], rtol=1E-13)
+    assert_allclose(K_separator_demister_York(P, horizontal=True),
+                    1.25*K_separator_demister_York(P), rtol=1E-13)
+
+
+def test_size_separators():
+    import numpy as np
+    from scipy.constants import psi
+    mg = np.array([10., 10., 0.5, 2., 2.])
+    ml = np.array([1., 4., 5., 1., 1.])
+    horizontal = np.array([False, True, True, False, True])
+    demister = np.array([False, False, False, True, True])
+    rhog, rhol, P = 20., 800., 300*psi
+    K, v_max, D, L, V_liquid = size_separators(mg, ml, rhog, rhol, P=P, horizontal=horizontal,
+                                               demister=demister, t_retention=300.)
+    for i in range(5):
+        if demister[i]:
+            K_expect = K_separator_demister_York(P, horizontal[i])
+        else:
+            K_expect = K_separator_Watkins(mg[i]/(mg[i] + ml[i]), rhol, rhog, horizontal[i])
+        assert_allclose(K[i], K_expect)
+        assert_allclose(v_max[i], v_Sounders_Brown(K_expect, rhol, rhog))
+
+        # Liquid volumes are those of the tank at the normal liquid level
+        T = TANK(D=D[i], L=L[i], horizontal=horizontal[i], sideA='ellipsoidal',
+                 sideB='ellipsoidal', sideA_a=0.25*D[i], sideB_a=0.25*D[i])
+        assert_allclose(V_liquid[i], T.V_from_h(0.5*T.h_max), rtol=1E-10)
+    assert_allclose(L, 3*D)
+
+    # Each vessel is limited either by its gas velocity or its liquid volume
+    A_gas = np.where(horizontal, 0.5, 1.)*np.pi/4*D**2
+    v_gas = mg/rhog/A_gas
+    V_required = ml/rhol*300.
+    assert np.all(v_gas <= v_max*(1 + 1E-12)) and np.all(V_liquid >= V_required*(1 - 1E-12))
+    gas_limited = np.isclose(v_gas, v_max, rtol=1E-12)
+    liquid_limited = np.isclose(V_liquid, V_required, rtol=1E-12)
+    assert np.all(gas_limited | liquid_limited)
+    assert np.any(gas_limited) and np.any(liquid_limited)
+
+    with pytest.raises(Exception):
+        size_separators(mg, ml, rhog, rhol, demister=True)
+
+    # Torispherical heads, with the depth from their dish and knuckle radii
+    K, v_max, D, L, V_liquid = size_separators(mg, ml, rhog, rhol, P=P, horizontal=horizontal,
+                                               demister=demister, heads='torispherical',
+                                               f=1., k=0.1)
+    for i in range(5):
+        T = TANK(D=D[i], L=L[i], horizontal=horizontal[i], sideA='torispherical',
+                 sideB='torispherical', sideA_f=1., sideA_k=0.1, sideB_f=1., sideB_k=0.1)
+        assert_allclose(V_liquid[i], T.V_from_h(0.5*T.h_max), rtol=1E-10)
+        assert V_liquid[i] >= ml[i]/rhol*300.*(1 - 1E-12)
+
+    # Scalar inputs give floats
+    results = size_separators(10., 1., rhog, rhol)
+    assert all(type(i) is float for i in results)
+    assert_allclose(results, [r[0] for r in size_separators(np.array([10.]), np.array([1.]), rhog, rhol)])
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+'''Chemical Engineering Design Library (ChEDL). Utilities for process modeling.
+Copyright (C) 2017 Caleb Bell <Caleb.Andrew.Bell@gmail.com>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.'''
+
+from __future__ import division
+from fluids import *
+from math import pi
+from scipy.constants import g
+from numpy.testing import assert_allclose
+import numpy as np
+import pytest
+
+
+def test_TankTransient_Torricelli():
+    # Flat bottomed vertical tanks draining through outlets of different sizes
+    T = TANK(D=1.2, L=4, horizontal=False)
+    D_outlet = np.array([0.025, 0.05, 0.1])
+    K, h0 = 1.5, 3.
+    sim = TankTransient([T]*3, D_outlet=D_outlet, K_outlet=K)
+    ts = np.linspace(0, 200, 11)
+    V, h, t_empty, t_full = sim.simulate(t=ts, h0=h0, rtol=1E-9)
+
+    c = (D_outlet/1.2)**2*(2*g/K)**0.5
+    t_empty_expect = 2*h0**0.5/c
+    h_expect = np.maximum(h0**0.5 - 0.5*c*ts[:, None], 0.)**2
+    assert_allclose(h, h_expect, atol=1E-6)
+    assert_allclose(V, h*pi/4*1.2**2, rtol=1E-12)
+    assert_allclose(t_empty[2], t_empty_expect[2], rtol=1E-4)
+    assert np.all(np.isnan(t_empty[:2]))
+    assert np.all(np.isnan(t_full))
+
+
+def test_TankTransient_fill_pump_events():
+    tanks = [TANK(D=2., L=6., sideA='torispherical', sideB='torispherical'),
+             TANK(D=1.5, L=3., horizontal=False, sideA='conical', sideB='ellipsoidal'),
+             TANK(D=2.5, L=5., sideA='spherical', sideB='guppy')]
+    V_total = np.array([T.V_total for T in tanks])
+    Q_in = np.array([0.01, 0., 0.02])
+    Q_pump = np.array([0., 0.005, 0.])
+    sim = TankTransient(tanks, Q_in=Q_in, Q_pump=Q_pump)
+
+    # Levels from the stacked series match those of each tank
+    V = np.linspace(0, 1, 7)[:, None]*V_total
+    assert_allclose(sim.h_from_V(V), np.array([[T.h_from_V_cheb(Vi) for T, Vi in zip(tanks, row)]
+                                               for row in V]), atol=1E-12)
+    h = np.linspace(0, 1, 7)[:, None]*sim.h_max
+    assert_allclose(sim.V_from_h(h), np.array([[T.V_from_h_cheb(hi) for T, hi in zip(tanks, row)]
+                                               for row in h]), atol=1E-12)
+
+    V0 = 0.5*V_total
+    ts = np.linspace(0, 3000, 31)
+    V, h, t_empty, t_full = sim.simulate(t=ts, V0=V0)
+    V_expect = np.clip(V0 + (Q_in - Q_pump)*ts[:, None], 0, V_total)
+    assert_allclose(V, V_expect, rtol=1E-6, atol=1E-6*V_total.max())
+    assert_allclose(t_full[[0, 2]], ((V_total - V0)/Q_in)[[0, 2]], rtol=1E-4)
+    assert_allclose(t_empty[1], V0[1]/Q_pump[1], rtol=1E-4)
+    assert np.isnan(t_empty[0]) and np.isnan(t_full[1])
+
+    # Flows given as lists
+    sim_list = TankTransient(tanks, Q_in=Q_in.tolist(), Q_pump=Q_pump.tolist())
+    assert_allclose(sim_list.simulate(t=ts, V0=V0)[0], V, rtol=1E-13)
+
+    # Levels are within ~0.5% of the height of the rigorous ones
+    h_full = TankFleet(tanks).h_from_V(V)[0]
+    assert np.all(np.abs(h - h_full) < 5E-3*sim.h_max)
+
+    # Time varying inflow
+    sim = TankTransient(tanks, Q_in=lambda t: Q_in*np.exp(-t/100.))
+    V = sim.simulate(t=[0., 200.], V0=V0, rtol=1E-8)[0]
+    assert_allclose(V[-1], V0 + 100.*Q_in*(1. - np.exp(-2.)), rtol=2E-6)
+
+    with pytest.raises(Exception):
+        sim.simulate(t=[0., 1.])